@@ -0,0 +1,16 @@
+import sys
+import os
+
+# Agregar la carpeta src al path para que se puedan importar los módulos correctamente
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'src')))
+
+from src.infra.routes.asgi_routes import crear_app_asgi
+
+# Modo asíncrono: las cargas de archivos se atienden en el event loop y el resto
+# de las rutas en la aplicación Flask. Con gunicorn usar el worker de uvicorn:
+#   gunicorn asgi:application --config gunicorn.conf.py -k uvicorn.workers.UvicornWorker
+application = crear_app_asgi()
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(application, host="0.0.0.0", port=int(os.getenv('PORT', '8000')))
@@ -0,0 +1,15 @@
+import os
+
+# La aplicación se carga una vez en el maestro y los workers la heredan por
+# copy-on-write; el estado que no sobrevive a un fork se prepara en los hooks.
+preload_app = True
+workers = int(os.getenv('WEB_CONCURRENCY', '2'))
+# Los mismos hooks sirven para asgi:application con -k uvicorn.workers.UvicornWorker
+
+def pre_fork(server, worker):
+    from src.services.ciclo_vida import antes_de_fork
+    antes_de_fork()
+
+def post_fork(server, worker):
+    from src.services.ciclo_vida import despues_de_fork
+    despues_de_fork()
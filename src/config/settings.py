@@ -37,6 +37,15 @@ class Config:
     MONGO_APP_NAME = os.getenv('MONGO_APP_NAME')
     MONGO_SRV = os.getenv('MONGO_SRV')
     MONGO_URI = os.getenv('MONGO_URI')
+    # Pool de conexiones del MongoClient compartido por proceso
+    MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', '50'))
+    MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', '0'))
+    MONGO_MAX_IDLE_TIME_MS = int(os.getenv('MONGO_MAX_IDLE_TIME_MS', '60000'))
+    MONGO_CONNECT_TIMEOUT_MS = int(os.getenv('MONGO_CONNECT_TIMEOUT_MS', '10000'))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', '10000'))
+    MONGO_SOCKET_TIMEOUT_MS = int(os.getenv('MONGO_SOCKET_TIMEOUT_MS', '0'))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', '10000'))
+    MONGO_COMPRESSORS = os.getenv('MONGO_COMPRESSORS', 'zlib')
 
     CLOUD_ACCOUNT_ID = os.getenv('CLOUD_ACCOUNT_ID')
     CLOUD_ACCESS_KEY_ID = os.getenv('CLOUD_ACCESS_KEY_ID')
@@ -50,6 +59,52 @@ class Config:
     MEGA_EMAIL = os.getenv('MEGA_EMAIL')
     MEGA_PASSWORD = os.getenv('MEGA_PASSWORD')
     TEMP_PATH = os.getenv('TEMP_PATH')
+    # Segundos que el índice de nodos de MEGA se considera vigente
+    MEGA_INDICE_TTL = int(os.getenv('MEGA_INDICE_TTL', '300'))
+    # Bytes de cada archivo subido que se mantienen en memoria antes de volcarlo a disco
+    UPLOAD_SPOOL_MAX_BYTES = int(os.getenv('UPLOAD_SPOOL_MAX_BYTES', str(16 * 1024 * 1024)))
+    # Archivos de una carga múltiple que se suben a MEGA en paralelo
+    MEGA_UPLOAD_WORKERS = int(os.getenv('MEGA_UPLOAD_WORKERS', '4'))
+    # Pool de sesiones de MEGA por proceso
+    MEGA_POOL_SESIONES = int(os.getenv('MEGA_POOL_SESIONES', '4'))
+    MEGA_SESION_RENOVAR = int(os.getenv('MEGA_SESION_RENOVAR', str(6 * 60 * 60)))
+    MEGA_POOL_ESPERA = int(os.getenv('MEGA_POOL_ESPERA', '60'))
+    MEGA_POOL_REVISION = int(os.getenv('MEGA_POOL_REVISION', '60'))
+    MEGA_POOL_REINTENTO = int(os.getenv('MEGA_POOL_REINTENTO', '15'))
+    # Segundos de espera por cada fragmento enviado a MEGA desde la aplicación ASGI
+    MEGA_HTTP_TIMEOUT = int(os.getenv('MEGA_HTTP_TIMEOUT', '160'))
+    # Hilos de la aplicación ASGI para las rutas que sigue atendiendo Flask
+    ASGI_HILOS_WSGI = int(os.getenv('ASGI_HILOS_WSGI', '10'))
+
+    # Paginación de los listados
+    PAGINA_TAMANO_DEFECTO = int(os.getenv('PAGINA_TAMANO_DEFECTO', '50'))
+    PAGINA_TAMANO_MAXIMO = int(os.getenv('PAGINA_TAMANO_MAXIMO', '200'))
+
+    # Listados en NDJSON: documentos leídos del cursor por lote
+    NDJSON_BATCH_SIZE = int(os.getenv('NDJSON_BATCH_SIZE', '500'))
+    NDJSON_BATCH_SIZE_MAXIMO = int(os.getenv('NDJSON_BATCH_SIZE_MAXIMO', '5000'))
+
+    # Con gunicorn --preload: construir los controladores de cada worker al crearlo
+    PRECARGA_CALENTAR = getBoolEnv('PRECARGA_CALENTAR', True)
+
+    # Compresión de respuestas: gzip 1-9, brotli 0-11 (más alto = menos bytes y más CPU)
+    COMPRESION_NIVEL_GZIP = int(os.getenv('COMPRESION_NIVEL_GZIP', '6'))
+    COMPRESION_NIVEL_BROTLI = int(os.getenv('COMPRESION_NIVEL_BROTLI', '4'))
+    COMPRESION_MINIMO_BYTES = int(os.getenv('COMPRESION_MINIMO_BYTES', '1024'))
+    COMPRESION_TIPOS = ['application/json', 'text/html', 'text/plain', 'text/csv']
+
+    # Caché de los listados educativos: memoria, redis o ninguno
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memoria')
+    CACHE_TTL = int(os.getenv('CACHE_TTL', '60'))
+    CACHE_MAXIMO = int(os.getenv('CACHE_MAXIMO', '1024'))
+    REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+
+    # Escrituras masivas de /modulo/bulk y /archivo/bulk
+    BULK_TAMANO_LOTE = int(os.getenv('BULK_TAMANO_LOTE', '1000'))
+    BULK_MAXIMO_OPERACIONES = int(os.getenv('BULK_MAXIMO_OPERACIONES', '10000'))
+
+    # Bytes que puede almacenar cada usuario (0 = sin límite)
+    CUOTA_USUARIO_BYTES = int(os.getenv('CUOTA_USUARIO_BYTES', '0'))
 
     # Tipos de contenido permitidos
     TIPOS_CONTENIDO = ['personal', 'educativo']
@@ -1,15 +1,11 @@
-from mega import Mega
 from config.settings import Config
 from domain.mongodb.MongoService import ServicioMongoDB
+from src.services.mega_service import MegaService
 
 class ServicioMega:
     def __init__(self):
-        self.conn = Mega()
-        self.client = self.conn.login(Config.MEGA_EMAIL, Config.MEGA_PASSWORD)
-        self.client = None
+        # Comparte el pool de sesiones y el indice de nodos del proceso en lugar de hacer login propio
+        self.servicio = MegaService(Config.MEGA_EMAIL, Config.MEGA_PASSWORD)
         self.tempPath = Config.TEMP_PATH
         self.mongo = ServicioMongoDB().connectionDB()
         self.contenido = self.mongo['contenido']
-
-    # def connection(self):
-    #     return self.conn.login(self.email, self.password)
\ No newline at end of file
@@ -1,5 +1,5 @@
-from pymongo import MongoClient
 from config.settings import Config
+from src.services.mongo_conexion import obtener_cliente
 
 class ServicioMongoDB:
     def __init__(self):
@@ -18,9 +18,10 @@ class ServicioMongoDB:
             'password':self.password,
             'appname':self.appname,
         }
+        # Cliente compartido por todo el proceso en lugar de uno nuevo por instancia
         if self.srv:
-            return MongoClient(self.uri)
-        return MongoClient(**params)
+            return obtener_cliente(self.uri)
+        return obtener_cliente(**params)
 
     def connectionDB(self):
         if self.db:
@@ -1,5 +1,6 @@
 from infra.controllers.Controller import Controller
 from infra.models.ContenidoModel import Contenido
+from infra.db.VistaModuloContenido import VistaModuloContenido
 from bson import ObjectId
 from datetime import datetime
 
@@ -10,27 +11,33 @@ class ContenidoController(Controller):
         self.nombreColeccion = modelo.nombreColeccion
         self.columnas = modelo.opciones['columns']
         super().__init__(self.nombreColeccion)
+        self.execQueries.asociarVista(VistaModuloContenido(), 'id_modulo')
         
     def obtener(self, request):
         return self.get({
             'request':request, 
             'proyeccion':{}})
 
-    def crearRegistro(self, request):
-        datos = request.get_json()
+    def prepararDatos(self, datos: dict):
         try:
-            if 'time_deliver' in datos['data']:
-                fechaString = datos['data']['time_deliver']
+            if 'time_deliver' in datos:
+                fechaString = datos['time_deliver']
                 if "T" in fechaString:
                     fecha = datetime.fromisoformat(fechaString.replace("Z", "+00:00"))
                 else:
                     fecha = datetime.strptime(fechaString, "%Y-%m-%d")
-                datos["data"]["time_deliver"] = fecha
+                datos["time_deliver"] = fecha
         except Exception as excep:
             print(f'Hubo un error con la fecha: {excep}')
-        if "files" in datos["data"]:
-            datos["data"]["files"] = [f for f in datos["data"]["files"] if f]
-        datos['data']['id_modulo'] = ObjectId(datos['data']['id_modulo'])
+        if "files" in datos:
+            datos["files"] = [f for f in datos["files"] if f]
+        if 'id_modulo' in datos:
+            datos['id_modulo'] = ObjectId(datos['id_modulo'])
+        return datos
+
+    def crearRegistro(self, request):
+        datos = request.get_json()
+        datos['data'] = self.prepararDatos(datos['data'])
         class RequestWrapper:
             def __init__(self, json_data):
                 self._json_data = json_data
@@ -51,4 +58,12 @@ class ContenidoController(Controller):
         return self.patch({'request': request})
 
     def eliminarRegistro(self, request):
-        return self.delete({'request': request})
\ No newline at end of file
+        return self.delete({'request': request})
+
+    def escrituraMasiva(self, request):
+        return self.bulk({
+            'request': request,
+            'id': self.columnas[0],
+            'rules': self.columnas[1:4],
+            'columnas': self.columnas,
+            'preparar': self.prepararDatos})
\ No newline at end of file
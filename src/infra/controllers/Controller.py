@@ -1,5 +1,7 @@
 from flask import jsonify
 from infra.db.Querys import Query
+from src.config.settings import Config
+from src.utils.etag import ETagListado
 # from domain.mega.MegaService import ServicioMega
 
 class Controller:
@@ -19,6 +21,10 @@ class Controller:
             datosEnvio['todo'] = request.get('todo').lower() in ('true', '1', 't', 'yes', 'y')
         if 'filter' in request and request['filter']:
             datosEnvio['filtro'] = request.get('filter')
+        if 'limit' in request and request['limit']:
+            datosEnvio['limite'] = request.get('limit')
+        if 'cursor' in request and request['cursor']:
+            datosEnvio['cursor'] = request.get('cursor')
         if 'files' in request and request['files']:
             datosEnvio['archivos'] = request.files.getlist('files')
             if 'carpeta_nombre' in request and request['carpeta_nombre']:
@@ -33,19 +39,31 @@ class Controller:
             datos = self.obtenerRequest(opciones['request'])
         datos = self.obtenerDatosImportantes(datos)
         datos['proyeccion'] = opciones['proyeccion']
-        datosQuery = self.execQueries.encontrarDatos(datos)
+        if 'todo' in opciones.keys():
+            datos['todo'] = opciones['todo']
+        consultas = opciones.get('consultas', self.execQueries)
+        # Con If-None-Match vigente se responde 304 sin consultar la coleccion
+        version = consultas.versionActual()
+        if ETagListado.vigente(version):
+            return ETagListado.no_modificado(version)
+        datosQuery = consultas.encontrarDatos(datos)
         datosEnvio = datosQuery['data']
         if datosEnvio is None:
             datosEnvio = {}
-        return jsonify({
+        respuesta = {
             'data':datosEnvio,
             'message': datosQuery['message'],
             'status': 200
-        })
+        }
+        if 'next_cursor' in datosQuery:
+            respuesta['next_cursor'] = datosQuery['next_cursor']
+        if datosQuery['data'] is None:
+            return jsonify(respuesta)
+        return ETagListado.etiquetar(jsonify(respuesta), version)
 
     def especialGet(self, opciones: dict):
-        respuesta = self.execQueries.encontrarDatosRelacion(opciones)
-        print(respuesta)
+        consultas = opciones.get('consultas', self.execQueries)
+        respuesta = consultas.encontrarDatosRelacion(opciones)
         return jsonify({
             'data':respuesta['data'],
             'message':respuesta['message'],
@@ -91,6 +109,51 @@ class Controller:
             'status': 200
         })
     
+    def bulk(self, opciones):
+        datos = {}
+        if 'request' in opciones.keys() and opciones['request']:
+            datos = self.obtenerRequest(opciones['request'])
+        operaciones = datos.get('operations')
+        if not isinstance(operaciones, list) or len(operaciones) == 0:
+            return jsonify({
+                'data': [],
+                'message': "Error las operaciones no son un arreglo.",
+                'status': 400
+            })
+        if len(operaciones) > Config.BULK_MAXIMO_OPERACIONES:
+            return jsonify({
+                'data': [],
+                'message': f"Se permiten como máximo {Config.BULK_MAXIMO_OPERACIONES} operaciones.",
+                'status': 400
+            })
+        for operacion in operaciones:
+            if not isinstance(operacion, dict) or not isinstance(operacion.get('data', {}), dict):
+                continue
+            claves = operacion.get('data', {}).keys()
+            if operacion.get('type') == 'insert':
+                faltantes = [clave for clave in opciones['rules'] if clave not in claves]
+                if faltantes:
+                    operacion['error'] = f"falta la columna obligatoria {faltantes[0]}"
+                    continue
+            desconocidas = [clave for clave in claves if clave not in opciones['columnas']]
+            if desconocidas:
+                operacion['error'] = f"columna desconocida {desconocidas[0]}"
+                continue
+            if operacion.get('type') in ('insert', 'update') and 'preparar' in opciones:
+                try:
+                    operacion['data'] = opciones['preparar'](dict(operacion['data']))
+                except Exception as e:
+                    operacion['error'] = f"datos inválidos: {e}"
+        respuesta = self.execQueries.escrituraMasiva({
+            'operaciones': operaciones,
+            'id': opciones['id']
+        })
+        return jsonify({
+            'data': respuesta['data'],
+            'message': respuesta['message'],
+            'status': 200
+        })
+
     def put(self, opciones):
         datos = {}
         if 'request' in opciones.keys() and opciones['request']:
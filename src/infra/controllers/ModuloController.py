@@ -1,5 +1,7 @@
 from infra.controllers.Controller import Controller
 from infra.models.ModuloModel import Modulo
+from infra.db.Querys import Query
+from infra.db.VistaModuloContenido import VistaModuloContenido
 from flask import jsonify
 
 class ModuloController(Controller):
@@ -9,6 +11,8 @@ class ModuloController(Controller):
         self.nombreColeccion = modelo.nombreColeccion
         self.columnas = modelo.opciones['columns']
         super().__init__(self.nombreColeccion)
+        self.execQueries.asociarVista(VistaModuloContenido(), '_id')
+        self.consultasVista = Query(VistaModuloContenido.nombreColeccion)
         
     def obtener(self, request):
         proyeccion = {
@@ -23,22 +27,34 @@ class ModuloController(Controller):
             'request':request, 
             'proyeccion':proyeccion})
 
-    def obtenerRelacionContenido(self):
-        return self.especialGet({
-            'coleccion': 'contenido',
-            'id_local':'_id',
-            'id_relacion': 'id_modulo',
-            'as':'contenido'
-        })
+    def obtenerRelacionContenido(self, request):
+        proyeccion = {
+            '_id': 1,
+            'id_docente': 1,
+            'id_materia':1,
+            'title': 1,
+            'desciption': 1,
+            'image': 1,
+            'contenido._id': 1,
+            'contenido.id_contenido': 1,
+            'contenido.title': 1,
+            'contenido.type': 1,
+            'contenido.files': 1,
+            'contenido.time_deliver': 1,
+            'contenido.status': 1,
+            'contenido.points': 1,
+        }
+        return self.get({
+            'request': request,
+            'proyeccion': proyeccion,
+            'todo': True,
+            'consultas': self.consultasVista})
 
     def obtenerModulosPorMateria(self, request):
         datos = request.get_json() if request.is_json else request.form if request.form else request.args
         idsMaterias = datos.get('materias')
         return self.especialGet({
-            'coleccion': 'contenido',
-            'id_local':'_id',
-            'id_relacion': 'id_modulo',
-            'as':'contenido',
+            'consultas': self.consultasVista,
             'match': idsMaterias,
             'campo_match': 'id_materia',
             'group':{
@@ -71,4 +87,11 @@ class ModuloController(Controller):
         return self.patch({'request': request})
 
     def eliminarRegistro(self, request):
-        return self.delete({'request': request})
\ No newline at end of file
+        return self.delete({'request': request})
+
+    def escrituraMasiva(self, request):
+        return self.bulk({
+            'request': request,
+            'id': self.columnas[0],
+            'rules': self.columnas[1:4],
+            'columnas': self.columnas})
\ No newline at end of file
@@ -1,11 +1,13 @@
 from flask import request, jsonify
 from src.services.educativo_service import EducativoService
 from src.services.mega_service import MegaService
-from src.models.anuncio_model import AnuncioModel
+from src.services.carga_paralela import MotorCargaParalela, ErrorCarga
+from src.infra.models.anuncio_model import AnuncioModel
 from src.utils.file_utils import FileUtils
+from src.utils.paginacion import Paginacion
+from src.utils.etag import ETagListado
 from src.config.settings import Config
 import logging
-import tempfile
 import uuid
 from datetime import datetime
 
@@ -15,6 +17,7 @@ class AnuncioController:
     def __init__(self):
         self.educativo_service = EducativoService(Config.MONGO_URI)
         self.mega_service = MegaService(Config.MEGA_EMAIL, Config.MEGA_PASSWORD)
+        self.motor_carga = MotorCargaParalela()
         self.anuncio_model = AnuncioModel()
     
     def _response_format(self, status: str, code: int, message: str, data=None):
@@ -37,28 +40,23 @@ class AnuncioController:
             if not id_curso:
                 return self._response_format("error", 400, "id_curso es requerido")
             
-            anuncios = self.educativo_service.obtener_anuncios_por_curso(id_curso)
+            version = self.educativo_service.version_listado("anuncios", id_curso)
+            if ETagListado.vigente(version):
+                return ETagListado.no_modificado(version)
             
-            # Formatear respuesta
-            anuncios_formateados = []
-            for anuncio in anuncios:
-                anuncios_formateados.append({
-                    "id": str(anuncio['_id']),
-                    "id_curso": anuncio['id_curso'],
-                    "titulo": anuncio['titulo'],
-                    "contenido": anuncio['contenido'],
-                    "autor_id": anuncio['autor_id'],
-                    "tipo_usuario": anuncio['tipo_usuario'],
-                    "archivos": anuncio.get('archivos', []),
-                    "fecha_creacion": anuncio['fecha_creacion'].isoformat()
-                })
+            limite, cursor = Paginacion.parametros(data)
+            # Los anuncios ya vienen con el formato de la respuesta
+            anuncios, siguiente = self.educativo_service.obtener_anuncios_por_curso(id_curso, limite, cursor, version)
             
-            return self._response_format("success", 200, "Anuncios obtenidos exitosamente", {
+            return ETagListado.etiquetar(self._response_format("success", 200, "Anuncios obtenidos exitosamente", {
                 "id_curso": id_curso,
-                "total_anuncios": len(anuncios_formateados),
-                "anuncios": anuncios_formateados
-            })
+                "total_anuncios": len(anuncios),
+                "anuncios": anuncios,
+                "next_cursor": siguiente
+            }), version)
             
+        except ValueError as e:
+            return self._response_format("error", 400, str(e))
         except Exception as e:
             logger.error(f"Error al obtener anuncios: {e}")
             return self._response_format("error", 500, "Error interno del servidor")
@@ -180,71 +178,62 @@ class AnuncioController:
             if not anuncio_id or not autor_id:
                 return self._response_format("error", 400, "anuncio_id y autor_id son requeridos")
             
-            archivos_subidos = []
-            errores = []
-            
             # Crear carpeta en MEGA si no existe
             ruta_mega = f"/Archivo/anuncio/{anuncio_id}/"
+            self.mega_service.crear_carpeta(ruta_mega)
             
-            for archivo in archivos:
-                try:
-                    if archivo.filename == '':
-                        continue
-                        
-                    # Validaciones
-                    if not FileUtils.archivo_permitido(archivo.filename):
-                        errores.append(f"Archivo {archivo.filename}: tipo no permitido")
-                        continue
-                    
-                    # Obtener información del archivo
-                    archivo_info = FileUtils.obtener_info_archivo(archivo)
+            def procesar_archivo(archivo):
+                if archivo.filename == '':
+                    return None
                     
-                    # Generar nombre único
-                    nombre_unico = f"{uuid.uuid4()}_{archivo_info['nombre']}"
-                    
-                    # Guardar archivo temporalmente
-                    with tempfile.TemporaryDirectory() as temp_dir:
-                        temp_path = FileUtils.guardar_archivo_temporal(archivo, temp_dir)
-                        
-                        # Subir a MEGA
-                        resultado_mega = self.mega_service.subir_archivo(
-                            temp_path, 
-                            ruta_mega, 
-                            nombre_unico
-                        )
-                        
-                        if not resultado_mega:
-                            errores.append(f"Error al subir {archivo.filename} a MEGA")
-                            continue
-                        
-                        # Crear documento de archivo
-                        documento_archivo = {
-                            "usuario_id": autor_id,
-                            "tipo_usuario": tipo_usuario,
-                            "nombre_original": archivo.filename,
-                            "nombre_almacenado": nombre_unico,
-                            "url": resultado_mega['link'],
-                            "tipo": archivo_info['mime'],
-                            "peso": archivo_info['peso_bytes'],
-                            "modulo_origen": "anuncio",
-                            "referencia_id": anuncio_id,
-                            "fecha_subida": datetime.utcnow()
-                        }
-                        
-                        # Guardar en MongoDB
-                        archivo_id = self.educativo_service.insertar_archivo_educativo(documento_archivo)
-                        
-                        archivos_subidos.append({
-                            "archivo_id": archivo_id,
-                            "nombre_original": archivo.filename,
-                            "nombre_almacenado": nombre_unico,
-                            "url": resultado_mega['link'],
-                            "tipo": archivo_info['mime'],
-                            "peso": archivo_info['peso_bytes']
-                        })
-                        
-                except Exception as e:
-                    errores.append(f"Error al procesar {archivo.filename}: {str(e)}")
+                # Validaciones
+                if not FileUtils.archivo_permitido(archivo.filename):
+                    raise ErrorCarga(f"Archivo {archivo.filename}: tipo no permitido")
+                
+                # Obtener información del archivo
+                archivo_info = FileUtils.obtener_info_archivo(archivo)
+                
+                # Generar nombre único
+                nombre_unico = f"{uuid.uuid4()}_{archivo_info['nombre']}"
+                
+                # Subir a MEGA directamente desde el stream de la petición
+                resultado_mega = self.mega_service.subir_stream(
+                    archivo.stream,
+                    archivo_info['peso_bytes'],
+                    ruta_mega,
+                    nombre_unico
+                )
+                
+                if not resultado_mega:
+                    raise ErrorCarga(f"Error al subir {archivo.filename} a MEGA")
+                
+                # Crear documento de archivo
+                documento_archivo = {
+                    "usuario_id": autor_id,
+                    "tipo_usuario": tipo_usuario,
+                    "nombre_original": archivo.filename,
+                    "nombre_almacenado": nombre_unico,
+                    "url": resultado_mega['link'],
+                    "tipo": archivo_info['mime'],
+                    "peso": archivo_info['peso_bytes'],
+                    "modulo_origen": "anuncio",
+                    "referencia_id": anuncio_id,
+                    "fecha_subida": datetime.utcnow()
+                }
+                
+                # Guardar en MongoDB
+                archivo_id = self.educativo_service.insertar_archivo_educativo(documento_archivo)
+                
+                return {
+                    "archivo_id": archivo_id,
+                    "nombre_original": archivo.filename,
+                    "nombre_almacenado": nombre_unico,
+                    "url": resultado_mega['link'],
+                    "tipo": archivo_info['mime'],
+                    "peso": archivo_info['peso_bytes']
+                }
+
+            archivos_subidos, errores = self.motor_carga.subir(archivos, procesar_archivo)
             
             if archivos_subidos:
                 message = f"Se subieron {len(archivos_subidos)} archivos exitosamente"
@@ -1,14 +1,16 @@
-from flask import request, jsonify, send_file
+from flask import request, jsonify, Response, stream_with_context
 from werkzeug.exceptions import BadRequest
 from src.services.mongo_service import MongoService
 from src.services.mega_service import MegaService
+from src.services.carga_paralela import MotorCargaParalela, ErrorCarga
 from src.services.educativo_service import EducativoService
-from src.models.archivo_model import ArchivoModel, CarpetaUsuarioModel
+from src.infra.models.archivo_model import ArchivoModel, CarpetaUsuarioModel
 from src.utils.file_utils import FileUtils
+from src.utils.paginacion import Paginacion
+from src.utils.ndjson import RespuestaNDJSON
 from src.config.settings import Config
 import logging
 import os
-import tempfile
 import zipfile
 from io import BytesIO
 from datetime import datetime
@@ -21,6 +23,7 @@ class ArchivoController:
     def __init__(self):
         self.mongo_service = MongoService(Config.MONGO_URI)
         self.mega_service = MegaService(Config.MEGA_EMAIL, Config.MEGA_PASSWORD)
+        self.motor_carga = MotorCargaParalela()
         self.educativo_service = EducativoService(Config.MONGO_URI)
         self.archivo_model = ArchivoModel()
         self.carpeta_model = CarpetaUsuarioModel()
@@ -64,55 +67,55 @@ class ArchivoController:
             # Obtener información del archivo
             archivo_info = FileUtils.obtener_info_archivo(archivo)
             
+            if not self.mongo_service.uso.verificar_cuota(usuario_id, archivo_info['peso_bytes']):
+                return self._response_format("error", 413, "Cuota de almacenamiento excedida")
+            
             # Verificar/crear carpetas del usuario
             self._verificar_carpetas_usuario(usuario_id)
             
-            # Guardar archivo temporalmente
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = FileUtils.guardar_archivo_temporal(archivo, temp_dir)
-                
-                # Generar ruta en MEGA
-                ruta_mega = FileUtils.generar_ruta_mega(usuario_id, carpeta)
-                
-                # Subir a MEGA
-                resultado_mega = self.mega_service.subir_archivo(
-                    temp_path, 
-                    ruta_mega, 
-                    archivo_info['nombre']
-                )
-                
-                if not resultado_mega:
-                    return self._response_format("error", 500, "Error al subir archivo a MEGA")
-                
-                # Actualizar información del archivo
-                archivo_info.update({
-                    "link": resultado_mega['link'],
-                    "ruta": ruta_mega + archivo_info['nombre'],
-                    "mega_node_id": resultado_mega['node_id']
-                })
-                
-                # Crear documento para MongoDB
-                documento = ArchivoModel.crear_documento_archivo(
-                    usuario_id,
-                    carpeta,
-                    archivo_info
-                )
-                
-                # Guardar en MongoDB
-                archivo_id = self.mongo_service.insertar_archivo(documento)
-                
-                return self._response_format("success", 201, "Archivo subido exitosamente", {
-                    "userId": usuario_id,
-                    "file": {
-                        "id": archivo_id,
-                        "secureName": archivo_info['nombre'],
-                        "originalName": archivo.filename,
-                        "contentType": archivo_info['mime'],
-                        "size": archivo_info['peso_bytes'],
-                        "link": resultado_mega['link']
-                    }
-                })
-                
+            # Generar ruta en MEGA
+            ruta_mega = FileUtils.generar_ruta_mega(usuario_id, carpeta)
+            
+            # Subir a MEGA directamente desde el stream de la petición
+            resultado_mega = self.mega_service.subir_stream(
+                archivo.stream,
+                archivo_info['peso_bytes'],
+                ruta_mega,
+                archivo_info['nombre']
+            )
+            
+            if not resultado_mega:
+                return self._response_format("error", 500, "Error al subir archivo a MEGA")
+            
+            # Actualizar información del archivo
+            archivo_info.update({
+                "link": resultado_mega['link'],
+                "ruta": ruta_mega + archivo_info['nombre'],
+                "mega_node_id": resultado_mega['node_id']
+            })
+            
+            # Crear documento para MongoDB
+            documento = ArchivoModel.crear_documento_archivo(
+                usuario_id,
+                carpeta,
+                archivo_info
+            )
+            
+            # Guardar en MongoDB
+            archivo_id = self.mongo_service.insertar_archivo(documento)
+            
+            return self._response_format("success", 201, "Archivo subido exitosamente", {
+                "userId": usuario_id,
+                "file": {
+                    "id": archivo_id,
+                    "secureName": archivo_info['nombre'],
+                    "originalName": archivo.filename,
+                    "contentType": archivo_info['mime'],
+                    "size": archivo_info['peso_bytes'],
+                    "link": resultado_mega['link']
+                }
+            })
+            
         except Exception as e:
             logger.error(f"Error al subir archivo de contenido: {e}")
             return self._response_format("error", 500, "Error interno del servidor")
@@ -151,89 +154,79 @@ class ArchivoController:
             logger.info("Verificando carpetas del usuario")
             self._verificar_carpetas_usuario(usuario_id)
             
-            archivos_subidos = []
-            errores = []
-            
-            for archivo in archivos:
-                try:
-                    logger.info(f"Procesando archivo: {archivo.filename}")
+            def procesar_archivo(archivo):
+                logger.info(f"Procesando archivo: {archivo.filename}")
 
-                    if archivo.filename == '':
-                        logger.warning("Archivo sin nombre, se omite")
-                        continue
-                        
-                    if not FileUtils.archivo_permitido(archivo.filename):
-                        logger.warning(f"Archivo no permitido: {archivo.filename}")
-                        errores.append(f"Archivo {archivo.filename}: tipo no permitido")
-                        continue
+                if archivo.filename == '':
+                    logger.warning("Archivo sin nombre, se omite")
+                    return None
                     
-                    # Obtener información del archivo
-                    archivo_info = FileUtils.obtener_info_archivo(archivo)
-                    logger.info(f"Información del archivo obtenida: {archivo_info}")
-                    
-                    # Guardar archivo temporalmente
-                    with tempfile.TemporaryDirectory() as temp_dir:
-                        temp_path = FileUtils.guardar_archivo_temporal(archivo, temp_dir)
-                        logger.info(f"Archivo guardado temporalmente en: {temp_path}")
-                        
-                        # Generar ruta en MEGA
-                        ruta_mega = FileUtils.generar_ruta_mega(usuario_id, carpeta)
-                        logger.info(f"Ruta MEGA generada: {ruta_mega}")
+                if not FileUtils.archivo_permitido(archivo.filename):
+                    logger.warning(f"Archivo no permitido: {archivo.filename}")
+                    raise ErrorCarga(f"Archivo {archivo.filename}: tipo no permitido")
+                
+                # Obtener información del archivo
+                archivo_info = FileUtils.obtener_info_archivo(archivo)
+                logger.info(f"Información del archivo obtenida: {archivo_info}")
+                
+                if not self.mongo_service.uso.verificar_cuota(usuario_id, archivo_info['peso_bytes']):
+                    raise ErrorCarga(f"Archivo {archivo.filename}: cuota de almacenamiento excedida")
+                
+                # Generar ruta en MEGA
+                ruta_mega = FileUtils.generar_ruta_mega(usuario_id, carpeta)
+                logger.info(f"Ruta MEGA generada: {ruta_mega}")
 
-                        # Crear carpeta si no existe
-                        if not self.mega_service.crear_carpeta(ruta_mega):
-                            logger.error(f"No se pudo crear la carpeta en MEGA: {ruta_mega}")
-                            errores.append(f"Error al crear la carpeta {ruta_mega}")
-                            continue
-                        
-                        # Subir a MEGA
-                        logger.info("Intentando subir archivo a MEGA...")
-                        resultado_mega = self.mega_service.subir_archivo(
-                            temp_path, 
-                            ruta_mega, 
-                            archivo_info['nombre']
-                        )
-                        
-                        if not resultado_mega:
-                            logger.error(f"Fallo al subir {archivo.filename} a MEGA")
-                            errores.append(f"Error al subir {archivo.filename} a MEGA")
-                            continue
-                        
-                        logger.info(f"Archivo subido a MEGA: {resultado_mega}")
+                # Crear carpeta si no existe
+                if not self.mega_service.crear_carpeta(ruta_mega):
+                    logger.error(f"No se pudo crear la carpeta en MEGA: {ruta_mega}")
+                    raise ErrorCarga(f"Error al crear la carpeta {ruta_mega}")
+                
+                # Subir a MEGA directamente desde el stream de la petición
+                logger.info("Intentando subir archivo a MEGA...")
+                resultado_mega = self.mega_service.subir_stream(
+                    archivo.stream,
+                    archivo_info['peso_bytes'],
+                    ruta_mega,
+                    archivo_info['nombre']
+                )
+                
+                if not resultado_mega:
+                    logger.error(f"Fallo al subir {archivo.filename} a MEGA")
+                    raise ErrorCarga(f"Error al subir {archivo.filename} a MEGA")
+                
+                logger.info(f"Archivo subido a MEGA: {resultado_mega}")
 
-                        # Actualizar información del archivo
-                        archivo_info.update({
-                            "link": resultado_mega['link'],
-                            "ruta": ruta_mega + archivo_info['nombre'],
-                            "mega_node_id": resultado_mega['node_id']
-                        })
-                        
-                        # Crear documento para MongoDB
-                        documento = ArchivoModel.crear_documento_archivo(
-                            usuario_id,
-                            carpeta,
-                            archivo_info
-                        )
-                        logger.info("Documento MongoDB creado")
+                # Actualizar información del archivo
+                archivo_info.update({
+                    "link": resultado_mega['link'],
+                    "ruta": ruta_mega + archivo_info['nombre'],
+                    "mega_node_id": resultado_mega['node_id']
+                })
+                
+                # Crear documento para MongoDB
+                documento = ArchivoModel.crear_documento_archivo(
+                    usuario_id,
+                    carpeta,
+                    archivo_info
+                )
+                logger.info("Documento MongoDB creado")
 
-                        # Guardar en MongoDB
-                        archivo_id = self.mongo_service.insertar_archivo(documento)
-                        logger.info(f"Archivo insertado en MongoDB con ID: {archivo_id}")
-                        
-                        archivos_subidos.append({
-                            "id": archivo_id,
-                            "secureName": archivo_info['nombre'],
-                            "originalName": archivo.filename,
-                            "contentType": archivo_info['mime'],
-                            "size": archivo_info['peso_bytes'],
-                            "link": resultado_mega['link']
-                        })
+                # Guardar en MongoDB
+                archivo_id = self.mongo_service.insertar_archivo(documento)
+                logger.info(f"Archivo insertado en MongoDB con ID: {archivo_id}")
+                
+                logger.info(f"Archivo procesado exitosamente: {archivo.filename}")
 
-                        logger.info(f"Archivo procesado exitosamente: {archivo.filename}")
+                return {
+                    "id": archivo_id,
+                    "secureName": archivo_info['nombre'],
+                    "originalName": archivo.filename,
+                    "contentType": archivo_info['mime'],
+                    "size": archivo_info['peso_bytes'],
+                    "link": resultado_mega['link']
+                }
 
-                except Exception as e:
-                    logger.error(f"Error al procesar archivo {archivo.filename}: {str(e)}", exc_info=True)
-                    errores.append(f"Error al procesar {archivo.filename}: {str(e)}")
+            archivos_subidos, errores = self.motor_carga.subir(archivos, procesar_archivo)
             
             if archivos_subidos:
                 message = f"Se subieron {len(archivos_subidos)} archivos exitosamente"
@@ -310,30 +303,21 @@ class ArchivoController:
             if not FileUtils.validar_carpeta(carpeta):
                 return self._response_format("error", 400, "Carpeta inválida")
             
-            # Obtener archivos del usuario en la carpeta específica
-            archivos = self.mongo_service.obtener_archivos_usuario_carpeta(usuario_id, carpeta)
-            
-            # Filtrar archivos activos
-            archivos_activos = [
-                {
-                    "id": str(archivo['_id']),
-                    "secureName": archivo['archivo']['nombre'],
-                    "originalName": archivo['archivo']['nombre'],
-                    "contentType": archivo['archivo']['tipo'],
-                    "size": archivo['archivo']['peso'],
-                    "link": archivo['archivo']['link']
-                }
-                for archivo in archivos 
-                if archivo.get('estado') == 'activo'
-            ]
+            # Obtener una página de archivos del usuario en la carpeta específica
+            limite, cursor = Paginacion.parametros(data)
+            # La consulta ya filtra los archivos activos y les da el formato de la respuesta
+            archivos, siguiente = self.mongo_service.obtener_archivos_usuario_carpeta(usuario_id, carpeta, limite, cursor)
             
             return self._response_format("success", 200, f"Archivos de la carpeta {carpeta} obtenidos", {
                 "userId": usuario_id,
                 "carpeta": carpeta,
-                "totalFiles": len(archivos_activos),
-                "files": archivos_activos
+                "totalFiles": len(archivos),
+                "files": archivos,
+                "next_cursor": siguiente
             })
             
+        except ValueError as e:
+            return self._response_format("error", 400, str(e))
         except Exception as e:
             logger.error(f"Error al listar archivos de contenido: {e}")
             return self._response_format("error", 500, "Error interno del servidor")
@@ -360,18 +344,21 @@ class ArchivoController:
             if archivo['usuario_id'] != usuario_id:
                 return self._response_format("error", 403, "No tienes permisos para acceder a este archivo")
             
-            # Descargar archivo de MEGA
-            archivo_descargado = self.mega_service.descargar_archivo(archivo['archivo']['mega_node_id'])
+            # Descargar archivo de MEGA descifrando cada fragmento al enviarlo
+            descarga = self.mega_service.descargar_stream(archivo['archivo']['mega_node_id'])
             
-            if not archivo_descargado:
+            if not descarga:
                 return self._response_format("error", 500, "Error al descargar archivo de MEGA")
             
-            return send_file(
-                archivo_descargado,
-                as_attachment=True,
-                download_name=archivo['archivo']['nombre'],
-                mimetype=archivo['archivo']['tipo']
+            tamano, fragmentos = descarga
+            respuesta = Response(
+                stream_with_context(fragmentos),
+                mimetype=archivo['archivo'].get('tipo') or 'application/octet-stream',
+                direct_passthrough=True
             )
+            respuesta.content_length = archivo['archivo'].get('peso') or tamano
+            respuesta.headers.set('Content-Disposition', 'attachment', filename=archivo['archivo']['nombre'])
+            return respuesta
             
         except Exception as e:
             logger.error(f"Error al descargar archivo de contenido: {e}")
@@ -434,7 +421,7 @@ class ArchivoController:
             if node_id and self.mega_service.eliminar_archivo(node_id):
                 logger.info(f"Archivo eliminado de MEGA exitosamente: {node_id}")
                 logger.info(f"Intentando eliminar referencia en MongoDB: {archivo_id}")
-                if self.mongo_service.ealiminar_archivo(archivo_id):
+                if self.mongo_service.eliminar_archivo(archivo_id):
                     logger.info(f"Archivo eliminado de MongoDB exitosamente: {archivo_id}")
                     return self._response_format("success", 200, "Archivo eliminado exitosamente", {
                         "userId": usuario_id,
@@ -471,93 +458,72 @@ class ArchivoController:
             if not publicacion_id or not autor_id:
                 return self._response_format("error", 400, "publicacion_id y autor_id son requeridos")
             
-            archivos_subidos = []
-            errores = []
-            
             # Crear carpeta en MEGA si no existe
             ruta_mega = f"/Archivo/publicacion/{publicacion_id}/"
+            self.mega_service.crear_carpeta(ruta_mega)
             
-            for archivo in archivos:
-                try:
-                    if archivo.filename == '':
-                        continue
-                        
-                    # Validaciones
-                    if not FileUtils.archivo_permitido(archivo.filename):
-                        errores.append(f"Archivo {archivo.filename}: tipo no permitido")
-                        continue
+            def procesar_archivo(archivo):
+                if archivo.filename == '':
+                    return None
                     
-                    # Obtener información del archivo
-                    archivo_info = FileUtils.obtener_info_archivo(archivo)
-                    
-                    # Generar nombre único
-                    nombre_unico = f"{uuid.uuid4()}_{archivo_info['nombre']}"
-                    
-                    # Guardar archivo temporalmente
-                    with tempfile.TemporaryDirectory() as temp_dir:
-                        temp_path = FileUtils.guardar_archivo_temporal(archivo, temp_dir)
-                        
-                        # Subir a MEGA
-                        resultado_mega = self.mega_service.subir_archivo(
-                            temp_path, 
-                            ruta_mega, 
-                            nombre_unico
-                        )
-                        
-                        if not resultado_mega:
-                            errores.append(f"Error al subir {archivo.filename} a MEGA")
-                            continue
-                        
-                        # Crear documento de archivo educativo
-                        documento_archivo = {
-                            "usuario_id": autor_id,
-                            "tipo_usuario": "docente",
-                            "nombre_original": archivo.filename,
-                            "nombre_almacenado": nombre_unico,
-                            "url": resultado_mega['link'],
-                            "tipo": archivo_info['mime'],
-                            "peso": archivo_info['peso_bytes'],
-                            "modulo_origen": "publicacion",
-                            "referencia_id": publicacion_id,
-                            "mega_node_id": resultado_mega['node_id'],
-                            "fecha_subida": datetime.utcnow()
-                        }
-                        
-                        # Guardar en MongoDB (colección archivos)
-                        archivo_id = self.educativo_service.insertar_archivo_educativo(documento_archivo)
-                        
-                        archivo_info_respuesta = {
-                            "archivo_id": archivo_id,
-                            "nombre_original": archivo.filename,
-                            "nombre_almacenado": nombre_unico,
-                            "url": resultado_mega['link'],
-                            "tipo": archivo_info['mime'],
-                            "peso": archivo_info['peso_bytes']
-                        }
-                        
-                        archivos_subidos.append(archivo_info_respuesta)
-                        
-                except Exception as e:
-                    errores.append(f"Error al procesar {archivo.filename}: {str(e)}")
+                # Validaciones
+                if not FileUtils.archivo_permitido(archivo.filename):
+                    raise ErrorCarga(f"Archivo {archivo.filename}: tipo no permitido")
+                
+                # Obtener información del archivo
+                archivo_info = FileUtils.obtener_info_archivo(archivo)
+                
+                # Generar nombre único
+                nombre_unico = f"{uuid.uuid4()}_{archivo_info['nombre']}"
+                
+                # Subir a MEGA directamente desde el stream de la petición
+                resultado_mega = self.mega_service.subir_stream(
+                    archivo.stream,
+                    archivo_info['peso_bytes'],
+                    ruta_mega,
+                    nombre_unico
+                )
+                
+                if not resultado_mega:
+                    raise ErrorCarga(f"Error al subir {archivo.filename} a MEGA")
+                
+                # Crear documento de archivo educativo
+                documento_archivo = {
+                    "usuario_id": autor_id,
+                    "tipo_usuario": "docente",
+                    "nombre_original": archivo.filename,
+                    "nombre_almacenado": nombre_unico,
+                    "url": resultado_mega['link'],
+                    "tipo": archivo_info['mime'],
+                    "peso": archivo_info['peso_bytes'],
+                    "modulo_origen": "publicacion",
+                    "referencia_id": publicacion_id,
+                    "mega_node_id": resultado_mega['node_id'],
+                    "fecha_subida": datetime.utcnow()
+                }
+                
+                # Guardar en MongoDB (colección archivos)
+                archivo_id = self.educativo_service.insertar_archivo_educativo(documento_archivo)
+                
+                archivo_info_respuesta = {
+                    "archivo_id": archivo_id,
+                    "nombre_original": archivo.filename,
+                    "nombre_almacenado": nombre_unico,
+                    "url": resultado_mega['link'],
+                    "tipo": archivo_info['mime'],
+                    "peso": archivo_info['peso_bytes']
+                }
+                
+                return archivo_info_respuesta
+
+            archivos_subidos, errores = self.motor_carga.subir(archivos, procesar_archivo)
             
-            # Actualizar el campo archivos en la publicación
+            # Agregar los archivos a la publicación en una sola actualización
             if archivos_subidos:
-                try:
-                    # Obtener publicación actual
-                    publicacion = self.educativo_service.publicaciones_collection.find_one({"_id": ObjectId(publicacion_id)})
-                    if publicacion:
-                        archivos_actuales = publicacion.get('archivos', [])
-                        archivos_actuales.extend(archivos_subidos)
-                        
-                        # Actualizar publicación con nuevos archivos
-                        self.educativo_service.actualizar_publicacion(publicacion_id, {
-                            'archivos': archivos_actuales
-                        })
-                        logger.info(f"Campo archivos actualizado en publicación {publicacion_id}")
-                    else:
-                        logger.error(f"Publicación {publicacion_id} no encontrada")
-                except Exception as e:
-                    logger.error(f"Error al actualizar campo archivos en publicación: {e}")
+                if self.educativo_service.agregar_archivos("publicacion", publicacion_id, archivos_subidos):
+                    logger.info(f"Campo archivos actualizado en publicación {publicacion_id}")
+                else:
+                    logger.error(f"Publicación {publicacion_id} no encontrada")
             
             if archivos_subidos:
                 message = f"Se subieron {len(archivos_subidos)} archivos exitosamente"
@@ -597,93 +563,72 @@ class ArchivoController:
             if not tarea_id or not autor_id:
                 return self._response_format("error", 400, "tarea_id y autor_id son requeridos")
             
-            archivos_subidos = []
-            errores = []
-            
             # Crear carpeta en MEGA si no existe
             ruta_mega = f"/Archivo/tarea/{tarea_id}/"
+            self.mega_service.crear_carpeta(ruta_mega)
             
-            for archivo in archivos:
-                try:
-                    if archivo.filename == '':
-                        continue
-                        
-                    # Validaciones
-                    if not FileUtils.archivo_permitido(archivo.filename):
-                        errores.append(f"Archivo {archivo.filename}: tipo no permitido")
-                        continue
-                    
-                    # Obtener información del archivo
-                    archivo_info = FileUtils.obtener_info_archivo(archivo)
+            def procesar_archivo(archivo):
+                if archivo.filename == '':
+                    return None
                     
-                    # Generar nombre único
-                    nombre_unico = f"{uuid.uuid4()}_{archivo_info['nombre']}"
-                    
-                    # Guardar archivo temporalmente
-                    with tempfile.TemporaryDirectory() as temp_dir:
-                        temp_path = FileUtils.guardar_archivo_temporal(archivo, temp_dir)
-                        
-                        # Subir a MEGA
-                        resultado_mega = self.mega_service.subir_archivo(
-                            temp_path, 
-                            ruta_mega, 
-                            nombre_unico
-                        )
-                        
-                        if not resultado_mega:
-                            errores.append(f"Error al subir {archivo.filename} a MEGA")
-                            continue
-                        
-                        # Crear documento de archivo educativo
-                        documento_archivo = {
-                            "usuario_id": autor_id,
-                            "tipo_usuario": "docente",
-                            "nombre_original": archivo.filename,
-                            "nombre_almacenado": nombre_unico,
-                            "url": resultado_mega['link'],
-                            "tipo": archivo_info['mime'],
-                            "peso": archivo_info['peso_bytes'],
-                            "modulo_origen": "tarea",
-                            "referencia_id": tarea_id,
-                            "mega_node_id": resultado_mega['node_id'],
-                            "fecha_subida": datetime.utcnow()
-                        }
-                        
-                        # Guardar en MongoDB (colección archivos)
-                        archivo_id = self.educativo_service.insertar_archivo_educativo(documento_archivo)
-                        
-                        archivo_info_respuesta = {
-                            "archivo_id": archivo_id,
-                            "nombre_original": archivo.filename,
-                            "nombre_almacenado": nombre_unico,
-                            "url": resultado_mega['link'],
-                            "tipo": archivo_info['mime'],
-                            "peso": archivo_info['peso_bytes']
-                        }
-                        
-                        archivos_subidos.append(archivo_info_respuesta)
-                        
-                except Exception as e:
-                    errores.append(f"Error al procesar {archivo.filename}: {str(e)}")
+                # Validaciones
+                if not FileUtils.archivo_permitido(archivo.filename):
+                    raise ErrorCarga(f"Archivo {archivo.filename}: tipo no permitido")
+                
+                # Obtener información del archivo
+                archivo_info = FileUtils.obtener_info_archivo(archivo)
+                
+                # Generar nombre único
+                nombre_unico = f"{uuid.uuid4()}_{archivo_info['nombre']}"
+                
+                # Subir a MEGA directamente desde el stream de la petición
+                resultado_mega = self.mega_service.subir_stream(
+                    archivo.stream,
+                    archivo_info['peso_bytes'],
+                    ruta_mega,
+                    nombre_unico
+                )
+                
+                if not resultado_mega:
+                    raise ErrorCarga(f"Error al subir {archivo.filename} a MEGA")
+                
+                # Crear documento de archivo educativo
+                documento_archivo = {
+                    "usuario_id": autor_id,
+                    "tipo_usuario": "docente",
+                    "nombre_original": archivo.filename,
+                    "nombre_almacenado": nombre_unico,
+                    "url": resultado_mega['link'],
+                    "tipo": archivo_info['mime'],
+                    "peso": archivo_info['peso_bytes'],
+                    "modulo_origen": "tarea",
+                    "referencia_id": tarea_id,
+                    "mega_node_id": resultado_mega['node_id'],
+                    "fecha_subida": datetime.utcnow()
+                }
+                
+                # Guardar en MongoDB (colección archivos)
+                archivo_id = self.educativo_service.insertar_archivo_educativo(documento_archivo)
+                
+                archivo_info_respuesta = {
+                    "archivo_id": archivo_id,
+                    "nombre_original": archivo.filename,
+                    "nombre_almacenado": nombre_unico,
+                    "url": resultado_mega['link'],
+                    "tipo": archivo_info['mime'],
+                    "peso": archivo_info['peso_bytes']
+                }
+                
+                return archivo_info_respuesta
+
+            archivos_subidos, errores = self.motor_carga.subir(archivos, procesar_archivo)
             
-            # Actualizar el campo archivos en la tarea
+            # Agregar los archivos a la tarea en una sola actualización
             if archivos_subidos:
-                try:
-                    # Obtener tarea actual
-                    tarea = self.educativo_service.tareas_collection.find_one({"_id": ObjectId(tarea_id)})
-                    if tarea:
-                        archivos_actuales = tarea.get('archivos', [])
-                        archivos_actuales.extend(archivos_subidos)
-                        
-                        # Actualizar tarea con nuevos archivos
-                        self.educativo_service.actualizar_tarea(tarea_id, {
-                            'archivos': archivos_actuales
-                        })
-                        logger.info(f"Campo archivos actualizado en tarea {tarea_id}")
-                    else:
-                        logger.error(f"Tarea {tarea_id} no encontrada")
-                except Exception as e:
-                    logger.error(f"Error al actualizar campo archivos en tarea: {e}")
+                if self.educativo_service.agregar_archivos("tarea", tarea_id, archivos_subidos):
+                    logger.info(f"Campo archivos actualizado en tarea {tarea_id}")
+                else:
+                    logger.error(f"Tarea {tarea_id} no encontrada")
             
             if archivos_subidos:
                 message = f"Se subieron {len(archivos_subidos)} archivos exitosamente"
@@ -723,93 +668,72 @@ class ArchivoController:
             if not id_tarea or not id_estudiante:
                 return self._response_format("error", 400, "id_tarea e id_estudiante son requeridos")
             
-            archivos_subidos = []
-            errores = []
-            
             # Crear carpeta en MEGA si no existe
             ruta_mega = f"/Archivo/entrega/{id_tarea}/{id_estudiante}/"
+            self.mega_service.crear_carpeta(ruta_mega)
             
-            for archivo in archivos:
-                try:
-                    if archivo.filename == '':
-                        continue
-                        
-                    # Validaciones
-                    if not FileUtils.archivo_permitido(archivo.filename):
-                        errores.append(f"Archivo {archivo.filename}: tipo no permitido")
-                        continue
-                    
-                    # Obtener información del archivo
-                    archivo_info = FileUtils.obtener_info_archivo(archivo)
+            def procesar_archivo(archivo):
+                if archivo.filename == '':
+                    return None
                     
-                    # Generar nombre único
-                    nombre_unico = f"{uuid.uuid4()}_{archivo_info['nombre']}"
-                    
-                    # Guardar archivo temporalmente
-                    with tempfile.TemporaryDirectory() as temp_dir:
-                        temp_path = FileUtils.guardar_archivo_temporal(archivo, temp_dir)
-                        
-                        # Subir a MEGA
-                        resultado_mega = self.mega_service.subir_archivo(
-                            temp_path, 
-                            ruta_mega, 
-                            nombre_unico
-                        )
-                        
-                        if not resultado_mega:
-                            errores.append(f"Error al subir {archivo.filename} a MEGA")
-                            continue
-                        
-                        # Crear documento de archivo educativo
-                        documento_archivo = {
-                            "usuario_id": id_estudiante,
-                            "tipo_usuario": "estudiante",
-                            "nombre_original": archivo.filename,
-                            "nombre_almacenado": nombre_unico,
-                            "url": resultado_mega['link'],
-                            "tipo": archivo_info['mime'],
-                            "peso": archivo_info['peso_bytes'],
-                            "modulo_origen": "entrega",
-                            "referencia_id": id_tarea,
-                            "mega_node_id": resultado_mega['node_id'],
-                            "fecha_subida": datetime.utcnow()
-                        }
-                        
-                        # Guardar en MongoDB (colección archivos)
-                        archivo_id = self.educativo_service.insertar_archivo_educativo(documento_archivo)
-                        
-                        archivo_info_respuesta = {
-                            "archivo_id": archivo_id,
-                            "nombre_original": archivo.filename,
-                            "nombre_almacenado": nombre_unico,
-                            "url": resultado_mega['link'],
-                            "tipo": archivo_info['mime'],
-                            "peso": archivo_info['peso_bytes']
-                        }
-                        
-                        archivos_subidos.append(archivo_info_respuesta)
-                        
-                except Exception as e:
-                    errores.append(f"Error al procesar {archivo.filename}: {str(e)}")
+                # Validaciones
+                if not FileUtils.archivo_permitido(archivo.filename):
+                    raise ErrorCarga(f"Archivo {archivo.filename}: tipo no permitido")
+                
+                # Obtener información del archivo
+                archivo_info = FileUtils.obtener_info_archivo(archivo)
+                
+                # Generar nombre único
+                nombre_unico = f"{uuid.uuid4()}_{archivo_info['nombre']}"
+                
+                # Subir a MEGA directamente desde el stream de la petición
+                resultado_mega = self.mega_service.subir_stream(
+                    archivo.stream,
+                    archivo_info['peso_bytes'],
+                    ruta_mega,
+                    nombre_unico
+                )
+                
+                if not resultado_mega:
+                    raise ErrorCarga(f"Error al subir {archivo.filename} a MEGA")
+                
+                # Crear documento de archivo educativo
+                documento_archivo = {
+                    "usuario_id": id_estudiante,
+                    "tipo_usuario": "estudiante",
+                    "nombre_original": archivo.filename,
+                    "nombre_almacenado": nombre_unico,
+                    "url": resultado_mega['link'],
+                    "tipo": archivo_info['mime'],
+                    "peso": archivo_info['peso_bytes'],
+                    "modulo_origen": "entrega",
+                    "referencia_id": id_tarea,
+                    "mega_node_id": resultado_mega['node_id'],
+                    "fecha_subida": datetime.utcnow()
+                }
+                
+                # Guardar en MongoDB (colección archivos)
+                archivo_id = self.educativo_service.insertar_archivo_educativo(documento_archivo)
+                
+                archivo_info_respuesta = {
+                    "archivo_id": archivo_id,
+                    "nombre_original": archivo.filename,
+                    "nombre_almacenado": nombre_unico,
+                    "url": resultado_mega['link'],
+                    "tipo": archivo_info['mime'],
+                    "peso": archivo_info['peso_bytes']
+                }
+                
+                return archivo_info_respuesta
+
+            archivos_subidos, errores = self.motor_carga.subir(archivos, procesar_archivo)
             
-            # Actualizar el campo archivos en la entrega
+            # Agregar los archivos a la entrega en una sola actualización
             if archivos_subidos:
-                try:
-                    # Buscar entrega existente
-                    entrega = self.educativo_service.obtener_entrega_estudiante(id_tarea, id_estudiante)
-                    if entrega:
-                        archivos_actuales = entrega.get('archivos', [])
-                        archivos_actuales.extend(archivos_subidos)
-                        
-                        # Actualizar entrega con nuevos archivos
-                        self.educativo_service.actualizar_entrega(str(entrega['_id']), {
-                            'archivos': archivos_actuales
-                        })
-                        logger.info(f"Campo archivos actualizado en entrega {entrega['_id']}")
-                    else:
-                        logger.warning(f"No se encontró entrega para tarea {id_tarea} y estudiante {id_estudiante}")
-                except Exception as e:
-                    logger.error(f"Error al actualizar campo archivos en entrega: {e}")
+                if self.educativo_service.agregar_archivos("entrega", id_tarea, archivos_subidos, id_estudiante):
+                    logger.info(f"Campo archivos actualizado en entrega de tarea {id_tarea} y estudiante {id_estudiante}")
+                else:
+                    logger.warning(f"No se encontró entrega para tarea {id_tarea} y estudiante {id_estudiante}")
             
             if archivos_subidos:
                 message = f"Se subieron {len(archivos_subidos)} archivos exitosamente"
@@ -850,93 +774,72 @@ class ArchivoController:
             if not anuncio_id or not autor_id:
                 return self._response_format("error", 400, "anuncio_id y autor_id son requeridos")
             
-            archivos_subidos = []
-            errores = []
-            
             # Crear carpeta en MEGA si no existe
             ruta_mega = f"/Archivo/anuncio/{anuncio_id}/"
+            self.mega_service.crear_carpeta(ruta_mega)
             
-            for archivo in archivos:
-                try:
-                    if archivo.filename == '':
-                        continue
-                        
-                    # Validaciones
-                    if not FileUtils.archivo_permitido(archivo.filename):
-                        errores.append(f"Archivo {archivo.filename}: tipo no permitido")
-                        continue
-                    
-                    # Obtener información del archivo
-                    archivo_info = FileUtils.obtener_info_archivo(archivo)
-                    
-                    # Generar nombre único
-                    nombre_unico = f"{uuid.uuid4()}_{archivo_info['nombre']}"
+            def procesar_archivo(archivo):
+                if archivo.filename == '':
+                    return None
                     
-                    # Guardar archivo temporalmente
-                    with tempfile.TemporaryDirectory() as temp_dir:
-                        temp_path = FileUtils.guardar_archivo_temporal(archivo, temp_dir)
-                        
-                        # Subir a MEGA
-                        resultado_mega = self.mega_service.subir_archivo(
-                            temp_path, 
-                            ruta_mega, 
-                            nombre_unico
-                        )
-                        
-                        if not resultado_mega:
-                            errores.append(f"Error al subir {archivo.filename} a MEGA")
-                            continue
-                        
-                        # Crear documento de archivo educativo
-                        documento_archivo = {
-                            "usuario_id": autor_id,
-                            "tipo_usuario": tipo_usuario,
-                            "nombre_original": archivo.filename,
-                            "nombre_almacenado": nombre_unico,
-                            "url": resultado_mega['link'],
-                            "tipo": archivo_info['mime'],
-                            "peso": archivo_info['peso_bytes'],
-                            "modulo_origen": "anuncio",
-                            "referencia_id": anuncio_id,
-                            "mega_node_id": resultado_mega['node_id'],
-                            "fecha_subida": datetime.utcnow()
-                        }
-                        
-                        # Guardar en MongoDB (colección archivos)
-                        archivo_id = self.educativo_service.insertar_archivo_educativo(documento_archivo)
-                        
-                        archivo_info_respuesta = {
-                            "archivo_id": archivo_id,
-                            "nombre_original": archivo.filename,
-                            "nombre_almacenado": nombre_unico,
-                            "url": resultado_mega['link'],
-                            "tipo": archivo_info['mime'],
-                            "peso": archivo_info['peso_bytes']
-                        }
-                        
-                        archivos_subidos.append(archivo_info_respuesta)
-                        
-                except Exception as e:
-                    errores.append(f"Error al procesar {archivo.filename}: {str(e)}")
+                # Validaciones
+                if not FileUtils.archivo_permitido(archivo.filename):
+                    raise ErrorCarga(f"Archivo {archivo.filename}: tipo no permitido")
+                
+                # Obtener información del archivo
+                archivo_info = FileUtils.obtener_info_archivo(archivo)
+                
+                # Generar nombre único
+                nombre_unico = f"{uuid.uuid4()}_{archivo_info['nombre']}"
+                
+                # Subir a MEGA directamente desde el stream de la petición
+                resultado_mega = self.mega_service.subir_stream(
+                    archivo.stream,
+                    archivo_info['peso_bytes'],
+                    ruta_mega,
+                    nombre_unico
+                )
+                
+                if not resultado_mega:
+                    raise ErrorCarga(f"Error al subir {archivo.filename} a MEGA")
+                
+                # Crear documento de archivo educativo
+                documento_archivo = {
+                    "usuario_id": autor_id,
+                    "tipo_usuario": tipo_usuario,
+                    "nombre_original": archivo.filename,
+                    "nombre_almacenado": nombre_unico,
+                    "url": resultado_mega['link'],
+                    "tipo": archivo_info['mime'],
+                    "peso": archivo_info['peso_bytes'],
+                    "modulo_origen": "anuncio",
+                    "referencia_id": anuncio_id,
+                    "mega_node_id": resultado_mega['node_id'],
+                    "fecha_subida": datetime.utcnow()
+                }
+                
+                # Guardar en MongoDB (colección archivos)
+                archivo_id = self.educativo_service.insertar_archivo_educativo(documento_archivo)
+                
+                archivo_info_respuesta = {
+                    "archivo_id": archivo_id,
+                    "nombre_original": archivo.filename,
+                    "nombre_almacenado": nombre_unico,
+                    "url": resultado_mega['link'],
+                    "tipo": archivo_info['mime'],
+                    "peso": archivo_info['peso_bytes']
+                }
+                
+                return archivo_info_respuesta
+
+            archivos_subidos, errores = self.motor_carga.subir(archivos, procesar_archivo)
             
-            # Actualizar el campo archivos en el anuncio
+            # Agregar los archivos a el anuncio en una sola actualización
             if archivos_subidos:
-                try:
-                    # Obtener anuncio actual
-                    anuncio = self.educativo_service.anuncios_collection.find_one({"_id": ObjectId(anuncio_id)})
-                    if anuncio:
-                        archivos_actuales = anuncio.get('archivos', [])
-                        archivos_actuales.extend(archivos_subidos)
-                        
-                        # Actualizar anuncio con nuevos archivos
-                        self.educativo_service.actualizar_anuncio(anuncio_id, {
-                            'archivos': archivos_actuales
-                        })
-                        logger.info(f"Campo archivos actualizado en anuncio {anuncio_id}")
-                    else:
-                        logger.error(f"Anuncio {anuncio_id} no encontrado")
-                except Exception as e:
-                    logger.error(f"Error al actualizar campo archivos en anuncio: {e}")
+                if self.educativo_service.agregar_archivos("anuncio", anuncio_id, archivos_subidos):
+                    logger.info(f"Campo archivos actualizado en anuncio {anuncio_id}")
+                else:
+                    logger.error(f"Anuncio {anuncio_id} no encontrado")
             
             if archivos_subidos:
                 message = f"Se subieron {len(archivos_subidos)} archivos exitosamente"
@@ -973,28 +876,11 @@ class ArchivoController:
             
             archivos = self.educativo_service.obtener_archivos_por_modulo(modulo_origen, referencia_id)
             
-            # Formatear respuesta
-            archivos_formateados = []
-            for archivo in archivos:
-                archivos_formateados.append({
-                    "id": str(archivo['_id']),
-                    "usuario_id": archivo['usuario_id'],
-                    "tipo_usuario": archivo['tipo_usuario'],
-                    "nombre_original": archivo['nombre_original'],
-                    "nombre_almacenado": archivo['nombre_almacenado'],
-                    "url": archivo['url'],
-                    "tipo": archivo['tipo'],
-                    "peso": archivo['peso'],
-                    "modulo_origen": archivo['modulo_origen'],
-                    "referencia_id": archivo['referencia_id'],
-                    "fecha_subida": archivo['fecha_subida'].isoformat()
-                })
-            
             return self._response_format("success", 200, "Archivos obtenidos exitosamente", {
                 "modulo_origen": modulo_origen,
                 "referencia_id": referencia_id,
-                "total_archivos": len(archivos_formateados),
-                "archivos": archivos_formateados
+                "total_archivos": len(archivos),
+                "archivos": archivos
             })
             
         except Exception as e:
@@ -1014,32 +900,19 @@ class ArchivoController:
             if not usuario_id or not tipo_usuario:
                 return self._response_format("error", 400, "usuario_id y tipo_usuario son requeridos")
             
-            archivos = self.educativo_service.obtener_archivos_por_usuario(usuario_id, tipo_usuario)
-            
-            # Formatear respuesta
-            archivos_formateados = []
-            for archivo in archivos:
-                archivos_formateados.append({
-                    "id": str(archivo['_id']),
-                    "usuario_id": archivo['usuario_id'],
-                    "tipo_usuario": archivo['tipo_usuario'],
-                    "nombre_original": archivo['nombre_original'],
-                    "nombre_almacenado": archivo['nombre_almacenado'],
-                    "url": archivo['url'],
-                    "tipo": archivo['tipo'],
-                    "peso": archivo['peso'],
-                    "modulo_origen": archivo['modulo_origen'],
-                    "referencia_id": archivo['referencia_id'],
-                    "fecha_subida": archivo['fecha_subida'].isoformat()
-                })
+            limite, cursor = Paginacion.parametros(data)
+            archivos, siguiente = self.educativo_service.obtener_archivos_por_usuario(usuario_id, tipo_usuario, limite, cursor)
             
             return self._response_format("success", 200, "Archivos obtenidos exitosamente", {
                 "usuario_id": usuario_id,
                 "tipo_usuario": tipo_usuario,
-                "total_archivos": len(archivos_formateados),
-                "archivos": archivos_formateados
+                "total_archivos": len(archivos),
+                "archivos": archivos,
+                "next_cursor": siguiente
             })
             
+        except ValueError as e:
+            return self._response_format("error", 400, str(e))
         except Exception as e:
             logger.error(f"Error al obtener archivos por usuario educativo: {e}")
             return self._response_format("error", 500, "Error interno del servidor")
@@ -1102,32 +975,9 @@ class ArchivoController:
                     logger.debug(f"Modulo origen: {modulo}, referencia ID: {referencia_id}")
                     
                     if modulo and referencia_id:
-                        # Obtener documento del módulo
                         logger.info(f"Actualizando documento del módulo {modulo} para referencia {referencia_id}")
-                        if modulo == 'publicacion':
-                            doc = self.educativo_service.publicaciones_collection.find_one({"_id": ObjectId(referencia_id)})
-                            if doc:
-                                archivos_actuales = [a for a in doc.get('archivos', []) if a.get('archivo_id') != archivo_id]
-                                self.educativo_service.actualizar_publicacion(referencia_id, {'archivos': archivos_actuales})
-                                logger.info("Publicación actualizada correctamente")
-                        elif modulo == 'tarea':
-                            doc = self.educativo_service.tareas_collection.find_one({"_id": ObjectId(referencia_id)})
-                            if doc:
-                                archivos_actuales = [a for a in doc.get('archivos', []) if a.get('archivo_id') != archivo_id]
-                                self.educativo_service.actualizar_tarea(referencia_id, {'archivos': archivos_actuales})
-                                logger.info("Tarea actualizada correctamente")
-                        elif modulo == 'anuncio':
-                            doc = self.educativo_service.anuncios_collection.find_one({"_id": ObjectId(referencia_id)})
-                            if doc:
-                                archivos_actuales = [a for a in doc.get('archivos', []) if a.get('archivo_id') != archivo_id]
-                                self.educativo_service.actualizar_anuncio(referencia_id, {'archivos': archivos_actuales})
-                                logger.info("Anuncio actualizado correctamente")
-                        elif modulo == 'entrega':
-                            entrega = self.educativo_service.obtener_entrega_estudiante(referencia_id, archivo['usuario_id'])
-                            if entrega:
-                                archivos_actuales = [a for a in entrega.get('archivos', []) if a.get('archivo_id') != archivo_id]
-                                self.educativo_service.actualizar_entrega(str(entrega['_id']), {'archivos': archivos_actuales})
-                                logger.info("Entrega actualizada correctamente")
+                        if self.educativo_service.quitar_archivo(modulo, referencia_id, archivo_id, archivo.get('usuario_id')):
+                            logger.info(f"Referencia al archivo quitada del módulo {modulo}")
                 except Exception as e:
                     logger.error(f"Error al actualizar campo archivos después de eliminar: {e}")
                 
@@ -1147,57 +997,58 @@ class ArchivoController:
     def listar_todos_archivos(self):
         """14. Listar todos los archivos (educativos y contenido)"""
         try:
-            # Obtener archivos de contenido
-            archivos_contenido = list(self.mongo_service.archivos_collection.find({"estado": "activo"}).sort("fecha_subida", -1))
-            
-            # Obtener archivos educativos
-            archivos_educativos = list(self.educativo_service.archivos_collection.find().sort("fecha_subida", -1))
+            if RespuestaNDJSON.solicitada():
+                # Volcado completo: un archivo por línea, leído directamente de los cursores
+                lote = RespuestaNDJSON.tamano_lote(request.args.get('batch_size'))
+                
+                def archivos():
+                    yield from self.mongo_service.iterar_archivos_activos(lote)
+                    yield from self.educativo_service.iterar_archivos(lote)
+                
+                return RespuestaNDJSON.responder(archivos(), lote)
+            
+            # El cursor guarda la posición en cada colección; None indica que ya se recorrió completa
+            limite, cursor = Paginacion.parametros(request.args)
+            posiciones = Paginacion.decodificar_cursor(cursor) if cursor else {"contenido": "", "educativo": ""}
+            if not isinstance(posiciones, dict):
+                raise ValueError("Cursor inválido")
+            
+            # Obtener una página de archivos de contenido
+            archivos_contenido, siguiente_contenido = [], None
+            if posiciones.get("contenido") is not None:
+                archivos_contenido, siguiente_contenido = self.mongo_service.listar_archivos_activos(
+                    limite, posiciones["contenido"] or None
+                )
             
-            # Formatear archivos de contenido
-            contenido_formateado = []
-            for archivo in archivos_contenido:
-                contenido_formateado.append({
-                    "id": str(archivo['_id']),
-                    "tipo_archivo": "contenido",
-                    "usuario_id": archivo['usuario_id'],
-                    "carpeta": archivo['carpeta'],
-                    "nombre": archivo['archivo']['nombre'],
-                    "tipo": archivo['archivo']['tipo'],
-                    "peso": archivo['archivo']['peso'],
-                    "link": archivo['archivo']['link'],
-                    "fecha_subida": archivo['fecha_subida'].isoformat()
-                })
+            # Obtener una página de archivos educativos
+            archivos_educativos, siguiente_educativo = [], None
+            if posiciones.get("educativo") is not None:
+                archivos_educativos, siguiente_educativo = self.educativo_service.listar_archivos(
+                    limite, posiciones["educativo"] or None
+                )
             
-            # Formatear archivos educativos
-            educativo_formateado = []
-            for archivo in archivos_educativos:
-                educativo_formateado.append({
-                    "id": str(archivo['_id']),
-                    "tipo_archivo": "educativo",
-                    "usuario_id": archivo['usuario_id'],
-                    "tipo_usuario": archivo['tipo_usuario'],
-                    "nombre_original": archivo['nombre_original'],
-                    "nombre_almacenado": archivo['nombre_almacenado'],
-                    "url": archivo['url'],
-                    "tipo": archivo['tipo'],
-                    "peso": archivo['peso'],
-                    "modulo_origen": archivo['modulo_origen'],
-                    "referencia_id": archivo['referencia_id'],
-                    "fecha_subida": archivo['fecha_subida'].isoformat()
+            siguiente = None
+            if siguiente_contenido or siguiente_educativo:
+                siguiente = Paginacion.codificar_cursor({
+                    "contenido": siguiente_contenido,
+                    "educativo": siguiente_educativo
                 })
             
             return self._response_format("success", 200, "Todos los archivos obtenidos exitosamente", {
-                "total_archivos": len(contenido_formateado) + len(educativo_formateado),
+                "total_archivos": len(archivos_contenido) + len(archivos_educativos),
                 "archivos_contenido": {
-                    "total": len(contenido_formateado),
-                    "archivos": contenido_formateado
+                    "total": len(archivos_contenido),
+                    "archivos": archivos_contenido
                 },
                 "archivos_educativos": {
-                    "total": len(educativo_formateado),
-                    "archivos": educativo_formateado
-                }
+                    "total": len(archivos_educativos),
+                    "archivos": archivos_educativos
+                },
+                "next_cursor": siguiente
             })
             
+        except ValueError as e:
+            return self._response_format("error", 400, str(e))
         except Exception as e:
             logger.error(f"Error al listar todos los archivos: {e}")
             return self._response_format("error", 500, "Error interno del servidor")
@@ -1216,65 +1067,45 @@ class ArchivoController:
             if not termino_busqueda:
                 return self._response_format("error", 400, "termino de búsqueda es requerido")
             
+            # El cursor guarda la posición en cada colección; None indica que ya se recorrió completa
+            limite, cursor = Paginacion.parametros(data)
+            posiciones = Paginacion.decodificar_cursor(cursor) if cursor else {"contenido": "", "educativo": ""}
+            if not isinstance(posiciones, dict):
+                raise ValueError("Cursor inválido")
+            
             resultados = []
+            siguiente_contenido = siguiente_educativo = None
             
             # Buscar en archivos de contenido
-            if tipo_archivo in ['contenido', 'todos']:
-                if usuario_id:
-                    archivos_contenido = self.mongo_service.buscar_archivos(usuario_id, termino_busqueda)
-                else:
-                    # Buscar en todos los archivos de contenido
-                    filtro = {
-                        "estado": "activo",
-                        "archivo.nombre": {"$regex": termino_busqueda, "$options": "i"}
-                    }
-                    archivos_contenido = list(self.mongo_service.archivos_collection.find(filtro))
-                
-                for archivo in archivos_contenido:
-                    resultados.append({
-                        "id": str(archivo['_id']),
-                        "tipo_archivo": "contenido",
-                        "usuario_id": archivo['usuario_id'],
-                        "carpeta": archivo['carpeta'],
-                        "nombre": archivo['archivo']['nombre'],
-                        "tipo": archivo['archivo']['tipo'],
-                        "peso": archivo['archivo']['peso'],
-                        "link": archivo['archivo']['link'],
-                        "fecha_subida": archivo['fecha_subida'].isoformat()
-                    })
+            if tipo_archivo in ['contenido', 'todos'] and posiciones.get("contenido") is not None:
+                archivos_contenido, siguiente_contenido = self.mongo_service.buscar_archivos(
+                    usuario_id, termino_busqueda, limite=limite, cursor=posiciones["contenido"] or None
+                )
+                resultados.extend(archivos_contenido)
             
             # Buscar en archivos educativos
-            if tipo_archivo in ['educativo', 'todos']:
-                filtro_educativo = {
-                    "nombre_original": {"$regex": termino_busqueda, "$options": "i"}
-                }
-                if usuario_id:
-                    filtro_educativo["usuario_id"] = usuario_id
-                
-                archivos_educativos = list(self.educativo_service.archivos_collection.find(filtro_educativo))
-                
-                for archivo in archivos_educativos:
-                    resultados.append({
-                        "id": str(archivo['_id']),
-                        "tipo_archivo": "educativo",
-                        "usuario_id": archivo['usuario_id'],
-                        "tipo_usuario": archivo['tipo_usuario'],
-                        "nombre_original": archivo['nombre_original'],
-                        "nombre_almacenado": archivo['nombre_almacenado'],
-                        "url": archivo['url'],
-                        "tipo": archivo['tipo'],
-                        "peso": archivo['peso'],
-                        "modulo_origen": archivo['modulo_origen'],
-                        "referencia_id": archivo['referencia_id'],
-                        "fecha_subida": archivo['fecha_subida'].isoformat()
-                    })
+            if tipo_archivo in ['educativo', 'todos'] and posiciones.get("educativo") is not None:
+                archivos_educativos, siguiente_educativo = self.educativo_service.buscar_archivos(
+                    termino_busqueda, usuario_id, limite, posiciones["educativo"] or None
+                )
+                resultados.extend(archivos_educativos)
+            
+            siguiente = None
+            if siguiente_contenido or siguiente_educativo:
+                siguiente = Paginacion.codificar_cursor({
+                    "contenido": siguiente_contenido,
+                    "educativo": siguiente_educativo
+                })
             
             return self._response_format("success", 200, f"Se encontraron {len(resultados)} archivos", {
                 "termino_busqueda": termino_busqueda,
                 "total_resultados": len(resultados),
-                "resultados": resultados
+                "resultados": resultados,
+                "next_cursor": siguiente
             })
             
+        except ValueError as e:
+            return self._response_format("error", 400, str(e))
         except Exception as e:
             logger.error(f"Error al buscar archivos: {e}")
             return self._response_format("error", 500, "Error interno del servidor")
@@ -1290,28 +1121,10 @@ class ArchivoController:
             if not usuario_id:
                 return self._response_format("error", 400, "usuario_id es requerido")
             
-            # Estadísticas de archivos de contenido
-            estadisticas_contenido = self.mongo_service.obtener_estadisticas_usuario(usuario_id)
-            
-            # Estadísticas de archivos educativos
-            archivos_educativos = list(self.educativo_service.archivos_collection.find({"usuario_id": usuario_id}))
-            
-            estadisticas_educativo = {
-                "total_archivos": len(archivos_educativos),
-                "total_peso": sum(archivo.get('peso', 0) for archivo in archivos_educativos),
-                "por_modulo": {}
-            }
-            
-            # Agrupar por módulo
-            for archivo in archivos_educativos:
-                modulo = archivo.get('modulo_origen', 'sin_modulo')
-                if modulo not in estadisticas_educativo["por_modulo"]:
-                    estadisticas_educativo["por_modulo"][modulo] = {
-                        "archivos": 0,
-                        "peso_bytes": 0
-                    }
-                estadisticas_educativo["por_modulo"][modulo]["archivos"] += 1
-                estadisticas_educativo["por_modulo"][modulo]["peso_bytes"] += archivo.get('peso', 0)
+            # Contadores de uso del usuario, mantenidos en cada alta y baja de archivos
+            estadisticas = self.mongo_service.uso.obtener(usuario_id)
+            estadisticas_contenido = dict(estadisticas.get("contenido", {}), usuario_id=usuario_id)
+            estadisticas_educativo = estadisticas.get("educativo", {"total_archivos": 0, "total_peso": 0, "por_modulo": {}})
             
             return self._response_format("success", 200, "Estadísticas obtenidas exitosamente", {
                 "usuario_id": usuario_id,
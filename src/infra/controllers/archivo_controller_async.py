@@ -0,0 +1,311 @@
+from starlette.datastructures import UploadFile
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from src.services.mongo_service_async import MongoServiceAsync
+from src.services.mega_service_async import MegaServiceAsync
+from src.services.educativo_service_async import EducativoServiceAsync
+from src.services.carga_paralela import MotorCargaParalela, ErrorCarga
+from src.infra.models.archivo_model import ArchivoModel, CarpetaUsuarioModel
+from src.utils.file_utils import FileUtils
+from src.config.settings import Config
+from typing import Dict, List, Optional
+from datetime import datetime
+import logging
+import os
+import uuid
+
+logger = logging.getLogger(__name__)
+
+class ArchivoControllerAsync:
+    """Cargas de archivos de ArchivoController atendidas en el event loop de la aplicación ASGI.
+
+    Mismas validaciones, documentos y respuestas que las rutas de Flask;
+    el archivo se lee del formulario ya recibido y se envía a MEGA sin
+    bloquear el proceso mientras espera a la red.
+    """
+
+    # Campos del formulario de cada carga educativa: (referencia, usuario, tipo de usuario)
+    CARGAS_EDUCATIVAS = {
+        "publicacion": ("publicacion_id", "autor_id", "docente"),
+        "tarea": ("tarea_id", "autor_id", "docente"),
+        "entrega": ("id_tarea", "id_estudiante", "estudiante"),
+        "anuncio": ("anuncio_id", "autor_id", "docente"),
+    }
+
+    def __init__(self):
+        self.mongo_service = MongoServiceAsync(Config.MONGO_URI)
+        self.mega_service = MegaServiceAsync(Config.MEGA_EMAIL, Config.MEGA_PASSWORD)
+        self.educativo_service = EducativoServiceAsync(Config.MONGO_URI)
+        self.motor_carga = MotorCargaParalela()
+
+    def _response_format(self, status: str, code: int, message: str, data=None) -> JSONResponse:
+        """Formato estándar de respuesta"""
+        return JSONResponse({
+            "status": status,
+            "code": code,
+            "message": message,
+            "data": data
+        }, status_code=code)
+
+    @staticmethod
+    def _archivos(formulario, campo: str) -> List[UploadFile]:
+        return [valor for valor in formulario.getlist(campo) if isinstance(valor, UploadFile)]
+
+    @staticmethod
+    def _info_archivo(archivo: UploadFile) -> Dict:
+        tamano = archivo.size
+        if tamano is None:
+            archivo.file.seek(0, os.SEEK_END)
+            tamano = archivo.file.tell()
+            archivo.file.seek(0)
+        return FileUtils.describir_archivo(archivo.filename, archivo.content_type, tamano)
+
+    async def _subir_a_mega(self, archivo: UploadFile, archivo_info: Dict, ruta_mega: str, nombre: str) -> Optional[Dict]:
+        await archivo.seek(0)
+        return await self.mega_service.subir_stream(archivo.read, archivo_info['peso_bytes'], ruta_mega, nombre)
+
+    # ==================== ARCHIVOS DE CONTENIDO ====================
+
+    async def subir_archivo_contenido(self, request: Request) -> JSONResponse:
+        """1. Subir un archivo a una carpeta específica (Contenido Personal/Educativo)"""
+        try:
+            formulario = await request.form()
+            archivos = self._archivos(formulario, 'archivo')
+            if not archivos:
+                return self._response_format("error", 400, "No se envió ningún archivo")
+
+            archivo = archivos[0]
+            if archivo.filename == '':
+                return self._response_format("error", 400, "No se seleccionó ningún archivo")
+
+            usuario_id = formulario.get('userId')
+            carpeta = formulario.get('carpeta')
+
+            if not usuario_id or not carpeta:
+                return self._response_format("error", 400, "userId y carpeta son requeridos")
+
+            if not FileUtils.archivo_permitido(archivo.filename):
+                return self._response_format("error", 400, "Tipo de archivo no permitido")
+
+            if not FileUtils.validar_carpeta(carpeta):
+                return self._response_format("error", 400, "Carpeta inválida")
+
+            archivo_info = self._info_archivo(archivo)
+
+            if not await self.mongo_service.uso.verificar_cuota(usuario_id, archivo_info['peso_bytes']):
+                return self._response_format("error", 413, "Cuota de almacenamiento excedida")
+
+            await self._verificar_carpetas_usuario(usuario_id)
+
+            ruta_mega = FileUtils.generar_ruta_mega(usuario_id, carpeta)
+            resultado_mega = await self._subir_a_mega(archivo, archivo_info, ruta_mega, archivo_info['nombre'])
+
+            if not resultado_mega:
+                return self._response_format("error", 500, "Error al subir archivo a MEGA")
+
+            archivo_info.update({
+                "link": resultado_mega['link'],
+                "ruta": ruta_mega + archivo_info['nombre'],
+                "mega_node_id": resultado_mega['node_id']
+            })
+            documento = ArchivoModel.crear_documento_archivo(usuario_id, carpeta, archivo_info)
+            archivo_id = await self.mongo_service.insertar_archivo(documento)
+
+            return self._response_format("success", 201, "Archivo subido exitosamente", {
+                "userId": usuario_id,
+                "file": {
+                    "id": archivo_id,
+                    "secureName": archivo_info['nombre'],
+                    "originalName": archivo.filename,
+                    "contentType": archivo_info['mime'],
+                    "size": archivo_info['peso_bytes'],
+                    "link": resultado_mega['link']
+                }
+            })
+
+        except Exception as e:
+            logger.error(f"Error al subir archivo de contenido: {e}")
+            return self._response_format("error", 500, "Error interno del servidor")
+
+    async def subir_multiples_archivos_contenido(self, request: Request) -> JSONResponse:
+        """2. Subir múltiples archivos a una carpeta específica"""
+        try:
+            formulario = await request.form()
+            archivos = self._archivos(formulario, 'archivos')
+            if not archivos:
+                return self._response_format("error", 400, "No se enviaron archivos")
+            if all(archivo.filename == '' for archivo in archivos):
+                return self._response_format("error", 400, "No se seleccionaron archivos")
+
+            usuario_id = formulario.get('userId')
+            carpeta = formulario.get('carpeta')
+
+            if not usuario_id or not carpeta:
+                return self._response_format("error", 400, "userId y carpeta son requeridos")
+
+            if not FileUtils.validar_carpeta(carpeta):
+                return self._response_format("error", 400, "Carpeta inválida")
+
+            await self._verificar_carpetas_usuario(usuario_id)
+            ruta_mega = FileUtils.generar_ruta_mega(usuario_id, carpeta)
+
+            async def procesar_archivo(archivo: UploadFile) -> Optional[Dict]:
+                if archivo.filename == '':
+                    return None
+
+                if not FileUtils.archivo_permitido(archivo.filename):
+                    raise ErrorCarga(f"Archivo {archivo.filename}: tipo no permitido")
+
+                archivo_info = self._info_archivo(archivo)
+
+                if not await self.mongo_service.uso.verificar_cuota(usuario_id, archivo_info['peso_bytes']):
+                    raise ErrorCarga(f"Archivo {archivo.filename}: cuota de almacenamiento excedida")
+
+                if not await self.mega_service.crear_carpeta(ruta_mega):
+                    raise ErrorCarga(f"Error al crear la carpeta {ruta_mega}")
+
+                resultado_mega = await self._subir_a_mega(archivo, archivo_info, ruta_mega, archivo_info['nombre'])
+                if not resultado_mega:
+                    raise ErrorCarga(f"Error al subir {archivo.filename} a MEGA")
+
+                archivo_info.update({
+                    "link": resultado_mega['link'],
+                    "ruta": ruta_mega + archivo_info['nombre'],
+                    "mega_node_id": resultado_mega['node_id']
+                })
+                documento = ArchivoModel.crear_documento_archivo(usuario_id, carpeta, archivo_info)
+                archivo_id = await self.mongo_service.insertar_archivo(documento)
+
+                return {
+                    "id": archivo_id,
+                    "secureName": archivo_info['nombre'],
+                    "originalName": archivo.filename,
+                    "contentType": archivo_info['mime'],
+                    "size": archivo_info['peso_bytes'],
+                    "link": resultado_mega['link']
+                }
+
+            archivos_subidos, errores = await self.motor_carga.subir_async(archivos, procesar_archivo)
+
+            if archivos_subidos:
+                message = f"Se subieron {len(archivos_subidos)} archivos exitosamente"
+                if errores:
+                    message += f". {len(errores)} archivos fallaron"
+                return self._response_format("success", 201, message, {
+                    "userId": usuario_id,
+                    "files": archivos_subidos,
+                    "errors": errores if errores else None
+                })
+            return self._response_format("error", 400, "No se pudo subir ningún archivo", {
+                "errors": errores
+            })
+
+        except Exception as e:
+            logger.error(f"Error al subir múltiples archivos de contenido: {e}")
+            return self._response_format("error", 500, "Error interno del servidor")
+
+    # ==================== ARCHIVOS EDUCATIVOS ====================
+
+    async def subir_archivo_modulo(self, request: Request, modulo: str) -> JSONResponse:
+        """7-10. Subir archivos para una publicación, tarea, entrega o anuncio"""
+        campo_referencia, campo_usuario, tipo_usuario = self.CARGAS_EDUCATIVAS[modulo]
+        try:
+            formulario = await request.form()
+            archivos = self._archivos(formulario, 'archivos')
+            if not archivos:
+                return self._response_format("error", 400, "No se enviaron archivos")
+            if all(archivo.filename == '' for archivo in archivos):
+                return self._response_format("error", 400, "No se seleccionaron archivos")
+
+            referencia_id = formulario.get(campo_referencia)
+            usuario_id = formulario.get(campo_usuario)
+            if modulo == "anuncio":
+                tipo_usuario = formulario.get('tipo_usuario', tipo_usuario)
+
+            if not referencia_id or not usuario_id:
+                # "e" en lugar de "y" ante una palabra que empieza con i
+                conjuncion = "e" if campo_usuario.startswith("i") else "y"
+                return self._response_format("error", 400, f"{campo_referencia} {conjuncion} {campo_usuario} son requeridos")
+
+            if modulo == "entrega":
+                ruta_mega = f"/Archivo/entrega/{referencia_id}/{usuario_id}/"
+            else:
+                ruta_mega = f"/Archivo/{modulo}/{referencia_id}/"
+            await self.mega_service.crear_carpeta(ruta_mega)
+
+            async def procesar_archivo(archivo: UploadFile) -> Optional[Dict]:
+                if archivo.filename == '':
+                    return None
+
+                if not FileUtils.archivo_permitido(archivo.filename):
+                    raise ErrorCarga(f"Archivo {archivo.filename}: tipo no permitido")
+
+                archivo_info = self._info_archivo(archivo)
+                nombre_unico = f"{uuid.uuid4()}_{archivo_info['nombre']}"
+
+                resultado_mega = await self._subir_a_mega(archivo, archivo_info, ruta_mega, nombre_unico)
+                if not resultado_mega:
+                    raise ErrorCarga(f"Error al subir {archivo.filename} a MEGA")
+
+                archivo_id = await self.educativo_service.insertar_archivo_educativo({
+                    "usuario_id": usuario_id,
+                    "tipo_usuario": tipo_usuario,
+                    "nombre_original": archivo.filename,
+                    "nombre_almacenado": nombre_unico,
+                    "url": resultado_mega['link'],
+                    "tipo": archivo_info['mime'],
+                    "peso": archivo_info['peso_bytes'],
+                    "modulo_origen": modulo,
+                    "referencia_id": referencia_id,
+                    "mega_node_id": resultado_mega['node_id'],
+                    "fecha_subida": datetime.utcnow()
+                })
+
+                return {
+                    "archivo_id": archivo_id,
+                    "nombre_original": archivo.filename,
+                    "nombre_almacenado": nombre_unico,
+                    "url": resultado_mega['link'],
+                    "tipo": archivo_info['mime'],
+                    "peso": archivo_info['peso_bytes']
+                }
+
+            archivos_subidos, errores = await self.motor_carga.subir_async(archivos, procesar_archivo)
+
+            # Agregar los archivos al documento del módulo en una sola actualización
+            if archivos_subidos:
+                if await self.educativo_service.agregar_archivos(modulo, referencia_id, archivos_subidos, usuario_id):
+                    logger.info(f"Campo archivos actualizado en {modulo} {referencia_id}")
+                else:
+                    logger.warning(f"No se encontró {modulo} {referencia_id}")
+
+                message = f"Se subieron {len(archivos_subidos)} archivos exitosamente"
+                if errores:
+                    message += f". {len(errores)} archivos fallaron"
+                return self._response_format("success", 201, message, {
+                    campo_referencia: referencia_id,
+                    campo_usuario: usuario_id,
+                    "archivos": archivos_subidos,
+                    "errores": errores if errores else None
+                })
+            return self._response_format("error", 400, "No se pudo subir ningún archivo", {
+                "errores": errores
+            })
+
+        except Exception as e:
+            logger.error(f"Error al subir archivos de {modulo}: {e}")
+            return self._response_format("error", 500, "Error interno del servidor")
+
+    async def _verificar_carpetas_usuario(self, usuario_id: str):
+        """Verifica y crea las carpetas del usuario si no existen"""
+        if await self.mongo_service.obtener_carpeta_usuario(usuario_id):
+            return
+
+        documento_carpeta = CarpetaUsuarioModel.crear_documento_carpeta(usuario_id)
+        await self.mongo_service.crear_carpeta_usuario(documento_carpeta)
+
+        await self.mega_service.crear_carpeta(f"/Contenido Personal/{usuario_id}/")
+        await self.mega_service.crear_carpeta(f"/Contenido Educativo/{usuario_id}/")
+
+    async def cerrar(self):
+        await self.mega_service.cerrar()
@@ -1,11 +1,13 @@
 from flask import request, jsonify
 from src.services.educativo_service import EducativoService
 from src.services.mega_service import MegaService
-from src.models.entrega_model import EntregaModel
+from src.services.carga_paralela import MotorCargaParalela, ErrorCarga
+from src.infra.models.entrega_model import EntregaModel
 from src.utils.file_utils import FileUtils
+from src.utils.paginacion import Paginacion
+from src.utils.ndjson import RespuestaNDJSON
 from src.config.settings import Config
 import logging
-import tempfile
 import uuid
 from datetime import datetime
 
@@ -15,6 +17,7 @@ class EntregaController:
     def __init__(self):
         self.educativo_service = EducativoService(Config.MONGO_URI)
         self.mega_service = MegaService(Config.MEGA_EMAIL, Config.MEGA_PASSWORD)
+        self.motor_carga = MotorCargaParalela()
         self.entrega_model = EntregaModel()
     
     def _response_format(self, status: str, code: int, message: str, data=None):
@@ -26,6 +29,18 @@ class EntregaController:
             "data": data
         }), code
     
+    def _formatear_entrega(self, entrega: dict) -> dict:
+        """Formato de una entrega en las respuestas"""
+        return {
+            "id": str(entrega['_id']),
+            "id_tarea": entrega['id_tarea'],
+            "id_estudiante": entrega['id_estudiante'],
+            "respuesta": entrega['respuesta'],
+            "archivos": entrega.get('archivos', []),
+            "fecha_entrega": entrega['fecha_entrega'].isoformat(),
+            "estado": entrega.get('estado', 'entregado')
+        }
+    
     def obtener_entregas(self):
         """Obtener entregas por tarea y estudiante"""
         try:
@@ -43,42 +58,31 @@ class EntregaController:
                 # Obtener entrega específica de un estudiante
                 entrega = self.educativo_service.obtener_entrega_estudiante(id_tarea, id_estudiante)
                 if entrega:
-                    entrega_formateada = {
-                        "id": str(entrega['_id']),
-                        "id_tarea": entrega['id_tarea'],
-                        "id_estudiante": entrega['id_estudiante'],
-                        "respuesta": entrega['respuesta'],
-                        "archivos": entrega.get('archivos', []),
-                        "fecha_entrega": entrega['fecha_entrega'].isoformat(),
-                        "estado": entrega.get('estado', 'entregado')
-                    }
+                    entrega_formateada = self._formatear_entrega(entrega)
                     return self._response_format("success", 200, "Entrega obtenida exitosamente", {
                         "entrega": entrega_formateada
                     })
                 else:
                     return self._response_format("error", 404, "Entrega no encontrada")
+            elif RespuestaNDJSON.solicitada():
+                # Todas las entregas de la tarea, una por línea
+                lote = RespuestaNDJSON.tamano_lote(data.get('batch_size'))
+                entregas = self.educativo_service.iterar_entregas_por_tarea(id_tarea, lote)
+                return RespuestaNDJSON.responder(entregas, lote)
             else:
                 # Obtener todas las entregas de una tarea
-                entregas = self.educativo_service.obtener_entregas_por_tarea(id_tarea)
-                
-                entregas_formateadas = []
-                for entrega in entregas:
-                    entregas_formateadas.append({
-                        "id": str(entrega['_id']),
-                        "id_tarea": entrega['id_tarea'],
-                        "id_estudiante": entrega['id_estudiante'],
-                        "respuesta": entrega['respuesta'],
-                        "archivos": entrega.get('archivos', []),
-                        "fecha_entrega": entrega['fecha_entrega'].isoformat(),
-                        "estado": entrega.get('estado', 'entregado')
-                    })
+                limite, cursor = Paginacion.parametros(data)
+                entregas, siguiente = self.educativo_service.obtener_entregas_por_tarea(id_tarea, limite, cursor)
                 
                 return self._response_format("success", 200, "Entregas obtenidas exitosamente", {
                     "id_tarea": id_tarea,
-                    "total_entregas": len(entregas_formateadas),
-                    "entregas": entregas_formateadas
+                    "total_entregas": len(entregas),
+                    "entregas": entregas,
+                    "next_cursor": siguiente
                 })
             
+        except ValueError as e:
+            return self._response_format("error", 400, str(e))
         except Exception as e:
             logger.error(f"Error al obtener entregas: {e}")
             return self._response_format("error", 500, "Error interno del servidor")
@@ -181,71 +185,62 @@ class EntregaController:
             if not id_tarea or not id_estudiante:
                 return self._response_format("error", 400, "id_tarea e id_estudiante son requeridos")
             
-            archivos_subidos = []
-            errores = []
-            
             # Crear carpeta en MEGA si no existe
             ruta_mega = f"/Archivo/entrega/{id_tarea}/{id_estudiante}/"
+            self.mega_service.crear_carpeta(ruta_mega)
             
-            for archivo in archivos:
-                try:
-                    if archivo.filename == '':
-                        continue
-                        
-                    # Validaciones
-                    if not FileUtils.archivo_permitido(archivo.filename):
-                        errores.append(f"Archivo {archivo.filename}: tipo no permitido")
-                        continue
+            def procesar_archivo(archivo):
+                if archivo.filename == '':
+                    return None
                     
-                    # Obtener información del archivo
-                    archivo_info = FileUtils.obtener_info_archivo(archivo)
-                    
-                    # Generar nombre único
-                    nombre_unico = f"{uuid.uuid4()}_{archivo_info['nombre']}"
-                    
-                    # Guardar archivo temporalmente
-                    with tempfile.TemporaryDirectory() as temp_dir:
-                        temp_path = FileUtils.guardar_archivo_temporal(archivo, temp_dir)
-                        
-                        # Subir a MEGA
-                        resultado_mega = self.mega_service.subir_archivo(
-                            temp_path, 
-                            ruta_mega, 
-                            nombre_unico
-                        )
-                        
-                        if not resultado_mega:
-                            errores.append(f"Error al subir {archivo.filename} a MEGA")
-                            continue
-                        
-                        # Crear documento de archivo
-                        documento_archivo = {
-                            "usuario_id": id_estudiante,
-                            "tipo_usuario": "estudiante",
-                            "nombre_original": archivo.filename,
-                            "nombre_almacenado": nombre_unico,
-                            "url": resultado_mega['link'],
-                            "tipo": archivo_info['mime'],
-                            "peso": archivo_info['peso_bytes'],
-                            "modulo_origen": "entrega",
-                            "referencia_id": id_tarea,
-                            "fecha_subida": datetime.utcnow()
-                        }
-                        
-                        # Guardar en MongoDB
-                        archivo_id = self.educativo_service.insertar_archivo_educativo(documento_archivo)
-                        
-                        archivos_subidos.append({
-                            "archivo_id": archivo_id,
-                            "nombre_original": archivo.filename,
-                            "nombre_almacenado": nombre_unico,
-                            "url": resultado_mega['link'],
-                            "tipo": archivo_info['mime'],
-                            "peso": archivo_info['peso_bytes']
-                        })
-                        
-                except Exception as e:
-                    errores.append(f"Error al procesar {archivo.filename}: {str(e)}")
+                # Validaciones
+                if not FileUtils.archivo_permitido(archivo.filename):
+                    raise ErrorCarga(f"Archivo {archivo.filename}: tipo no permitido")
+                
+                # Obtener información del archivo
+                archivo_info = FileUtils.obtener_info_archivo(archivo)
+                
+                # Generar nombre único
+                nombre_unico = f"{uuid.uuid4()}_{archivo_info['nombre']}"
+                
+                # Subir a MEGA directamente desde el stream de la petición
+                resultado_mega = self.mega_service.subir_stream(
+                    archivo.stream,
+                    archivo_info['peso_bytes'],
+                    ruta_mega,
+                    nombre_unico
+                )
+                
+                if not resultado_mega:
+                    raise ErrorCarga(f"Error al subir {archivo.filename} a MEGA")
+                
+                # Crear documento de archivo
+                documento_archivo = {
+                    "usuario_id": id_estudiante,
+                    "tipo_usuario": "estudiante",
+                    "nombre_original": archivo.filename,
+                    "nombre_almacenado": nombre_unico,
+                    "url": resultado_mega['link'],
+                    "tipo": archivo_info['mime'],
+                    "peso": archivo_info['peso_bytes'],
+                    "modulo_origen": "entrega",
+                    "referencia_id": id_tarea,
+                    "fecha_subida": datetime.utcnow()
+                }
+                
+                # Guardar en MongoDB
+                archivo_id = self.educativo_service.insertar_archivo_educativo(documento_archivo)
+                
+                return {
+                    "archivo_id": archivo_id,
+                    "nombre_original": archivo.filename,
+                    "nombre_almacenado": nombre_unico,
+                    "url": resultado_mega['link'],
+                    "tipo": archivo_info['mime'],
+                    "peso": archivo_info['peso_bytes']
+                }
+
+            archivos_subidos, errores = self.motor_carga.subir(archivos, procesar_archivo)
             
             if archivos_subidos:
                 message = f"Se subieron {len(archivos_subidos)} archivos exitosamente"
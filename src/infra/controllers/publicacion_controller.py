@@ -1,11 +1,12 @@
 from flask import request, jsonify
 from src.services.educativo_service import EducativoService
 from src.services.mega_service import MegaService
-from src.models.publicacion_model import PublicacionModel
+from src.services.carga_paralela import MotorCargaParalela, ErrorCarga
+from src.infra.models.publicacion_model import PublicacionModel
 from src.utils.file_utils import FileUtils
+from src.utils.etag import ETagListado
 from src.config.settings import Config
 import logging
-import tempfile
 import uuid
 from datetime import datetime
 
@@ -15,6 +16,7 @@ class PublicacionController:
     def __init__(self):
         self.educativo_service = EducativoService(Config.MONGO_URI)
         self.mega_service = MegaService(Config.MEGA_EMAIL, Config.MEGA_PASSWORD)
+        self.motor_carga = MotorCargaParalela()
         self.publicacion_model = PublicacionModel()
     
     def _response_format(self, status: str, code: int, message: str, data=None):
@@ -37,26 +39,18 @@ class PublicacionController:
             if not id_tema:
                 return self._response_format("error", 400, "id_tema es requerido")
             
-            publicaciones = self.educativo_service.obtener_publicaciones_por_tema(id_tema)
+            version = self.educativo_service.version_listado("publicaciones", id_tema)
+            if ETagListado.vigente(version):
+                return ETagListado.no_modificado(version)
             
-            # Formatear respuesta
-            publicaciones_formateadas = []
-            for pub in publicaciones:
-                publicaciones_formateadas.append({
-                    "id": str(pub['_id']),
-                    "id_tema": pub['id_tema'],
-                    "titulo": pub['titulo'],
-                    "contenido": pub['contenido'],
-                    "autor_id": pub.get('autor_id', ''),
-                    "archivos": pub.get('archivos', []),
-                    "fecha_creacion": pub['fecha_creacion'].isoformat()
-                })
+            # Las publicaciones ya vienen con el formato de la respuesta
+            publicaciones = self.educativo_service.obtener_publicaciones_por_tema(id_tema, version)
             
-            return self._response_format("success", 200, "Publicaciones obtenidas exitosamente", {
+            return ETagListado.etiquetar(self._response_format("success", 200, "Publicaciones obtenidas exitosamente", {
                 "id_tema": id_tema,
-                "total_publicaciones": len(publicaciones_formateadas),
-                "publicaciones": publicaciones_formateadas
-            })
+                "total_publicaciones": len(publicaciones),
+                "publicaciones": publicaciones
+            }), version)
             
         except Exception as e:
             logger.error(f"Error al obtener publicaciones: {e}")
@@ -177,71 +171,62 @@ class PublicacionController:
             if not publicacion_id or not autor_id:
                 return self._response_format("error", 400, "publicacion_id y autor_id son requeridos")
             
-            archivos_subidos = []
-            errores = []
-            
             # Crear carpeta en MEGA si no existe
             ruta_mega = f"/Archivo/publicacion/{publicacion_id}/"
+            self.mega_service.crear_carpeta(ruta_mega)
             
-            for archivo in archivos:
-                try:
-                    if archivo.filename == '':
-                        continue
-                        
-                    # Validaciones
-                    if not FileUtils.archivo_permitido(archivo.filename):
-                        errores.append(f"Archivo {archivo.filename}: tipo no permitido")
-                        continue
-                    
-                    # Obtener información del archivo
-                    archivo_info = FileUtils.obtener_info_archivo(archivo)
+            def procesar_archivo(archivo):
+                if archivo.filename == '':
+                    return None
                     
-                    # Generar nombre único
-                    nombre_unico = f"{uuid.uuid4()}_{archivo_info['nombre']}"
-                    
-                    # Guardar archivo temporalmente
-                    with tempfile.TemporaryDirectory() as temp_dir:
-                        temp_path = FileUtils.guardar_archivo_temporal(archivo, temp_dir)
-                        
-                        # Subir a MEGA
-                        resultado_mega = self.mega_service.subir_archivo(
-                            temp_path, 
-                            ruta_mega, 
-                            nombre_unico
-                        )
-                        
-                        if not resultado_mega:
-                            errores.append(f"Error al subir {archivo.filename} a MEGA")
-                            continue
-                        
-                        # Crear documento de archivo
-                        documento_archivo = {
-                            "usuario_id": autor_id,
-                            "tipo_usuario": "docente",
-                            "nombre_original": archivo.filename,
-                            "nombre_almacenado": nombre_unico,
-                            "url": resultado_mega['link'],
-                            "tipo": archivo_info['mime'],
-                            "peso": archivo_info['peso_bytes'],
-                            "modulo_origen": "publicacion",
-                            "referencia_id": publicacion_id,
-                            "fecha_subida": datetime.utcnow()
-                        }
-                        
-                        # Guardar en MongoDB
-                        archivo_id = self.educativo_service.insertar_archivo_educativo(documento_archivo)
-                        
-                        archivos_subidos.append({
-                            "archivo_id": archivo_id,
-                            "nombre_original": archivo.filename,
-                            "nombre_almacenado": nombre_unico,
-                            "url": resultado_mega['link'],
-                            "tipo": archivo_info['mime'],
-                            "peso": archivo_info['peso_bytes']
-                        })
-                        
-                except Exception as e:
-                    errores.append(f"Error al procesar {archivo.filename}: {str(e)}")
+                # Validaciones
+                if not FileUtils.archivo_permitido(archivo.filename):
+                    raise ErrorCarga(f"Archivo {archivo.filename}: tipo no permitido")
+                
+                # Obtener información del archivo
+                archivo_info = FileUtils.obtener_info_archivo(archivo)
+                
+                # Generar nombre único
+                nombre_unico = f"{uuid.uuid4()}_{archivo_info['nombre']}"
+                
+                # Subir a MEGA directamente desde el stream de la petición
+                resultado_mega = self.mega_service.subir_stream(
+                    archivo.stream,
+                    archivo_info['peso_bytes'],
+                    ruta_mega,
+                    nombre_unico
+                )
+                
+                if not resultado_mega:
+                    raise ErrorCarga(f"Error al subir {archivo.filename} a MEGA")
+                
+                # Crear documento de archivo
+                documento_archivo = {
+                    "usuario_id": autor_id,
+                    "tipo_usuario": "docente",
+                    "nombre_original": archivo.filename,
+                    "nombre_almacenado": nombre_unico,
+                    "url": resultado_mega['link'],
+                    "tipo": archivo_info['mime'],
+                    "peso": archivo_info['peso_bytes'],
+                    "modulo_origen": "publicacion",
+                    "referencia_id": publicacion_id,
+                    "fecha_subida": datetime.utcnow()
+                }
+                
+                # Guardar en MongoDB
+                archivo_id = self.educativo_service.insertar_archivo_educativo(documento_archivo)
+                
+                return {
+                    "archivo_id": archivo_id,
+                    "nombre_original": archivo.filename,
+                    "nombre_almacenado": nombre_unico,
+                    "url": resultado_mega['link'],
+                    "tipo": archivo_info['mime'],
+                    "peso": archivo_info['peso_bytes']
+                }
+
+            archivos_subidos, errores = self.motor_carga.subir(archivos, procesar_archivo)
             
             if archivos_subidos:
                 message = f"Se subieron {len(archivos_subidos)} archivos exitosamente"
@@ -1,6 +1,7 @@
 from flask import request, jsonify
 from src.services.educativo_service import EducativoService
-from src.models.tema_model import TemaModel
+from src.infra.models.tema_model import TemaModel
+from src.utils.etag import ETagListado
 from src.config.settings import Config
 import logging
 
@@ -31,25 +32,18 @@ class TemaController:
             if not id_curso:
                 return self._response_format("error", 400, "id_curso es requerido")
             
-            temas = self.educativo_service.obtener_temas_por_curso(id_curso)
-            
-            # Formatear respuesta
-            temas_formateados = []
-            for tema in temas:
-                temas_formateados.append({
-                    "id": str(tema['_id']),
-                    "id_curso": tema['id_curso'],
-                    "titulo": tema['titulo'],
-                    "descripcion": tema['descripcion'],
-                    "orden": tema['orden'],
-                    "fecha_creacion": tema['fecha_creacion'].isoformat()
-                })
+            version = self.educativo_service.version_listado("temas", id_curso)
+            if ETagListado.vigente(version):
+                return ETagListado.no_modificado(version)
+            
+            # Los temas ya vienen con el formato de la respuesta
+            temas = self.educativo_service.obtener_temas_por_curso(id_curso, version)
             
-            return self._response_format("success", 200, "Temas obtenidos exitosamente", {
+            return ETagListado.etiquetar(self._response_format("success", 200, "Temas obtenidos exitosamente", {
                 "id_curso": id_curso,
-                "total_temas": len(temas_formateados),
-                "temas": temas_formateados
-            })
+                "total_temas": len(temas),
+                "temas": temas
+            }), version)
             
         except Exception as e:
             logger.error(f"Error al obtener temas: {e}")
@@ -1,23 +1,24 @@
 from domain.cloudflare.MegaService import ServicioMega
-import shutil
+from src.utils.perezoso import Perezoso
 import os
 
-mega = ServicioMega()
-megaCliente = mega.client
+# La sesion de MEGA se inicia con la primera subida, no al importar el modulo
+mega = Perezoso(ServicioMega)
 
 def subirArchivos(opciones: dict):
     try:
         rutasArchivos = []
         if 'archivos' in opciones.keys() and opciones.get('archivos') and isinstance(opciones.get('archivos'), list):
             for archivo in opciones.get('archivos'):
-                routeTemp = f"{mega.tempPath}/{opciones.get('carpeta_nombre')}"
+                rutaCarpeta = f"{mega.tempPath}/{opciones.get('carpeta_nombre')}"
                 if 'modulo' in opciones.keys():
-                    routeTemp += f"/{opciones.get('modulo')}"
-                crearCarpeta(routeTemp, routeTemp)
-                rutaArchivo = crearArchivoServidor(routeTemp, archivo.get('nombre_archivo'), archivo.get('archivo'))
-                archivoSubido = megaCliente.upload(rutaArchivo)
-                os.remove(rutaArchivo)
-                rutasArchivos.append(str(megaCliente.get_upload_link(archivoSubido)))
+                    rutaCarpeta += f"/{opciones.get('modulo')}"
+                stream = archivo.get('archivo').stream
+                # La carpeta se resuelve con el indice de nodos compartido y la sesion solo se toma para los comandos de la API
+                archivoSubido = mega.servicio.subir_stream(stream, tamanoStream(stream), rutaCarpeta, archivo.get('nombre_archivo'))
+                if archivoSubido is None:
+                    raise Exception(f"No se pudo subir {archivo.get('nombre_archivo')}")
+                rutasArchivos.append(str(archivoSubido['link']))
             return rutasArchivos
         return rutasArchivos
     except Exception as excep:
@@ -39,18 +40,8 @@ def convertirDictArchivo(archivos: list):
         print(f"Hubo un error con los archivos: {excep}")
         return []
 
-def crearCarpeta(nombreCarpeta: str, nombreCarpetaServidor: str):
-    os.makedirs(nombreCarpetaServidor, exist_ok=True)
-    carpetaEncontrada = megaCliente.find(nombreCarpeta)
-    if not carpetaEncontrada:
-        megaCliente.create_folder(nombreCarpeta)
-
-def crearArchivoServidor(ruta, nombreArchivo, archivo):
-    rutaArchivo = os.path.join(ruta, nombreArchivo)
-    with open(rutaArchivo, 'wb') as archivoTemp:
-        archivoTemp.write(archivo.read())
-    return rutaArchivo
-
-def eliminarCarpeta(routeTemp):
-    if os.path.exists(routeTemp):
-        shutil.rmtree(routeTemp)
\ No newline at end of file
+def tamanoStream(stream):
+    stream.seek(0, os.SEEK_END)
+    tamano = stream.tell()
+    stream.seek(0)
+    return tamano
@@ -1,13 +1,62 @@
 from domain.mongodb.MongoService import ServicioMongoDB
 from infra.db.MegaQueries import subirArchivos, convertirDictArchivo
+from src.utils.paginacion import Paginacion
+from src.utils.etag import VersionesListados
+from src.config.settings import Config
+from pymongo import InsertOne, UpdateOne, UpdateMany, DeleteOne, DeleteMany
+from pymongo.errors import BulkWriteError
 from bson import ObjectId
 from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
 
 class Query:
     def __init__(self, nombreColeccion):
         mongoService = ServicioMongoDB()
         self.connDB = mongoService.connectionDB()
         self.connColeccion = self.connDB[nombreColeccion]
+        self.versiones = VersionesListados(self.connDB)
+        self.vista = None
+        self.campoVista = None
+
+    def asociarVista(self, vista, campoRelacion: str):
+        self.vista = vista
+        self.campoVista = campoRelacion
+
+    def relacionados(self, filtros: list):
+        if self.vista is None or len(filtros) == 0:
+            return set()
+        try:
+            return set(self.connColeccion.distinct(self.campoVista, {'$or': filtros}))
+        except Exception as e:
+            logger.error(f"Hubo un fallo al buscar los registros relacionados con la vista: {e}")
+            return set()
+
+    def refrescarVista(self, ids) -> bool:
+        """Reconstruye la vista para los ids afectados; False si quedo desactualizada"""
+        if self.vista is None:
+            return True
+        try:
+            ids = [id for id in set(ids) if id is not None]
+            if len(ids) > 0:
+                self.vista.refrescar(ids)
+            return True
+        except Exception as e:
+            logger.error(f"Hubo un fallo al refrescar la vista {self.vista.nombreColeccion}, "
+                         f"reconstruirla con src/scripts/refrescar_vista.py: {e}")
+            return False
+
+    def versionActual(self):
+        return self.versiones.obtener(self.connColeccion.name)
+
+    def marcarCambio(self, vistaRefrescada: bool = True):
+        # Despues de escribir (y de refrescar la vista) para no etiquetar datos viejos con la version nueva.
+        # Si la vista no se pudo refrescar conserva su version: su contenido no cambio
+        claves = [self.connColeccion.name]
+        if self.vista is not None and vistaRefrescada:
+            claves.append(self.vista.nombreColeccion)
+        self.versiones.incrementar(*claves)
 
     def insertarEnColeccion(self, opciones: dict):
         try:
@@ -26,60 +75,145 @@ class Query:
                     dato[id] = ObjectId()
                     dato['timestamp'] = datetime.utcnow()
                 self.connColeccion.insert_many(opciones['datos'])
+                self.marcarCambio(self.refrescarVista(dato.get(self.campoVista) for dato in datos))
                 return "Lista de datos agregados correctamente."
             datos[id] = ObjectId()
             datos['timestamp'] = datetime.utcnow()
             self.connColeccion.insert_one(opciones['datos'])
+            self.marcarCambio(self.refrescarVista([datos.get(self.campoVista)]))
             return "Datos agregados correctamente."
         except Exception as e:
             return f"Hubo un fallo al insertar los datos: {e}"
 
     def eliminarDatosEnColeccion(self, opciones: dict):
         try:
-            filtro = self.cambiarAObjectId(opciones['filtro'])
+            filtro = self.convertirFiltro(opciones['filtro'])
+            afectados = self.relacionados([filtro])
             if opciones['todo']:
                 self.connColeccion.delete_many(filtro)
+                self.marcarCambio(self.refrescarVista(afectados))
                 return "Lista de datos eliminados correctamente."
             self.connColeccion.delete_one(filtro)
+            self.marcarCambio(self.refrescarVista(afectados))
             return "Datos eliminados correctamente."
         except Exception as e:
             return f"Hubo un fallo al eliminar los datos: {e}"
 
     def actualizarDatosEnColeccion(self, opciones: dict):
         try:
-            filtro = self.cambiarAObjectId(opciones['filtro'])
+            filtro = self.convertirFiltro(opciones['filtro'])
+            afectados = self.relacionados([filtro])
+            afectados.add(opciones['datos'].get(self.campoVista))
             if opciones['todo']:
                 self.connColeccion.update_many(filtro, {'$set': opciones['datos']})
+                self.marcarCambio(self.refrescarVista(afectados))
                 return "Lista de datos actualizados correctamente."
             self.connColeccion.update_one(filtro, {'$set': opciones['datos']})
+            self.marcarCambio(self.refrescarVista(afectados))
             return "Datos actualizados correctamente."
         except Exception as e:
             return f"Hubo un fallo al actualizar los datos: {e}"
 
+    def escrituraMasiva(self, opciones: dict):
+        operaciones = opciones['operaciones']
+        tamanoLote = max(1, opciones.get('tamanoLote') or Config.BULK_TAMANO_LOTE)
+        resultados = [None] * len(operaciones)
+        resumen = {'insertados': 0, 'actualizados': 0, 'eliminados': 0, 'errores': 0}
+        pendientes = []
+        for indice, operacion in enumerate(operaciones):
+            try:
+                pendientes.append((indice, self.crearOperacion(operacion, opciones['id'])))
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                resultados[indice] = {'indice': indice, 'ok': False, 'error': f"Operación inválida: {e}"}
+
+        filtros = [filtro for _, (_, _, _, filtro) in pendientes if filtro is not None]
+        afectados = self.relacionados(filtros)
+
+        # Lotes sin orden: el servidor aplica cada lote en una sola ida y vuelta
+        # y un error no detiene el resto de las operaciones
+        for inicio in range(0, len(pendientes), tamanoLote):
+            lote = pendientes[inicio:inicio + tamanoLote]
+            erroresLote = {}
+            try:
+                resultado = self.connColeccion.bulk_write([op for _, (op, _, _, _) in lote], ordered=False)
+                detalles = resultado.bulk_api_result
+            except BulkWriteError as e:
+                detalles = e.details
+                erroresLote = {error['index']: error.get('errmsg') for error in detalles.get('writeErrors', [])}
+            except Exception as e:
+                detalles = {}
+                erroresLote = {posicion: str(e) for posicion in range(len(lote))}
+            resumen['insertados'] += detalles.get('nInserted', 0)
+            resumen['actualizados'] += detalles.get('nModified', 0)
+            resumen['eliminados'] += detalles.get('nRemoved', 0)
+            for posicion, (indice, (_, idInsertado, _, _)) in enumerate(lote):
+                resultado = {'indice': indice, 'ok': posicion not in erroresLote}
+                if posicion in erroresLote:
+                    resultado['error'] = erroresLote[posicion]
+                elif idInsertado is not None:
+                    resultado['id'] = str(idInsertado)
+                resultados[indice] = resultado
+
+        vistaRefrescada = True
+        if self.vista is not None:
+            afectados.update(datos.get(self.campoVista) for _, (_, _, datos, _) in pendientes)
+            vistaRefrescada = self.refrescarVista(afectados)
+        self.marcarCambio(vistaRefrescada)
+
+        resumen['errores'] = sum(1 for resultado in resultados if not resultado['ok'])
+        return {
+            'data': {'resultados': resultados, **resumen},
+            'message': f"Operaciones procesadas: {len(operaciones)}, con errores: {resumen['errores']}."
+        }
+
+    def crearOperacion(self, operacion: dict, id: str):
+        if operacion.get('error'):
+            raise ValueError(operacion['error'])
+        tipo = operacion['type']
+        if tipo == 'insert':
+            datos = dict(operacion['data'])
+            datos[id] = ObjectId()
+            datos['timestamp'] = datetime.utcnow()
+            return InsertOne(datos), datos[id], datos, None
+        filtro = self.convertirFiltro(operacion['filter'])
+        if not filtro:
+            raise ValueError("el filtro no puede estar vacío")
+        todo = bool(operacion.get('todo'))
+        if tipo == 'update':
+            modelo = UpdateMany if todo else UpdateOne
+            datos = dict(operacion['data'])
+            return modelo(filtro, {'$set': datos}), None, datos, filtro
+        if tipo == 'delete':
+            return (DeleteMany(filtro) if todo else DeleteOne(filtro)), None, {}, filtro
+        raise ValueError(f"tipo desconocido {tipo}")
+
+    def convertirFiltro(self, filtroOriginal: dict):
+        filtro = {}
+        for clave, valor in filtroOriginal.items():
+            if isinstance(valor, str) and len(valor) == 24:
+                try:
+                    filtro[clave] = ObjectId(valor)
+                except Exception:
+                    filtro[clave] = valor
+            else:
+                filtro[clave] = valor
+        return filtro
+
     def encontrarDatos(self, opciones: dict):
         try:
-            filtro = {}
-            for clave, valor in opciones.get('filtro', {}).items():
-                if isinstance(valor, str) and len(valor) == 24:
-                    try:
-                        filtro[clave] = ObjectId(valor)
-                    except Exception:
-                        filtro[clave] = valor
-                else:
-                    filtro[clave] = valor
+            filtro = self.convertirFiltro(opciones.get('filtro', {}))
             if opciones['todo']:
-                datosTemp = list(self.connColeccion.find(filtro, opciones['proyeccion']))
-                datosEnvio = []
-                for dato in datosTemp:
-                    print(dato)
-                    datosEnvio.append(self.cambiarAObjectId(dato))
+                datosTemp, siguiente = Paginacion.paginar(
+                    self.connColeccion, filtro, '_id', 1,
+                    Paginacion.limite(opciones.get('limite')), opciones.get('cursor'), opciones['proyeccion']
+                )
                 return {
-                    'data':datosEnvio,
-                    'message': "Lista de datos encontrados."
+                    'data':datosTemp,
+                    'message': "Lista de datos encontrados.",
+                    'next_cursor': siguiente
                 }
             datos = self.connColeccion.find_one(filtro, opciones['proyeccion'])
-            datos = self.cambiarAObjectId(datos)
-            if len(datos) > 0:
+            if datos:
                 return {
                     'data': datos,
                     'message': "Datos encontrados."
@@ -103,14 +237,15 @@ class Query:
                         opciones['campo_match']: {'$in': opciones['match']}
                     }
                 })
-            pipeline.append({
-                '$lookup': {
-                    'from': opciones['coleccion'],
-                    'localField': opciones['id_local'],
-                    'foreignField': opciones['id_relacion'],
-                    'as': opciones['as']
-                }
-            })
+            if 'coleccion' in opciones.keys():
+                pipeline.append({
+                    '$lookup': {
+                        'from': opciones['coleccion'],
+                        'localField': opciones['id_local'],
+                        'foreignField': opciones['id_relacion'],
+                        'as': opciones['as']
+                    }
+                })
             if 'group' in opciones.keys():
                 pipeline.append({
                     '$group': opciones['group']
@@ -121,7 +256,7 @@ class Query:
                 })
             resultados = list(self.connColeccion.aggregate(pipeline))
             return {
-                'data': [self.cambiarAObjectId(r) for r in resultados],
+                'data': resultados,
                 'message': "Módulos con sus contenidos obtenidos correctamente."
             }
         except Exception as e:
@@ -130,19 +265,6 @@ class Query:
                 'message': f"Error al obtener módulos con contenidos: {e}"
             }
 
-    def cambiarAObjectId(self, dato):
-        if isinstance(dato, dict):
-            return {
-                key: self.cambiarAObjectId(value)
-                for key, value in dato.items()
-            }
-        elif isinstance(dato, list):
-            return [self.cambiarAObjectId(item) for item in dato]
-        elif isinstance(dato, ObjectId):
-            return str(dato)
-        else:
-            return dato
-
     def contarRegistros(self, nombreColeccion: str):
         try:
             if nombreColeccion and len(nombreColeccion) > 0:
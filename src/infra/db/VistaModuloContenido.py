@@ -0,0 +1,42 @@
+from domain.mongodb.MongoService import ServicioMongoDB
+
+class VistaModuloContenido:
+    """
+    Vista materializada modulo_con_contenido: cada modulo con sus contenidos embebidos.
+
+    Se reconstruye con $lookup + $merge solo para los modulos afectados por
+    cada escritura, asi las lecturas son una consulta indexada sobre la vista
+    en lugar de unir modulo y contenido completos en cada peticion.
+    """
+    nombreColeccion = 'modulo_con_contenido'
+    indices = [('id_materia', 1), ('id_docente', 1)]
+
+    def __init__(self):
+        mongoService = ServicioMongoDB()
+        self.connDB = mongoService.connectionDB()
+        self.connVista = self.connDB[self.nombreColeccion]
+
+    def refrescar(self, idsModulo: list = None):
+        filtro = {} if idsModulo is None else {'_id': {'$in': list(idsModulo)}}
+        self.connDB['modulo'].aggregate([
+            {'$match': filtro},
+            {'$lookup': {
+                'from': 'contenido',
+                'localField': '_id',
+                'foreignField': 'id_modulo',
+                'as': 'contenido'
+            }},
+            {'$merge': {
+                'into': self.nombreColeccion,
+                'on': '_id',
+                'whenMatched': 'replace',
+                'whenNotMatched': 'insert'
+            }}
+        ])
+        # Quitar de la vista los modulos que ya no existen
+        existentes = self.connDB['modulo'].distinct('_id', filtro)
+        self.connVista.delete_many({'$and': [filtro, {'_id': {'$nin': existentes}}]})
+
+    def crearIndices(self):
+        for index in self.indices:
+            self.connVista.create_index([index])
@@ -2,8 +2,10 @@ from flask import Blueprint
 from flask import request
 
 from infra.controllers.ContenidoController import ContenidoController
+from src.utils.perezoso import Perezoso
 
-controlador = ContenidoController()
+# Se construye en la primera peticion, no al importar el modulo
+controlador = Perezoso(ContenidoController)
 blueprint = Blueprint('archivo', __name__, url_prefix='/archivo')
 
 @blueprint.route('/eliminar', methods=['DELETE'])
@@ -20,4 +22,8 @@ def crearArchivo():
 
 @blueprint.route('/editar', methods=['PATCH'])
 def editarArchivo():
-    return controlador.actualizarRegistro(request)
\ No newline at end of file
+    return controlador.actualizarRegistro(request)
+
+@blueprint.route('/bulk', methods=['POST'])
+def escrituraMasivaArchivos():
+    return controlador.escrituraMasiva(request)
\ No newline at end of file
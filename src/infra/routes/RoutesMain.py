@@ -4,11 +4,24 @@ from flask_cors import CORS
 from flask import Blueprint
 from infra.routes.RoutesContenido import blueprint as blueCont
 from infra.routes.RoutesModulo import blueprint as blueMod
+from src.infra.routes.archivo_routes import archivo_bp
+from src.infra.routes.tema_routes import tema_bp
+from src.infra.routes.publicacion_routes import publicacion_bp
+from src.infra.routes.tarea_routes import tarea_bp
+from src.infra.routes.anuncio_routes import anuncio_bp
+from src.infra.routes.entrega_routes import entrega_bp
+from src.utils.file_utils import SolicitudConSpool
+from src.utils.json_provider import ProveedorJSON
+from src.utils.compresion import CompresionRespuestas
+from src.services.ciclo_vida import registrar_fork
 
 def crearApp():
     app = Flask(__name__)
+    app.json = ProveedorJSON(app)
+    app.request_class = SolicitudConSpool
     CORS(app)
     app.config.from_object('config.settings.Config')
+    CompresionRespuestas(app)
     padreBlueprint = Blueprint('apicontenido', __name__, url_prefix='/apicontenido/v1')
     
     @padreBlueprint.route('/')
@@ -28,6 +41,11 @@ def crearApp():
     
     padreBlueprint.register_blueprint(blueCont)
     padreBlueprint.register_blueprint(blueMod)
+    # Los controladores de cada blueprint se construyen en su primera peticion
+    for blueprint in (archivo_bp, tema_bp, publicacion_bp, tarea_bp, anuncio_bp, entrega_bp):
+        padreBlueprint.register_blueprint(blueprint)
     app.register_blueprint(padreBlueprint)
+    # Conexiones y sesiones se abren por proceso: un worker creado con fork no usa las del padre
+    registrar_fork()
     
     return app
@@ -2,8 +2,10 @@ from flask import Blueprint
 from flask import request
 
 from infra.controllers.ModuloController import ModuloController
+from src.utils.perezoso import Perezoso
 
-controlador = ModuloController()
+# Se construye en la primera peticion, no al importar el modulo
+controlador = Perezoso(ModuloController)
 blueprint = Blueprint('modulo', __name__, url_prefix='/modulo')
 
 @blueprint.route('/eliminar', methods=['DELETE'])
@@ -16,7 +18,7 @@ def obtenerModulos():
 
 @blueprint.route('/contenido', methods=['GET', 'POST'])
 def obtenerModulosContenido():
-    return controlador.obtenerRelacionContenido()
+    return controlador.obtenerRelacionContenido(request)
 
 @blueprint.route('/materias', methods=['GET', 'POST'])
 def obtenerModulosMateria():
@@ -28,4 +30,8 @@ def crearModulo():
 
 @blueprint.route('/editar', methods=['PATCH'])
 def editarModulo():
-    return controlador.actualizarRegistro(request)
\ No newline at end of file
+    return controlador.actualizarRegistro(request)
+
+@blueprint.route('/bulk', methods=['POST'])
+def escrituraMasivaModulos():
+    return controlador.escrituraMasiva(request)
\ No newline at end of file
@@ -1,11 +1,12 @@
 from flask import Blueprint
-from src.controllers.anuncio_controller import AnuncioController
+from src.infra.controllers.anuncio_controller import AnuncioController
+from src.utils.perezoso import Perezoso
 
 # Crear blueprint para las rutas de anuncios
 anuncio_bp = Blueprint('anuncios', __name__, url_prefix='/anuncios')
 
-# Instanciar el controlador
-anuncio_controller = AnuncioController()
+# El controlador (y sus conexiones) se construye en la primera petición
+anuncio_controller = Perezoso(AnuncioController)
 
 # Obtener anuncios por curso
 @anuncio_bp.route('/obtener', methods=['POST'])
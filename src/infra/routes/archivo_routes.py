@@ -1,11 +1,12 @@
 from flask import Blueprint
-from src.controllers.archivo_controller import ArchivoController
+from src.infra.controllers.archivo_controller import ArchivoController
+from src.utils.perezoso import Perezoso
 
 # Crear blueprint unificado para todas las rutas de archivos
 archivo_bp = Blueprint('archivos', __name__, url_prefix='/archivos')
 
-# Instanciar el controlador
-archivo_controller = ArchivoController()
+# El controlador (y sus conexiones) se construye en la primera petición
+archivo_controller = Perezoso(ArchivoController)
 
 # ==================== ARCHIVOS DE CONTENIDO ====================
 
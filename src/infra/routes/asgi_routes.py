@@ -0,0 +1,62 @@
+from contextlib import asynccontextmanager
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.routing import Mount, Route
+from infra.routes.RoutesMain import crearApp
+from src.infra.controllers.archivo_controller_async import ArchivoControllerAsync
+from src.services import mongo_conexion
+from src.config.settings import Config
+from src.utils.perezoso import Perezoso
+
+# Mismo prefijo que el blueprint de archivos registrado bajo /apicontenido/v1
+PREFIJO_ARCHIVOS = '/apicontenido/v1/archivos'
+
+# El controlador (y sus conexiones) se construye en la primera petición
+archivo_controller = Perezoso(ArchivoControllerAsync)
+
+async def subir_archivo_contenido(request):
+    """Subir un archivo a carpeta de contenido"""
+    return await archivo_controller.subir_archivo_contenido(request)
+
+async def subir_multiples_archivos_contenido(request):
+    """Subir múltiples archivos a carpeta de contenido"""
+    return await archivo_controller.subir_multiples_archivos_contenido(request)
+
+def _subir_archivo_modulo(modulo: str):
+    async def subir_archivo_modulo(request):
+        """Subir archivos para una publicación, tarea, entrega o anuncio"""
+        return await archivo_controller.subir_archivo_modulo(request, modulo)
+    return subir_archivo_modulo
+
+# Rutas de carga atendidas en el event loop; tienen prioridad sobre las de Flask
+rutas_asincronas = [
+    Route(f'{PREFIJO_ARCHIVOS}/contenido/subir', subir_archivo_contenido, methods=['POST']),
+    Route(f'{PREFIJO_ARCHIVOS}/contenido/subir-multiples', subir_multiples_archivos_contenido, methods=['POST']),
+] + [
+    Route(f'{PREFIJO_ARCHIVOS}/educativo/{modulo}/upload', _subir_archivo_modulo(modulo), methods=['POST'])
+    for modulo in ArchivoControllerAsync.CARGAS_EDUCATIVAS
+]
+
+@asynccontextmanager
+async def ciclo_de_vida(app):
+    yield
+    if archivo_controller._construido():
+        await archivo_controller.cerrar()
+    await mongo_conexion.cerrar_clientes_async()
+
+def crear_app_asgi() -> Starlette:
+    """Aplicación ASGI con las mismas rutas que crearApp().
+
+    Las cargas de archivos, que pasan casi todo su tiempo esperando a MEGA,
+    se atienden con corrutinas; el resto de /apicontenido/v1 lo sigue
+    atendiendo la aplicación Flask en un pool de ASGI_HILOS_WSGI hilos.
+    """
+    flask_app = crearApp()
+    return Starlette(
+        routes=rutas_asincronas + [Mount('/', app=WSGIMiddleware(flask_app, workers=Config.ASGI_HILOS_WSGI))],
+        # Flask-CORS solo cubre las rutas de Flask; se aplica la misma política a todas
+        middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+        lifespan=ciclo_de_vida,
+    )
@@ -1,11 +1,12 @@
 from flask import Blueprint
-from src.controllers.entrega_controller import EntregaController
+from src.infra.controllers.entrega_controller import EntregaController
+from src.utils.perezoso import Perezoso
 
 # Crear blueprint para las rutas de entregas
 entrega_bp = Blueprint('entregas', __name__, url_prefix='/entregas')
 
-# Instanciar el controlador
-entrega_controller = EntregaController()
+# El controlador (y sus conexiones) se construye en la primera petición
+entrega_controller = Perezoso(EntregaController)
 
 # Obtener entregas por tarea y estudiante
 @entrega_bp.route('/obtener', methods=['POST'])
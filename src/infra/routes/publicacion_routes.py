@@ -1,11 +1,12 @@
 from flask import Blueprint
-from src.controllers.publicacion_controller import PublicacionController
+from src.infra.controllers.publicacion_controller import PublicacionController
+from src.utils.perezoso import Perezoso
 
 # Crear blueprint para las rutas de publicaciones
 publicacion_bp = Blueprint('publicaciones', __name__, url_prefix='/publicaciones')
 
-# Instanciar el controlador
-publicacion_controller = PublicacionController()
+# El controlador (y sus conexiones) se construye en la primera petición
+publicacion_controller = Perezoso(PublicacionController)
 
 # Obtener publicaciones por tema
 @publicacion_bp.route('/obtener', methods=['POST'])
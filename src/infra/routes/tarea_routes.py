@@ -1,11 +1,12 @@
 from flask import Blueprint
-from src.controllers.tarea_controller import TareaController
+from src.infra.controllers.tarea_controller import TareaController
+from src.utils.perezoso import Perezoso
 
 # Crear blueprint para las rutas de tareas
 tarea_bp = Blueprint('tareas', __name__, url_prefix='/tareas')
 
-# Instanciar el controlador
-tarea_controller = TareaController()
+# El controlador (y sus conexiones) se construye en la primera petición
+tarea_controller = Perezoso(TareaController)
 
 # Obtener tareas por tema
 @tarea_bp.route('/obtener', methods=['POST'])
@@ -1,11 +1,12 @@
 from flask import Blueprint
-from src.controllers.tema_controller import TemaController
+from src.infra.controllers.tema_controller import TemaController
+from src.utils.perezoso import Perezoso
 
 # Crear blueprint para las rutas de temas
 tema_bp = Blueprint('temas', __name__, url_prefix='/temas')
 
-# Instanciar el controlador
-tema_controller = TemaController()
+# El controlador (y sus conexiones) se construye en la primera petición
+tema_controller = Perezoso(TemaController)
 
 # Obtener temas por curso
 @tema_bp.route('/obtener', methods=['POST'])
@@ -0,0 +1,49 @@
+import sys
+import os
+import gzip
+import time
+
+# Permite ejecutar el script directamente: python src/scripts/benchmark_compresion.py [documentos]
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from flask import Flask
+from src.scripts.benchmark_json import listado
+from src.utils.json_provider import ProveedorJSON
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bytes por segundo de una conexión móvil lenta (~1,5 Mbit/s)
+ANCHO_BANDA_MOVIL = 1.5e6 / 8
+
+def medir(comprimir, datos: bytes, repeticiones: int = 3):
+    """Menor tiempo de compresión de datos y tamaño resultante"""
+    mejor, resultado = None, datos
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = comprimir(datos)
+        transcurrido = time.perf_counter() - inicio
+        mejor = transcurrido if mejor is None else min(mejor, transcurrido)
+    return mejor, len(resultado)
+
+if __name__ == '__main__':
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    app = Flask(__name__)
+    with app.app_context():
+        datos = ProveedorJSON(app).response(listado(cantidad)).get_data()
+
+    variantes = [("sin compresión", lambda d: d)]
+    variantes += [(f"gzip {nivel}", lambda d, n=nivel: gzip.compress(d, compresslevel=n, mtime=0)) for nivel in (1, 6, 9)]
+    if brotli is not None:
+        variantes += [(f"brotli {nivel}", lambda d, n=nivel: brotli.compress(d, quality=n)) for nivel in (1, 4, 11)]
+    else:
+        print("brotli no está instalado; solo se mide gzip")
+
+    print(f"Listado de {cantidad} documentos: {len(datos) / 1024:.0f} KiB")
+    for nombre, comprimir in variantes:
+        tiempo, tamano = medir(comprimir, datos)
+        transferencia = tamano / ANCHO_BANDA_MOVIL
+        print(f"{nombre:>15}: {tamano / 1024:8.0f} KiB  CPU {tiempo * 1000:7.1f} ms  "
+              f"transferencia móvil {transferencia:6.2f} s  total {tiempo + transferencia:6.2f} s")
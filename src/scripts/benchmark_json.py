@@ -0,0 +1,43 @@
+import sys
+import os
+import timeit
+
+# Permite ejecutar el script directamente: python src/scripts/benchmark_json.py [documentos]
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from bson import ObjectId
+from datetime import datetime
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from src.utils.json_provider import ProveedorJSON
+
+def listado(cantidad: int):
+    """Respuesta con la forma de listar_todos_archivos para cantidad documentos"""
+    archivos = [{
+        "_id": ObjectId(),
+        "usuario_id": f"usuario_{i % 97}",
+        "carpeta": "Contenido Personal",
+        "archivo": {
+            "nombre": f"documento_{i}.pdf",
+            "mime": "application/pdf",
+            "peso": 1024 * i,
+            "link": f"https://mega.nz/file/{i:08d}#clave",
+            "mega_node_id": f"{i:08x}"
+        },
+        "fecha_subida": datetime.utcnow(),
+        "estado": "activo"
+    } for i in range(cantidad)]
+    return {"status": "success", "code": 200, "message": "Archivos obtenidos exitosamente",
+            "data": {"total": cantidad, "archivos": archivos, "next_cursor": None}}
+
+class ProveedorEstandar(DefaultJSONProvider):
+    default = staticmethod(ProveedorJSON.default)
+
+if __name__ == '__main__':
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    datos = listado(cantidad)
+    app = Flask(__name__)
+    with app.app_context():
+        for nombre, proveedor in (("json estándar", ProveedorEstandar(app)), ("ProveedorJSON", ProveedorJSON(app))):
+            tiempo = min(timeit.repeat(lambda: proveedor.response(datos), number=5, repeat=3)) / 5
+            print(f"{nombre:>15}: {tiempo * 1000:.1f} ms por respuesta de {cantidad} documentos")
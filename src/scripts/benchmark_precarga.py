@@ -0,0 +1,81 @@
+import sys
+import os
+import json
+import signal
+import subprocess
+import time
+
+# Permite ejecutar el script directamente: python src/scripts/benchmark_precarga.py [workers]
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, 'src'))
+
+# Sin conexiones reales: se mide el costo de importar y crear la aplicación
+os.environ['PRECARGA_CALENTAR'] = 'false'
+
+def memoria(pid: int) -> dict:
+    """Pss y memoria privada (KiB) de un proceso según /proc/<pid>/smaps_rollup (solo Linux)"""
+    valores = {}
+    with open(f'/proc/{pid}/smaps_rollup') as archivo:
+        for linea in archivo:
+            partes = linea.split()
+            if len(partes) >= 2 and partes[0].endswith(':') and partes[1].isdigit():
+                valores[partes[0][:-1]] = int(partes[1])
+    return {'pss': valores.get('Pss', 0),
+            'privada': valores.get('Private_Clean', 0) + valores.get('Private_Dirty', 0)}
+
+def crear_app():
+    from infra.routes.RoutesMain import crearApp
+    return crearApp()
+
+def medir(workers: int, precarga: bool) -> dict:
+    """Crea workers con fork como gunicorn y mide su arranque y su memoria"""
+    if precarga:
+        crear_app()
+        from src.services.ciclo_vida import antes_de_fork
+        antes_de_fork()
+
+    hijos, arranques = [], []
+    for _ in range(workers):
+        lectura, escritura = os.pipe()
+        inicio = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            os.close(lectura)
+            if precarga:
+                from src.services.ciclo_vida import despues_de_fork
+                despues_de_fork()
+            else:
+                crear_app()
+            os.write(escritura, b'listo')
+            signal.pause()
+            os._exit(0)
+        os.close(escritura)
+        os.read(lectura, 5)
+        arranques.append(time.perf_counter() - inicio)
+        os.close(lectura)
+        hijos.append(pid)
+
+    medidas = [memoria(pid) for pid in hijos]
+    for pid in hijos:
+        os.kill(pid, signal.SIGTERM)
+        os.waitpid(pid, 0)
+    return {
+        'arranque_ms': 1000 * sum(arranques) / workers,
+        'pss_kib': sum(medida['pss'] for medida in medidas) / workers,
+        'privada_kib': sum(medida['privada'] for medida in medidas) / workers,
+    }
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2:
+        # Cada modo corre en un intérprete nuevo para no heredar módulos del otro
+        print(json.dumps(medir(int(sys.argv[1]), sys.argv[2] == 'precarga')))
+        sys.exit(0)
+
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    print(f"{workers} workers por máquina")
+    for modo in ('sin_precarga', 'precarga'):
+        salida = subprocess.run([sys.executable, __file__, str(workers), modo], capture_output=True, text=True, check=True)
+        resultado = json.loads(salida.stdout.strip().splitlines()[-1])
+        print(f"{modo:>13}: arranque {resultado['arranque_ms']:7.1f} ms por worker  "
+              f"PSS {resultado['pss_kib'] / 1024:6.1f} MiB  privada {resultado['privada_kib'] / 1024:6.1f} MiB")
@@ -1,10 +1,13 @@
 from infra.db.Collection import CollectionMongo
 from domain.mongodb.MongoService import ServicioMongoDB
+from src.services.migraciones import COLECCION_MIGRACIONES, versiones_aplicadas
+from datetime import datetime
 
 class Ejecutar():
     def __init__(self):
         connexion = ServicioMongoDB()
         self.connMongoDB = connexion.connectionDB()
+        self.migraciones = {}
 
     def ejecutarConsulta(self, consulta: str):
         conn = self.connMongoDB
@@ -20,4 +23,40 @@ class Ejecutar():
                 return "Creacion de Coleccion exitosa."
             print(f"La Coleccion {modelo.nombreColeccion} ya existe.")
             return "La Coleccion ya existe."
-        return nuevaMigracion
\ No newline at end of file
+        return nuevaMigracion
+
+    def registrarMigracion(self, version: int, descripcion: str, baseDatos: str = None):
+        """
+        Registra una migración versionada; se aplica con aplicarMigraciones().
+
+        La función decorada recibe la base de datos donde se aplica (la de
+        Config.MONGO_DB salvo que se indique baseDatos) y la versión queda
+        registrada en la colección de migraciones de esa misma base de datos.
+        """
+        def registrar(migracion):
+            if version in self.migraciones:
+                raise ValueError(f"La version de migracion {version} ya esta registrada.")
+            self.migraciones[version] = (descripcion, baseDatos, migracion)
+            return migracion
+        return registrar
+
+    def aplicarMigraciones(self):
+        """Aplica en orden las migraciones que aun no estan registradas en su base de datos."""
+        aplicadas = {}
+        for version in sorted(self.migraciones):
+            descripcion, baseDatos, migracion = self.migraciones[version]
+            db = self.connMongoDB.client[baseDatos] if baseDatos else self.connMongoDB
+            if db.name not in aplicadas:
+                aplicadas[db.name] = versiones_aplicadas(db)
+            if version in aplicadas[db.name]:
+                print(f"Migracion {version} ya aplicada: {descripcion}")
+                continue
+            print(f"Aplicando migracion {version}: {descripcion}...")
+            migracion(db)
+            db[COLECCION_MIGRACIONES].insert_one({
+                '_id': version,
+                'descripcion': descripcion,
+                'aplicada_en': datetime.utcnow()
+            })
+            aplicadas[db.name].add(version)
+        return "Migraciones aplicadas correctamente."
@@ -1,13 +1,49 @@
+import sys
+import os
+
+# Permite ejecutar el script directamente: python src/scripts/migrate.py
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
 from infra.models.ModuloModel import Modulo
 from infra.models.ContenidoModel import Contenido
 from scripts.execute import Ejecutar
+from infra.db.VistaModuloContenido import VistaModuloContenido
+from src.services.migraciones import crear_indices
+from src.services.mongo_service import MongoService
+from src.services.educativo_service import EducativoService
+from src.services.uso_service import UsoService
+from src.utils.busqueda import BusquedaArchivos
 
 ejecutar = Ejecutar()
 
-@ejecutar.crearColeccion()
-def crearColeccionModulo():
-    return Modulo()
+@ejecutar.registrarMigracion(1, "Colecciones modulo y contenido")
+def crearColecciones(db):
+    ejecutar.crearColeccion()(Modulo)
+    ejecutar.crearColeccion()(Contenido)
+
+@ejecutar.registrarMigracion(MongoService.VERSION_INDICES, "Indices de archivos de contenido", MongoService.BASE_DATOS)
+def crearIndicesContenido(db):
+    crear_indices(db, MongoService.INDICES)
+
+@ejecutar.registrarMigracion(EducativoService.VERSION_INDICES, "Indices de colecciones educativas", EducativoService.BASE_DATOS)
+def crearIndicesEducativos(db):
+    crear_indices(db, EducativoService.INDICES)
+
+@ejecutar.registrarMigracion(8, "Tokens de busqueda de archivos existentes", MongoService.BASE_DATOS)
+def rellenarTokensBusqueda(db):
+    print(f"Archivos de contenido actualizados: {BusquedaArchivos.rellenar(db.archivos_subidos, 'archivo.nombre')}")
+    print(f"Archivos educativos actualizados: {BusquedaArchivos.rellenar(db.archivos, 'nombre_original')}")
+
+@ejecutar.registrarMigracion(10, "Contadores de uso de almacenamiento", MongoService.BASE_DATOS)
+def calcularUsoUsuarios(db):
+    print(f"Contadores de uso calculados: {UsoService(db).recalcular()}")
+
+@ejecutar.registrarMigracion(13, "Vista materializada modulo_con_contenido")
+def crearVistaModuloContenido(db):
+    vista = VistaModuloContenido()
+    vista.crearIndices()
+    vista.refrescar()
 
-@ejecutar.crearColeccion()
-def crearColeccionContenido():
-    return Contenido()
\ No newline at end of file
+if __name__ == '__main__':
+    print(ejecutar.aplicarMigraciones())
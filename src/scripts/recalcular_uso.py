@@ -0,0 +1,15 @@
+import sys
+import os
+
+# Permite ejecutar el script directamente: python src/scripts/recalcular_uso.py [usuario_id]
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.config.settings import Config
+from src.services.mongo_conexion import obtener_cliente
+from src.services.mongo_service import MongoService
+from src.services.uso_service import UsoService
+
+if __name__ == '__main__':
+    usuario_id = sys.argv[1] if len(sys.argv) > 1 else None
+    db = obtener_cliente(Config.MONGO_URI)[MongoService.BASE_DATOS]
+    print(f"Contadores de uso recalculados: {UsoService(db).recalcular(usuario_id)}")
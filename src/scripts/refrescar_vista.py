@@ -0,0 +1,18 @@
+import sys
+import os
+
+# Permite ejecutar el script directamente: python src/scripts/refrescar_vista.py [id_modulo ...]
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bson import ObjectId
+from infra.db.VistaModuloContenido import VistaModuloContenido
+from src.utils.etag import VersionesListados
+
+if __name__ == '__main__':
+    # Sin ids reconstruye la vista completa, como la migracion 13
+    idsModulo = [ObjectId(id) for id in sys.argv[1:]] or None
+    vista = VistaModuloContenido()
+    vista.refrescar(idsModulo)
+    VersionesListados(vista.connDB).incrementar(vista.nombreColeccion)
+    print(f"Vista {vista.nombreColeccion} refrescada: {'completa' if idsModulo is None else len(idsModulo)}")
@@ -0,0 +1,23 @@
+import sys
+import os
+
+# Permite ejecutar el script directamente: python src/scripts/verificar_indices.py
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.config.settings import Config
+from src.services.mongo_conexion import obtener_cliente
+from src.services.formas_consulta import verificar_planes
+from src.services.mongo_service import MongoService
+from src.services.educativo_service import EducativoService
+
+if __name__ == '__main__':
+    cliente = obtener_cliente(Config.MONGO_URI)
+    problemas = []
+    for servicio in (MongoService, EducativoService):
+        problemas += verificar_planes(cliente[servicio.BASE_DATOS], servicio.FORMAS_CONSULTA)
+
+    for problema in problemas:
+        print(f"Consulta sin índice adecuado: {problema}")
+    if problemas:
+        sys.exit(1)
+    print("Todas las formas de consulta usan un índice sin ordenar en memoria")
@@ -0,0 +1,129 @@
+from bson import json_util
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+import copy
+import logging
+import os
+import threading
+import time
+from src.config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+class CacheLRU:
+    """Caché en memoria del proceso con expiración y descarte del menos usado.
+
+    Cada clave agrupa variantes (por ejemplo las páginas de un listado) que
+    se invalidan juntas. Con varios workers cada uno tiene su propia copia,
+    así que una escritura solo invalida la del worker que la hizo; por eso
+    los listados se guardan por versión (ver EducativoService._listado_cacheado).
+    """
+
+    def __init__(self, maximo: int, ttl: int):
+        self.maximo = max(1, maximo)
+        self.ttl = ttl
+        self._entradas: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._bloqueo = threading.Lock()
+
+    def obtener(self, clave: str, variante: str = '') -> Optional[Any]:
+        with self._bloqueo:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                return None
+            expira, variantes = entrada
+            if expira <= time.monotonic():
+                del self._entradas[clave]
+                return None
+            self._entradas.move_to_end(clave)
+            valor = variantes.get(variante)
+        # Copia para que quien la reciba pueda modificarla sin alterar la caché
+        return copy.deepcopy(valor)
+
+    def guardar(self, clave: str, valor: Any, variante: str = ''):
+        valor = copy.deepcopy(valor)
+        with self._bloqueo:
+            entrada = self._entradas.get(clave)
+            if entrada is None or entrada[0] <= time.monotonic():
+                entrada = (time.monotonic() + self.ttl, {})
+                self._entradas[clave] = entrada
+            entrada[1][variante] = valor
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.maximo:
+                self._entradas.popitem(last=False)
+
+    def invalidar(self, clave: str):
+        with self._bloqueo:
+            self._entradas.pop(clave, None)
+
+class CacheRedis:
+    """Caché compartida por todos los workers sobre cualquier cliente con protocolo Redis.
+
+    Cada clave es un hash cuyos campos son las variantes; los valores se
+    guardan como Extended JSON para conservar ObjectId y fechas. Un fallo del
+    servidor se registra y se trata como ausencia en la caché.
+    """
+
+    def __init__(self, cliente, ttl: int, prefijo: str = 'microservice_content:'):
+        self.cliente = cliente
+        self.ttl = ttl
+        self.prefijo = prefijo
+
+    def obtener(self, clave: str, variante: str = '') -> Optional[Any]:
+        try:
+            valor = self.cliente.hget(self.prefijo + clave, variante)
+        except Exception as e:
+            logger.error(f"Error al leer la caché {clave}: {e}")
+            return None
+        return json_util.loads(valor) if valor is not None else None
+
+    def guardar(self, clave: str, valor: Any, variante: str = ''):
+        try:
+            self.cliente.hset(self.prefijo + clave, variante, json_util.dumps(valor))
+            self.cliente.expire(self.prefijo + clave, self.ttl)
+        except Exception as e:
+            logger.error(f"Error al escribir la caché {clave}: {e}")
+
+    def invalidar(self, clave: str):
+        try:
+            self.cliente.delete(self.prefijo + clave)
+        except Exception as e:
+            logger.error(f"Error al invalidar la caché {clave}: {e}")
+
+class SinCache:
+    """Backend nulo: toda lectura va a MongoDB"""
+
+    def obtener(self, clave: str, variante: str = '') -> Optional[Any]:
+        return None
+
+    def guardar(self, clave: str, valor: Any, variante: str = ''):
+        pass
+
+    def invalidar(self, clave: str):
+        pass
+
+_caches: Dict[int, Any] = {}
+_bloqueo = threading.Lock()
+
+def crear_cache(backend: Optional[str] = None):
+    """Construye el backend indicado en CACHE_BACKEND (memoria, redis o ninguno)"""
+    backend = (backend or Config.CACHE_BACKEND).lower()
+    if backend == 'redis':
+        try:
+            import redis
+            return CacheRedis(redis.Redis.from_url(Config.REDIS_URL), Config.CACHE_TTL)
+        except ImportError:
+            logger.error("CACHE_BACKEND=redis requiere el paquete redis; se usa la caché en memoria")
+    if backend == 'ninguno':
+        return SinCache()
+    return CacheLRU(Config.CACHE_MAXIMO, Config.CACHE_TTL)
+
+def obtener_cache():
+    """Caché compartida por los servicios del proceso actual"""
+    pid = os.getpid()
+    with _bloqueo:
+        cache = _caches.get(pid)
+        if cache is None:
+            # Un proceso hijo no hereda la caché del padre
+            _caches.clear()
+            cache = _caches[pid] = crear_cache()
+        return cache
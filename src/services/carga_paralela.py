@@ -0,0 +1,77 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+import asyncio
+import logging
+from src.config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+class ErrorCarga(Exception):
+    """Fallo esperado de un archivo del lote; su mensaje se reporta tal cual en `errores`"""
+
+class MotorCargaParalela:
+    """Procesa los archivos de una carga múltiple en un pool acotado de hilos.
+
+    Cada archivo se procesa con la función recibida (validar, subir a MEGA,
+    registrar en MongoDB); los resultados y los errores se retornan en el
+    mismo orden en que llegaron los archivos en la petición.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max(1, max_workers or Config.MEGA_UPLOAD_WORKERS)
+
+    def subir(self, archivos: List, procesar: Callable) -> Tuple[List[Dict], List[str]]:
+        """Ejecuta `procesar(archivo)` por cada archivo y agrupa resultados y errores.
+
+        `procesar` retorna el dict del archivo subido, None para omitirlo, o
+        lanza ErrorCarga con el mensaje a reportar.
+        """
+        workers = min(self.max_workers, len(archivos))
+        if workers <= 1:
+            resultados = [self._ejecutar(procesar, archivo) for archivo in archivos]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='carga') as pool:
+                resultados = list(pool.map(lambda archivo: self._ejecutar(procesar, archivo), archivos))
+        return self._agrupar(resultados)
+
+    async def subir_async(self, archivos: List, procesar: Callable) -> Tuple[List[Dict], List[str]]:
+        """Como subir(), pero `procesar` es una corrutina y los archivos se procesan en el event loop.
+
+        A lo sumo max_workers archivos de la petición se suben a la vez, igual
+        que con el pool de hilos.
+        """
+        semaforo = asyncio.Semaphore(self.max_workers)
+
+        async def ejecutar(archivo) -> Tuple[Optional[Dict], Optional[str]]:
+            async with semaforo:
+                try:
+                    return await procesar(archivo), None
+                except Exception as e:
+                    return None, self._mensaje_error(archivo, e)
+
+        return self._agrupar(await asyncio.gather(*(ejecutar(archivo) for archivo in archivos)))
+
+    @staticmethod
+    def _agrupar(resultados: List[Tuple[Optional[Dict], Optional[str]]]) -> Tuple[List[Dict], List[str]]:
+        archivos_subidos = []
+        errores = []
+        for subido, error in resultados:
+            if error:
+                errores.append(error)
+            elif subido:
+                archivos_subidos.append(subido)
+        return archivos_subidos, errores
+
+    @staticmethod
+    def _ejecutar(procesar: Callable, archivo) -> Tuple[Optional[Dict], Optional[str]]:
+        try:
+            return procesar(archivo), None
+        except Exception as e:
+            return None, MotorCargaParalela._mensaje_error(archivo, e)
+
+    @staticmethod
+    def _mensaje_error(archivo, e: Exception) -> str:
+        if isinstance(e, ErrorCarga):
+            return str(e)
+        logger.error(f"Error al procesar archivo {archivo.filename}: {str(e)}", exc_info=True)
+        return f"Error al procesar {archivo.filename}: {str(e)}"
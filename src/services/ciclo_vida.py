@@ -0,0 +1,57 @@
+import gc
+import importlib
+import logging
+import os
+from src.config.settings import Config
+from src.services import mongo_conexion
+from src.services.mega_pool import PoolSesionesMega
+from src.utils.perezoso import construir_proveedores, reiniciar_proveedores
+
+logger = logging.getLogger(__name__)
+
+# Módulos de Python puro que no se importan al crear la aplicación pero sí en
+# la primera petición; con la aplicación precargada se importan una sola vez en
+# el proceso maestro y los workers comparten sus páginas de memoria.
+MODULOS_PRECARGA = ['mega', 'mega.crypto', 'mega.errors']
+
+_fork_registrado = False
+
+def antes_de_fork():
+    """Prepara el proceso maestro para crear workers (gunicorn --preload).
+
+    Importa el código que los workers van a necesitar, cierra los clientes
+    de MongoDB que se hayan abierto durante la carga y congela los objetos
+    existentes para que el recolector de basura no los toque en los hijos
+    (cada escritura en un objeto compartido copia su página de memoria).
+    Es idempotente: gunicorn la llama antes de cada fork.
+    """
+    for modulo in MODULOS_PRECARGA:
+        try:
+            importlib.import_module(modulo)
+        except Exception as e:
+            logger.error(f"No se pudo precargar {modulo}: {e}")
+    mongo_conexion.cerrar_clientes()
+    gc.collect()
+    gc.freeze()
+
+def despues_de_fork(calentar: bool = None):
+    """Inicializa un worker recién creado.
+
+    Descarta el estado no compartible heredado del maestro (clientes de
+    MongoDB, pools de sesiones de MEGA y controladores ya construidos) y,
+    con PRECARGA_CALENTAR, construye los controladores para que el worker
+    abra sus conexiones y sesiones antes de recibir peticiones.
+    """
+    mongo_conexion.descartar_clientes_heredados()
+    PoolSesionesMega.descartar_heredados()
+    reiniciar_proveedores()
+    if Config.PRECARGA_CALENTAR if calentar is None else calentar:
+        construidos = construir_proveedores()
+        logger.info(f"Worker {os.getpid()}: {construidos} controladores construidos")
+
+def registrar_fork():
+    """Descarta el estado heredado en cualquier hijo creado con fork, aunque no lo cree gunicorn (idempotente)"""
+    global _fork_registrado
+    if not _fork_registrado and hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=lambda: despues_de_fork(calentar=False))
+        _fork_registrado = True
@@ -1,15 +1,79 @@
-from pymongo import MongoClient, ASCENDING
+from pymongo import ASCENDING, DESCENDING
 from bson import ObjectId
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
 from datetime import datetime
+from src.services.mongo_conexion import obtener_cliente
+from src.services.migraciones import verificar_migracion
+from src.services.formas_consulta import FormaConsulta, indices_de_formas
+from src.services.uso_service import UsoService
+from src.services.cache_service import obtener_cache
+from src.services.vistas_consulta import vista, fecha_iso, con_defecto
+from src.utils.paginacion import Paginacion
+from src.utils.etag import VersionesListados
+from src.utils.busqueda import BusquedaArchivos
 
 logger = logging.getLogger(__name__)
 
 class EducativoService:
+    BASE_DATOS = "microservice_content"
+    # Migración de scripts/migrate.py que crea INDICES
+    VERSION_INDICES = 12
+    # Consultas de los métodos del servicio; de ellas se derivan los índices compuestos
+    FORMAS_CONSULTA = [
+        FormaConsulta("obtener_temas_por_curso", "temas",
+                      igualdad=("id_curso", "estado"), orden=(("orden", ASCENDING),)),
+        FormaConsulta("obtener_publicaciones_por_tema", "publicaciones",
+                      igualdad=("id_tema", "estado"), orden=(("fecha_creacion", DESCENDING),)),
+        FormaConsulta("obtener_tareas_por_tema", "tareas",
+                      igualdad=("id_tema", "estado"), orden=(("fecha_entrega", ASCENDING),)),
+        FormaConsulta("obtener_entregas_por_tarea", "entregas",
+                      igualdad=("id_tarea",), orden=(("fecha_entrega", DESCENDING), ("_id", DESCENDING))),
+        FormaConsulta("obtener_entrega_estudiante", "entregas", igualdad=("id_tarea", "id_estudiante")),
+        FormaConsulta("obtener_anuncios_por_curso", "anuncios",
+                      igualdad=("id_curso", "estado"), orden=(("fecha_creacion", DESCENDING), ("_id", DESCENDING))),
+        FormaConsulta("obtener_archivos_por_modulo", "archivos",
+                      igualdad=("modulo_origen", "referencia_id"), orden=(("fecha_subida", DESCENDING),)),
+        FormaConsulta("obtener_archivos_por_usuario", "archivos",
+                      igualdad=("usuario_id", "tipo_usuario"), orden=(("fecha_subida", DESCENDING), ("_id", DESCENDING))),
+        FormaConsulta("listar_archivos", "archivos", orden=(("fecha_subida", DESCENDING), ("_id", DESCENDING))),
+        # Recálculo de uso y estadísticas por módulo de un usuario
+        FormaConsulta("UsoService.recalcular", "archivos", igualdad=("usuario_id", "modulo_origen")),
+    ]
+    INDICES = indices_de_formas(FORMAS_CONSULTA, {
+        "archivos": [
+            # Búsqueda por tokens del nombre
+            ([(BusquedaArchivos.CAMPO_TOKENS, ASCENDING)], {}),
+            ([("usuario_id", ASCENDING), (BusquedaArchivos.CAMPO_TOKENS, ASCENDING)], {}),
+        ],
+    })
+    
+    # Forma de cada documento en las respuestas de los listados, aplicada con $project
+    VISTA_TEMA = vista(id_curso=1, titulo=1, descripcion=1, orden=1, fecha_creacion=fecha_iso("fecha_creacion"))
+    VISTA_PUBLICACION = vista(id_tema=1, titulo=1, contenido=1, autor_id=con_defecto("autor_id", ""),
+                              archivos=con_defecto("archivos", []), fecha_creacion=fecha_iso("fecha_creacion"))
+    VISTA_TAREA = vista(id_tema=1, titulo=1, descripcion=1, fecha_entrega=1, autor_id=con_defecto("autor_id", ""),
+                        archivos=con_defecto("archivos", []), fecha_creacion=fecha_iso("fecha_creacion"))
+    VISTA_ANUNCIO = vista(id_curso=1, titulo=1, contenido=1, autor_id=1, tipo_usuario=1,
+                          archivos=con_defecto("archivos", []), fecha_creacion=fecha_iso("fecha_creacion"))
+    VISTA_ENTREGA = vista(id_tarea=1, id_estudiante=1, respuesta=1, archivos=con_defecto("archivos", []),
+                          fecha_entrega=fecha_iso("fecha_entrega"), estado=con_defecto("estado", "entregado"))
+    VISTA_ARCHIVO = vista(usuario_id=1, tipo_usuario=1, nombre_original=1, nombre_almacenado=1, url=1, tipo=1,
+                          peso=1, modulo_origen=1, referencia_id=1, fecha_subida=fecha_iso("fecha_subida"))
+    # Listados generales, donde se mezclan con los archivos de contenido
+    VISTA_ARCHIVO_GENERAL = {**VISTA_ARCHIVO, "tipo_archivo": {"$literal": "educativo"}}
+    
+    # Listados leídos en cada vista de un curso: colección -> campo que agrupa su caché
+    LISTADOS_CACHEADOS = {
+        "temas": "id_curso",
+        "publicaciones": "id_tema",
+        "tareas": "id_tema",
+        "anuncios": "id_curso",
+    }
+    
     def __init__(self, mongo_uri: str):
-        self.client = MongoClient(mongo_uri)
-        self.db = self.client.microservice_content
+        self.client = obtener_cliente(mongo_uri)
+        self.db = self.client[self.BASE_DATOS]
         
         # Colecciones educativas
         self.temas_collection = self.db.temas
@@ -18,56 +82,76 @@ class EducativoService:
         self.entregas_collection = self.db.entregas
         self.anuncios_collection = self.db.anuncios
         self.archivos_collection = self.db.archivos
+        self.uso = UsoService(self.db)
+        self.cache = obtener_cache()
+        self.versiones = VersionesListados(self.db)
         
-        self._crear_indices()
+        verificar_migracion(self.db, self.VERSION_INDICES, "EducativoService")
     
-    def _crear_indices(self):
-        """Crea índices para optimizar las consultas"""
-        try:
-            # Índices para temas
-            self.temas_collection.create_index([("id_curso", ASCENDING)])
-            self.temas_collection.create_index([("orden", ASCENDING)])
-            
-            # Índices para publicaciones
-            self.publicaciones_collection.create_index([("id_tema", ASCENDING)])
-            
-            # Índices para tareas
-            self.tareas_collection.create_index([("id_tema", ASCENDING)])
-            self.tareas_collection.create_index([("fecha_entrega", ASCENDING)])
-            
-            # Índices para entregas
-            self.entregas_collection.create_index([("id_tarea", ASCENDING)])
-            self.entregas_collection.create_index([("id_estudiante", ASCENDING)])
-            self.entregas_collection.create_index([("id_tarea", ASCENDING), ("id_estudiante", ASCENDING)])
-            
-            # Índices para anuncios
-            self.anuncios_collection.create_index([("id_curso", ASCENDING)])
-            self.anuncios_collection.create_index([("fecha_creacion", ASCENDING)])
-            
-            # Índices para archivos
-            self.archivos_collection.create_index([("modulo_origen", ASCENDING)])
-            self.archivos_collection.create_index([("referencia_id", ASCENDING)])
-            
-            logger.info("Índices educativos creados exitosamente")
-        except Exception as e:
-            logger.error(f"Error al crear índices educativos: {e}")
+    def _vista(self, coleccion, filtro: Dict, orden: Dict, proyeccion: Dict, batch_size: Optional[int] = None):
+        """Cursor de aggregate con los documentos ya en el formato de la respuesta"""
+        opciones = {"batchSize": batch_size} if batch_size else {}
+        return coleccion.aggregate([{"$match": filtro}, {"$sort": orden}, {"$project": proyeccion}], **opciones)
+    
+    def _clave_listado(self, coleccion: str, valor) -> str:
+        return f"{coleccion}:{self.LISTADOS_CACHEADOS[coleccion]}:{valor}"
+    
+    def _listado_cacheado(self, coleccion: str, valor, consulta, variante: str = '', version: Optional[int] = None):
+        """Retorna el listado desde la caché o lo consulta en MongoDB y lo guarda.
+
+        Las entradas se guardan por versión del listado: con la caché en
+        memoria una escritura en otro worker no invalida la de este, pero
+        incrementa la versión compartida y la entrada anterior deja de usarse.
+        """
+        if version is None:
+            version = self.version_listado(coleccion, valor)
+        if version is None:
+            # Sin versión no se puede saber si la entrada sigue vigente
+            return consulta()
+        clave = self._clave_listado(coleccion, valor)
+        variante = f"v{version}:{variante}"
+        resultado = self.cache.obtener(clave, variante)
+        if resultado is None:
+            resultado = consulta()
+            self.cache.guardar(clave, resultado, variante)
+        return resultado
+    
+    def _invalidar_listado(self, coleccion: str, *valores):
+        claves = [self._clave_listado(coleccion, valor) for valor in set(valores) if valor is not None]
+        for clave in claves:
+            self.cache.invalidar(clave)
+        self.versiones.incrementar(*claves)
+    
+    def version_listado(self, coleccion: str, valor) -> Optional[int]:
+        """Versión del listado de un curso o tema, para el ETag de su respuesta"""
+        return self.versiones.obtener(self._clave_listado(coleccion, valor))
+    
+    def _actualizar_documento(self, coleccion, filtro: Dict, cambios: Dict) -> bool:
+        """Aplica cambios a un documento e invalida el listado cacheado al que pertenece"""
+        campo = self.LISTADOS_CACHEADOS.get(coleccion.name)
+        if campo is None:
+            return coleccion.update_one(filtro, cambios).matched_count > 0
+        anterior = coleccion.find_one_and_update(filtro, cambios, projection={campo: 1})
+        if anterior is None:
+            return False
+        self._invalidar_listado(coleccion.name, anterior.get(campo), cambios.get("$set", {}).get(campo))
+        return True
     
     # MÉTODOS PARA TEMAS
     def insertar_tema(self, documento: Dict) -> str:
         try:
             resultado = self.temas_collection.insert_one(documento)
+            self._invalidar_listado("temas", documento.get("id_curso"))
             return str(resultado.inserted_id)
         except Exception as e:
             logger.error(f"Error al insertar tema: {e}")
             raise
     
-    def obtener_temas_por_curso(self, id_curso: str) -> List[Dict]:
+    def obtener_temas_por_curso(self, id_curso: str, version: Optional[int] = None) -> List[Dict]:
         try:
-            temas = list(self.temas_collection.find({
-                "id_curso": id_curso,
-                "estado": "activo"
-            }).sort("orden", 1))
-            return temas
+            return self._listado_cacheado("temas", id_curso, lambda: list(self._vista(
+                self.temas_collection, {"id_curso": id_curso, "estado": "activo"}, {"orden": 1}, self.VISTA_TEMA
+            )), version=version)
         except Exception as e:
             logger.error(f"Error al obtener temas: {e}")
             return []
@@ -75,22 +159,22 @@ class EducativoService:
     def actualizar_tema(self, tema_id: str, datos: Dict) -> bool:
         try:
             datos["fecha_modificacion"] = datetime.utcnow()
-            resultado = self.temas_collection.update_one(
+            return self._actualizar_documento(
+                self.temas_collection,
                 {"_id": ObjectId(tema_id)},
                 {"$set": datos}
             )
-            return resultado.modified_count > 0
         except Exception as e:
             logger.error(f"Error al actualizar tema: {e}")
             return False
     
     def eliminar_tema(self, tema_id: str) -> bool:
         try:
-            resultado = self.temas_collection.update_one(
+            return self._actualizar_documento(
+                self.temas_collection,
                 {"_id": ObjectId(tema_id)},
                 {"$set": {"estado": "eliminado", "fecha_eliminacion": datetime.utcnow()}}
             )
-            return resultado.modified_count > 0
         except Exception as e:
             logger.error(f"Error al eliminar tema: {e}")
             return False
@@ -99,18 +183,17 @@ class EducativoService:
     def insertar_publicacion(self, documento: Dict) -> str:
         try:
             resultado = self.publicaciones_collection.insert_one(documento)
+            self._invalidar_listado("publicaciones", documento.get("id_tema"))
             return str(resultado.inserted_id)
         except Exception as e:
             logger.error(f"Error al insertar publicación: {e}")
             raise
     
-    def obtener_publicaciones_por_tema(self, id_tema: str) -> List[Dict]:
+    def obtener_publicaciones_por_tema(self, id_tema: str, version: Optional[int] = None) -> List[Dict]:
         try:
-            publicaciones = list(self.publicaciones_collection.find({
-                "id_tema": id_tema,
-                "estado": "activo"
-            }).sort("fecha_creacion", -1))
-            return publicaciones
+            return self._listado_cacheado("publicaciones", id_tema, lambda: list(self._vista(
+                self.publicaciones_collection, {"id_tema": id_tema, "estado": "activo"}, {"fecha_creacion": -1}, self.VISTA_PUBLICACION
+            )), version=version)
         except Exception as e:
             logger.error(f"Error al obtener publicaciones: {e}")
             return []
@@ -118,22 +201,22 @@ class EducativoService:
     def actualizar_publicacion(self, publicacion_id: str, datos: Dict) -> bool:
         try:
             datos["fecha_modificacion"] = datetime.utcnow()
-            resultado = self.publicaciones_collection.update_one(
+            return self._actualizar_documento(
+                self.publicaciones_collection,
                 {"_id": ObjectId(publicacion_id)},
                 {"$set": datos}
             )
-            return resultado.modified_count > 0
         except Exception as e:
             logger.error(f"Error al actualizar publicación: {e}")
             return False
     
     def eliminar_publicacion(self, publicacion_id: str) -> bool:
         try:
-            resultado = self.publicaciones_collection.update_one(
+            return self._actualizar_documento(
+                self.publicaciones_collection,
                 {"_id": ObjectId(publicacion_id)},
                 {"$set": {"estado": "eliminado", "fecha_eliminacion": datetime.utcnow()}}
             )
-            return resultado.modified_count > 0
         except Exception as e:
             logger.error(f"Error al eliminar publicación: {e}")
             return False
@@ -142,18 +225,17 @@ class EducativoService:
     def insertar_tarea(self, documento: Dict) -> str:
         try:
             resultado = self.tareas_collection.insert_one(documento)
+            self._invalidar_listado("tareas", documento.get("id_tema"))
             return str(resultado.inserted_id)
         except Exception as e:
             logger.error(f"Error al insertar tarea: {e}")
             raise
     
-    def obtener_tareas_por_tema(self, id_tema: str) -> List[Dict]:
+    def obtener_tareas_por_tema(self, id_tema: str, version: Optional[int] = None) -> List[Dict]:
         try:
-            tareas = list(self.tareas_collection.find({
-                "id_tema": id_tema,
-                "estado": "activo"
-            }).sort("fecha_entrega", 1))
-            return tareas
+            return self._listado_cacheado("tareas", id_tema, lambda: list(self._vista(
+                self.tareas_collection, {"id_tema": id_tema, "estado": "activo"}, {"fecha_entrega": 1}, self.VISTA_TAREA
+            )), version=version)
         except Exception as e:
             logger.error(f"Error al obtener tareas: {e}")
             return []
@@ -161,22 +243,22 @@ class EducativoService:
     def actualizar_tarea(self, tarea_id: str, datos: Dict) -> bool:
         try:
             datos["fecha_modificacion"] = datetime.utcnow()
-            resultado = self.tareas_collection.update_one(
+            return self._actualizar_documento(
+                self.tareas_collection,
                 {"_id": ObjectId(tarea_id)},
                 {"$set": datos}
             )
-            return resultado.modified_count > 0
         except Exception as e:
             logger.error(f"Error al actualizar tarea: {e}")
             return False
     
     def eliminar_tarea(self, tarea_id: str) -> bool:
         try:
-            resultado = self.tareas_collection.update_one(
+            return self._actualizar_documento(
+                self.tareas_collection,
                 {"_id": ObjectId(tarea_id)},
                 {"$set": {"estado": "eliminado", "fecha_eliminacion": datetime.utcnow()}}
             )
-            return resultado.modified_count > 0
         except Exception as e:
             logger.error(f"Error al eliminar tarea: {e}")
             return False
@@ -190,15 +272,22 @@ class EducativoService:
             logger.error(f"Error al insertar entrega: {e}")
             raise
     
-    def obtener_entregas_por_tarea(self, id_tarea: str) -> List[Dict]:
+    def obtener_entregas_por_tarea(self, id_tarea: str, limite: Optional[int] = None,
+                                   cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
         try:
-            entregas = list(self.entregas_collection.find({
+            return Paginacion.paginar_vista(self.entregas_collection, {
                 "id_tarea": id_tarea
-            }).sort("fecha_entrega", -1))
-            return entregas
+            }, "fecha_entrega", -1, limite, cursor, self.VISTA_ENTREGA)
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Error al obtener entregas: {e}")
-            return []
+            return [], None
+    
+    def iterar_entregas_por_tarea(self, id_tarea: str, batch_size: int):
+        """Cursor sobre todas las entregas de una tarea, leído del servidor por lotes"""
+        return self._vista(self.entregas_collection, {"id_tarea": id_tarea},
+                           {"fecha_entrega": -1, "_id": -1}, self.VISTA_ENTREGA, batch_size)
     
     def obtener_entrega_estudiante(self, id_tarea: str, id_estudiante: str) -> Optional[Dict]:
         try:
@@ -227,41 +316,46 @@ class EducativoService:
     def insertar_anuncio(self, documento: Dict) -> str:
         try:
             resultado = self.anuncios_collection.insert_one(documento)
+            self._invalidar_listado("anuncios", documento.get("id_curso"))
             return str(resultado.inserted_id)
         except Exception as e:
             logger.error(f"Error al insertar anuncio: {e}")
             raise
     
-    def obtener_anuncios_por_curso(self, id_curso: str) -> List[Dict]:
+    def obtener_anuncios_por_curso(self, id_curso: str, limite: Optional[int] = None,
+                                   cursor: Optional[str] = None, version: Optional[int] = None) -> Tuple[List[Dict], Optional[str]]:
         try:
-            anuncios = list(self.anuncios_collection.find({
-                "id_curso": id_curso,
-                "estado": "activo"
-            }).sort("fecha_creacion", -1))
-            return anuncios
+            # Cada página es una variante del listado del curso
+            anuncios, siguiente = self._listado_cacheado("anuncios", id_curso, lambda: list(Paginacion.paginar_vista(
+                self.anuncios_collection, {"id_curso": id_curso, "estado": "activo"}, "fecha_creacion", -1, limite, cursor,
+                self.VISTA_ANUNCIO
+            )), f"{limite}:{cursor}", version)
+            return anuncios, siguiente
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Error al obtener anuncios: {e}")
-            return []
+            return [], None
     
     def actualizar_anuncio(self, anuncio_id: str, datos: Dict) -> bool:
         try:
             datos["fecha_modificacion"] = datetime.utcnow()
-            resultado = self.anuncios_collection.update_one(
+            return self._actualizar_documento(
+                self.anuncios_collection,
                 {"_id": ObjectId(anuncio_id)},
                 {"$set": datos}
             )
-            return resultado.modified_count > 0
         except Exception as e:
             logger.error(f"Error al actualizar anuncio: {e}")
             return False
     
     def eliminar_anuncio(self, anuncio_id: str) -> bool:
         try:
-            resultado = self.anuncios_collection.update_one(
+            return self._actualizar_documento(
+                self.anuncios_collection,
                 {"_id": ObjectId(anuncio_id)},
                 {"$set": {"estado": "eliminado", "fecha_eliminacion": datetime.utcnow()}}
             )
-            return resultado.modified_count > 0
         except Exception as e:
             logger.error(f"Error al eliminar anuncio: {e}")
             return False
@@ -272,47 +366,125 @@ class EducativoService:
             # Asegurar que el documento tenga todos los campos necesarios
             if 'mega_node_id' not in documento:
                 documento['mega_node_id'] = None
+            documento.update(BusquedaArchivos.campos_busqueda(documento.get('nombre_original')))
         
             resultado = self.archivos_collection.insert_one(documento)
+            self.uso.registrar(documento.get('usuario_id'), "educativo", documento.get('modulo_origen'),
+                               1, documento.get('peso'))
             return str(resultado.inserted_id)
         except Exception as e:
             logger.error(f"Error al insertar archivo educativo: {e}")
             raise
     
+    def _referencia_modulo(self, modulo_origen: str, referencia_id: str, usuario_id: Optional[str] = None):
+        """Colección y filtro del documento que guarda las referencias a los archivos de un módulo"""
+        if modulo_origen == "entrega":
+            return self.entregas_collection, {"id_tarea": referencia_id, "id_estudiante": usuario_id}
+        colecciones = {
+            "publicacion": self.publicaciones_collection,
+            "tarea": self.tareas_collection,
+            "anuncio": self.anuncios_collection
+        }
+        if modulo_origen not in colecciones:
+            raise ValueError(f"Módulo desconocido: {modulo_origen}")
+        return colecciones[modulo_origen], {"_id": ObjectId(referencia_id)}
+    
+    def _cambios_archivos(self, modulo_origen: str, cambios: Dict) -> Dict:
+        if modulo_origen == "entrega":
+            cambios["$set"] = {"fecha_modificacion": datetime.utcnow()}
+        return cambios
+    
+    def agregar_archivos(self, modulo_origen: str, referencia_id: str, archivos: List[Dict],
+                         usuario_id: Optional[str] = None) -> bool:
+        """Agrega referencias de archivos al documento del módulo con un solo $push; False si no existe"""
+        try:
+            coleccion, filtro = self._referencia_modulo(modulo_origen, referencia_id, usuario_id)
+            return self._actualizar_documento(
+                coleccion, filtro, self._cambios_archivos(modulo_origen, {"$push": {"archivos": {"$each": archivos}}})
+            )
+        except Exception as e:
+            logger.error(f"Error al agregar archivos a {modulo_origen}: {e}")
+            return False
+    
+    def quitar_archivo(self, modulo_origen: str, referencia_id: str, archivo_id: str,
+                       usuario_id: Optional[str] = None) -> bool:
+        """Quita la referencia a un archivo del documento del módulo con un solo $pull; False si no existe"""
+        try:
+            coleccion, filtro = self._referencia_modulo(modulo_origen, referencia_id, usuario_id)
+            return self._actualizar_documento(
+                coleccion, filtro, self._cambios_archivos(modulo_origen, {"$pull": {"archivos": {"archivo_id": archivo_id}}})
+            )
+        except Exception as e:
+            logger.error(f"Error al quitar archivo de {modulo_origen}: {e}")
+            return False
+    
     def obtener_archivos_por_modulo(self, modulo_origen: str, referencia_id: str) -> List[Dict]:
         try:
-            archivos = list(self.archivos_collection.find({
+            return list(self._vista(self.archivos_collection, {
                 "modulo_origen": modulo_origen,
                 "referencia_id": referencia_id
-            }).sort("fecha_subida", -1))
-            return archivos
+            }, {"fecha_subida": -1}, self.VISTA_ARCHIVO))
         except Exception as e:
             logger.error(f"Error al obtener archivos por módulo: {e}")
             return []
     
-    def obtener_archivos_por_usuario(self, usuario_id: str, tipo_usuario: str) -> List[Dict]:
+    def obtener_archivos_por_usuario(self, usuario_id: str, tipo_usuario: str, limite: Optional[int] = None,
+                                     cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
         try:
-            archivos = list(self.archivos_collection.find({
+            return Paginacion.paginar_vista(self.archivos_collection, {
                 "usuario_id": usuario_id,
                 "tipo_usuario": tipo_usuario
-            }).sort("fecha_subida", -1))
-            return archivos
+            }, "fecha_subida", -1, limite, cursor, self.VISTA_ARCHIVO)
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Error al obtener archivos por usuario: {e}")
-            return []
+            return [], None
+    
+    def listar_archivos(self, limite: Optional[int] = None,
+                        cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        try:
+            return Paginacion.paginar_vista(self.archivos_collection, {}, "fecha_subida", -1, limite, cursor,
+                                            self.VISTA_ARCHIVO_GENERAL)
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Error al listar archivos educativos: {e}")
+            return [], None
+    
+    def iterar_archivos(self, batch_size: int):
+        """Cursor sobre todos los archivos educativos, leído del servidor por lotes"""
+        return self._vista(self.archivos_collection, {}, {"fecha_subida": -1, "_id": -1},
+                           self.VISTA_ARCHIVO_GENERAL, batch_size)
+    
+    def buscar_archivos(self, termino_busqueda: str, usuario_id: Optional[str] = None, limite: Optional[int] = None,
+                        cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        try:
+            filtro = {"usuario_id": usuario_id} if usuario_id else {}
+            return BusquedaArchivos.buscar(
+                self.archivos_collection, filtro, termino_busqueda, "fecha_subida", limite, cursor,
+                self.VISTA_ARCHIVO_GENERAL
+            )
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Error al buscar archivos educativos: {e}")
+            return [], None
     
     def eliminar_archivo_educativo(self, archivo_id: str) -> bool:
         try:
-            resultado = self.archivos_collection.delete_one({"_id": ObjectId(archivo_id)})
-            return resultado.deleted_count > 0
+            anterior = self.archivos_collection.find_one_and_delete(
+                {"_id": ObjectId(archivo_id)},
+                projection={"usuario_id": 1, "modulo_origen": 1, "peso": 1}
+            )
+            if not anterior:
+                return False
+            self.uso.registrar(anterior.get('usuario_id'), "educativo", anterior.get('modulo_origen'),
+                               -1, -(anterior.get('peso') or 0))
+            return True
         except Exception as e:
             logger.error(f"Error al eliminar archivo educativo: {e}")
             return False
     
     def cerrar_conexion(self):
-        """Cierra la conexión a MongoDB"""
-        try:
-            self.client.close()
-            logger.info("Conexión educativa a MongoDB cerrada")
-        except Exception as e:
-            logger.error(f"Error al cerrar conexión educativa: {e}")
+        """Sin efecto, igual que MongoService.cerrar_conexion: el cliente lo comparten todos los servicios"""
@@ -0,0 +1,110 @@
+from typing import Dict, List, Optional
+import asyncio
+import logging
+from src.services.mongo_conexion import obtener_cliente_async
+from src.services.educativo_service import EducativoService
+from src.services.uso_service import UsoServiceAsync
+from src.services.cache_service import obtener_cache
+from src.utils.etag import VersionesListadosAsync
+from src.utils.busqueda import BusquedaArchivos
+
+logger = logging.getLogger(__name__)
+
+class EducativoServiceAsync:
+    """Variante de EducativoService para la aplicación ASGI.
+
+    Cubre el registro de los archivos subidos a publicaciones, tareas,
+    entregas y anuncios sobre un AsyncMongoClient. Invalida la misma caché
+    de listados y las mismas versiones de ETag que EducativoService, así que
+    los listados que atiende la aplicación WSGI ven los archivos nuevos.
+    """
+
+    BASE_DATOS = EducativoService.BASE_DATOS
+    LISTADOS_CACHEADOS = EducativoService.LISTADOS_CACHEADOS
+
+    # Sin E/S: se comparten con el servicio síncrono
+    _clave_listado = EducativoService._clave_listado
+    _referencia_modulo = EducativoService._referencia_modulo
+    _cambios_archivos = EducativoService._cambios_archivos
+
+    def __init__(self, mongo_uri: str):
+        self.mongo_uri = mongo_uri
+        self.cache = obtener_cache()
+
+    # El AsyncMongoClient se obtiene en cada uso dentro de una corrutina: el servicio
+    # se puede construir fuera del event loop (por ejemplo al calentar un worker)
+    @property
+    def db(self):
+        return obtener_cliente_async(self.mongo_uri)[self.BASE_DATOS]
+
+    @property
+    def publicaciones_collection(self):
+        return self.db.publicaciones
+
+    @property
+    def tareas_collection(self):
+        return self.db.tareas
+
+    @property
+    def entregas_collection(self):
+        return self.db.entregas
+
+    @property
+    def anuncios_collection(self):
+        return self.db.anuncios
+
+    @property
+    def archivos_collection(self):
+        return self.db.archivos
+
+    @property
+    def uso(self) -> UsoServiceAsync:
+        return UsoServiceAsync(self.db)
+
+    @property
+    def versiones(self) -> VersionesListadosAsync:
+        return VersionesListadosAsync(self.db)
+
+    async def _invalidar_listado(self, coleccion: str, *valores):
+        claves = [self._clave_listado(coleccion, valor) for valor in set(valores) if valor is not None]
+        for clave in claves:
+            # Con Redis la invalidación es una llamada de red bloqueante
+            await asyncio.to_thread(self.cache.invalidar, clave)
+        await self.versiones.incrementar(*claves)
+
+    async def _actualizar_documento(self, coleccion, filtro: Dict, cambios: Dict) -> bool:
+        """Aplica cambios a un documento e invalida el listado cacheado al que pertenece"""
+        campo = self.LISTADOS_CACHEADOS.get(coleccion.name)
+        if campo is None:
+            return (await coleccion.update_one(filtro, cambios)).matched_count > 0
+        anterior = await coleccion.find_one_and_update(filtro, cambios, projection={campo: 1})
+        if anterior is None:
+            return False
+        await self._invalidar_listado(coleccion.name, anterior.get(campo), cambios.get("$set", {}).get(campo))
+        return True
+
+    async def insertar_archivo_educativo(self, documento: Dict) -> str:
+        try:
+            if 'mega_node_id' not in documento:
+                documento['mega_node_id'] = None
+            documento.update(BusquedaArchivos.campos_busqueda(documento.get('nombre_original')))
+
+            resultado = await self.archivos_collection.insert_one(documento)
+            await self.uso.registrar(documento.get('usuario_id'), "educativo", documento.get('modulo_origen'),
+                                     1, documento.get('peso'))
+            return str(resultado.inserted_id)
+        except Exception as e:
+            logger.error(f"Error al insertar archivo educativo: {e}")
+            raise
+
+    async def agregar_archivos(self, modulo_origen: str, referencia_id: str, archivos: List[Dict],
+                               usuario_id: Optional[str] = None) -> bool:
+        """Agrega referencias de archivos al documento del módulo con un solo $push; False si no existe"""
+        try:
+            coleccion, filtro = self._referencia_modulo(modulo_origen, referencia_id, usuario_id)
+            return await self._actualizar_documento(
+                coleccion, filtro, self._cambios_archivos(modulo_origen, {"$push": {"archivos": {"$each": archivos}}})
+            )
+        except Exception as e:
+            logger.error(f"Error al agregar archivos a {modulo_origen}: {e}")
+            return False
@@ -0,0 +1,74 @@
+from bson import MinKey
+from dataclasses import dataclass
+from pymongo import ASCENDING
+from typing import Dict, List, Tuple
+
+@dataclass(frozen=True)
+class FormaConsulta:
+    """Forma de una consulta de un método de servicio: campos de igualdad, orden y rango.
+
+    El índice que la atiende se deriva con la regla ESR (igualdad, orden,
+    rango): primero los campos comparados por igualdad, luego los del orden
+    con su dirección y al final los filtrados por rango.
+    """
+    metodo: str
+    coleccion: str
+    igualdad: Tuple[str, ...] = ()
+    orden: Tuple[Tuple[str, int], ...] = ()
+    rango: Tuple[str, ...] = ()
+
+    def indice(self) -> List[Tuple[str, int]]:
+        """Claves del índice compuesto en orden ESR"""
+        claves = [(campo, ASCENDING) for campo in self.igualdad] + list(self.orden)
+        usados = {campo for campo, _ in claves}
+        return claves + [(campo, ASCENDING) for campo in self.rango if campo not in usados]
+
+    def consulta_ejemplo(self) -> Tuple[Dict, List[Tuple[str, int]]]:
+        """Filtro y orden con valores de ejemplo, para revisar el plan con explain()"""
+        filtro = {campo: "ejemplo" for campo in self.igualdad}
+        filtro.update({campo: {"$gt": MinKey()} for campo in self.rango})
+        return filtro, list(self.orden)
+
+def indices_de_formas(formas: List[FormaConsulta],
+                      adicionales: Dict[str, List[Tuple]] = None) -> Dict[str, List[Tuple]]:
+    """Índices {coleccion: [(claves, opciones)]} que atienden todas las formas.
+
+    Se omiten los índices que son prefijo de otro de la misma colección,
+    porque el más largo ya atiende las mismas consultas.
+    """
+    indices: Dict[str, List[Tuple]] = {coleccion: list(definiciones) for coleccion, definiciones in (adicionales or {}).items()}
+    for forma in formas:
+        definiciones = indices.setdefault(forma.coleccion, [])
+        claves = forma.indice()
+        if not any(existentes[:len(claves)] == claves for existentes, _ in definiciones):
+            definiciones[:] = [(existentes, opciones) for existentes, opciones in definiciones
+                               if opciones or claves[:len(existentes)] != existentes]
+            definiciones.append((claves, {}))
+    return indices
+
+def etapas_plan(plan) -> List[str]:
+    """Nombres de todas las etapas de un plan de explain()"""
+    etapas = []
+    if isinstance(plan, dict):
+        if 'stage' in plan:
+            etapas.append(plan['stage'])
+        for valor in plan.values():
+            etapas.extend(etapas_plan(valor))
+    elif isinstance(plan, list):
+        for valor in plan:
+            etapas.extend(etapas_plan(valor))
+    return etapas
+
+def verificar_planes(db, formas: List[FormaConsulta]) -> List[str]:
+    """Ejecuta explain() de cada forma y retorna las que recorren la colección u ordenan en memoria"""
+    problemas = []
+    for forma in formas:
+        filtro, orden = forma.consulta_ejemplo()
+        cursor = db[forma.coleccion].find(filtro)
+        if orden:
+            cursor = cursor.sort(orden)
+        plan = cursor.explain().get('queryPlanner', {}).get('winningPlan', {})
+        for etapa in ('COLLSCAN', 'SORT'):
+            if etapa in etapas_plan(plan):
+                problemas.append(f"{forma.metodo} ({forma.coleccion}): {etapa}")
+    return problemas
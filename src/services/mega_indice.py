@@ -0,0 +1,147 @@
+from typing import Dict, Optional
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class IndiceNodosMega:
+    """Índice en memoria del árbol de nodos de una cuenta MEGA.
+
+    Evita descargar y recorrer todo el árbol (get_files) en cada búsqueda de
+    carpeta: las carpetas se indexan por (handle padre, nombre) y por ruta
+    completa, y el índice se actualiza de forma incremental cuando el propio
+    servicio crea, mueve o elimina nodos. Pasado el TTL se recarga completo
+    para recoger cambios hechos fuera de este proceso.
+    """
+
+    TIPO_ARCHIVO = 0
+    TIPO_CARPETA = 1
+    TIPO_RAIZ = 2
+    TIPO_PAPELERA = 4
+
+    def __init__(self, ttl_segundos: int = 300):
+        self.ttl_segundos = ttl_segundos
+        self.bloqueo = threading.RLock()
+        # Serializa las actualizaciones que consultan a MEGA (recarga y creación de
+        # carpetas). Se toma antes de pedir una sesión del pool y nunca junto con
+        # `bloqueo`, que solo protege las estructuras en memoria.
+        self.actualizacion = threading.Lock()
+        self._nodos: Dict[str, Dict] = {}
+        self._carpetas: Dict[tuple, str] = {}
+        self._rutas: Dict[str, str] = {}
+        self._raiz: Optional[str] = None
+        self._papelera: Optional[str] = None
+        self._cargado_en: Optional[float] = None
+
+    @property
+    def raiz(self) -> Optional[str]:
+        return self._raiz
+
+    @property
+    def papelera(self) -> Optional[str]:
+        return self._papelera
+
+    def vigente(self) -> bool:
+        """Indica si el índice está cargado y dentro de su TTL"""
+        with self.bloqueo:
+            if self._cargado_en is None:
+                return False
+            return (time.monotonic() - self._cargado_en) < self.ttl_segundos
+
+    def invalidar(self):
+        """Fuerza una recarga completa en el próximo acceso"""
+        with self.bloqueo:
+            self._cargado_en = None
+
+    def cargar(self, archivos: Dict[str, Dict]):
+        """Reconstruye el índice a partir del resultado de get_files()"""
+        with self.bloqueo:
+            self._nodos = {}
+            self._carpetas = {}
+            self._rutas = {}
+            self._raiz = None
+            self._papelera = None
+
+            for handle, info in archivos.items():
+                tipo = info.get('t')
+                if tipo == self.TIPO_RAIZ:
+                    self._raiz = handle
+                elif tipo == self.TIPO_PAPELERA:
+                    self._papelera = handle
+                nombre = info['a'].get('n') if isinstance(info.get('a'), dict) else None
+                self.registrar_nodo(handle, info.get('p'), nombre, tipo, info)
+
+            self._cargado_en = time.monotonic()
+            logger.info(f"Índice de nodos MEGA cargado: {len(self._nodos)} nodos")
+
+    def registrar_nodo(self, handle: str, padre: Optional[str], nombre: Optional[str],
+                       tipo: int, datos: Optional[Dict] = None):
+        """Agrega o reemplaza un nodo en el índice"""
+        with self.bloqueo:
+            nodo = dict(datos) if datos else {}
+            nodo.update({'h': handle, 'p': padre, 'n': nombre, 't': tipo})
+            self._nodos[handle] = nodo
+            if tipo == self.TIPO_CARPETA and nombre:
+                self._carpetas.setdefault((padre, nombre), handle)
+
+    def obtener_nodo(self, handle: str) -> Optional[Dict]:
+        """Retorna la información indexada de un nodo"""
+        with self.bloqueo:
+            return self._nodos.get(handle)
+
+    def buscar_hijo(self, padre: Optional[str], nombre: str) -> Optional[str]:
+        """Busca una subcarpeta por (handle padre, nombre)"""
+        with self.bloqueo:
+            return self._carpetas.get((padre, nombre))
+
+    def buscar_carpeta(self, ruta: str) -> Optional[str]:
+        """Resuelve una ruta tipo /A/B/C al handle de la carpeta final"""
+        partes = [p for p in ruta.split('/') if p]
+        clave = '/' + '/'.join(partes)
+        with self.bloqueo:
+            if clave in self._rutas:
+                return self._rutas[clave]
+
+            carpeta_actual = self._raiz
+            for parte in partes:
+                carpeta_actual = self._carpetas.get((carpeta_actual, parte))
+                if carpeta_actual is None:
+                    return None
+
+            if partes:
+                self._rutas[clave] = carpeta_actual
+            return carpeta_actual
+
+    def mover_nodo(self, handle: str, nuevo_padre: str):
+        """Refleja en el índice el movimiento de un nodo (incluye enviarlo a la papelera)"""
+        with self.bloqueo:
+            nodo = self._nodos.get(handle)
+            if nodo is None:
+                return
+            if nodo['t'] == self.TIPO_CARPETA:
+                self._quitar_carpeta(nodo)
+                # Las rutas cacheadas de la carpeta y sus descendientes dejan de ser válidas
+                self._rutas = {}
+            nodo['p'] = nuevo_padre
+            if nodo['t'] == self.TIPO_CARPETA and nodo['n']:
+                self._carpetas.setdefault((nuevo_padre, nodo['n']), handle)
+
+    def eliminar_nodo(self, handle: str):
+        """Quita un nodo (y sus descendientes) del índice"""
+        with self.bloqueo:
+            pendientes = [handle]
+            while pendientes:
+                actual = pendientes.pop()
+                nodo = self._nodos.pop(actual, None)
+                if nodo is None:
+                    continue
+                if nodo['t'] == self.TIPO_CARPETA:
+                    self._quitar_carpeta(nodo)
+                    self._rutas = {}
+                    pendientes.extend(h for h, n in self._nodos.items() if n['p'] == actual)
+
+    def _quitar_carpeta(self, nodo: Dict):
+        clave = (nodo['p'], nodo['n'])
+        if self._carpetas.get(clave) == nodo['h']:
+            del self._carpetas[clave]
@@ -0,0 +1,132 @@
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+import logging
+import threading
+import time
+from src.config.settings import Config
+from src.services.mega_indice import IndiceNodosMega
+
+logger = logging.getLogger(__name__)
+
+# Código de la API de MEGA para una sesión inválida o vencida
+ESID = -15
+
+class PoolSesionesMega:
+    """Pool de sesiones autenticadas de MEGA compartido por todo el proceso.
+
+    El login (derivación de clave + descarga del árbol) se hace en un hilo de
+    fondo: los hilos de las peticiones solo esperan a que haya una sesión libre.
+    El mismo hilo renueva las sesiones libres cuando superan su tiempo de vida
+    y repone las que la API rechaza como vencidas. Todas las sesiones son de la
+    misma cuenta, así que comparten el índice de nodos.
+    """
+
+    _pools: Dict[str, 'PoolSesionesMega'] = {}
+    _bloqueo_registro = threading.Lock()
+
+    def __init__(self, email: str, password: str, tamano: Optional[int] = None,
+                 renovar_cada: Optional[int] = None):
+        self.email = email
+        self.password = password
+        self.tamano = max(1, tamano or Config.MEGA_POOL_SESIONES)
+        self.renovar_cada = renovar_cada or Config.MEGA_SESION_RENOVAR
+        self.indice = IndiceNodosMega(Config.MEGA_INDICE_TTL)
+        self._disponibles: List[Tuple['Mega', float]] = []
+        self._total = 0
+        self._condicion = threading.Condition()
+        self._despertar = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+        self._ultimo_error: Optional[Exception] = None
+
+    @classmethod
+    def obtener(cls, email: str, password: str) -> 'PoolSesionesMega':
+        """Retorna el pool del proceso para la cuenta, creándolo si no existe"""
+        with cls._bloqueo_registro:
+            pool = cls._pools.get(email)
+            if pool is None:
+                pool = cls(email, password)
+                cls._pools[email] = pool
+            return pool
+
+    @classmethod
+    def descartar_heredados(cls):
+        """Olvida los pools copiados del proceso padre: sus sesiones y su hilo no sobreviven a un fork"""
+        cls._bloqueo_registro = threading.Lock()
+        cls._pools = {}
+
+    def iniciar(self):
+        """Arranca en segundo plano el login de las sesiones (idempotente)"""
+        with self._condicion:
+            if self._hilo is None or not self._hilo.is_alive():
+                self._hilo = threading.Thread(target=self._mantener, name='pool-mega', daemon=True)
+                self._hilo.start()
+
+    @contextmanager
+    def sesion(self):
+        """Toma una sesión en uso exclusivo durante el bloque y la devuelve al salir"""
+        self.iniciar()
+        with self._condicion:
+            while not self._disponibles:
+                if not self._condicion.wait(timeout=Config.MEGA_POOL_ESPERA):
+                    raise TimeoutError(f"No hay sesiones de MEGA disponibles: {self._ultimo_error}")
+            cliente, creada_en = self._disponibles.pop()
+
+        # Ya hay una sesión abierta, así que mega.py está cargado
+        from mega.errors import RequestError
+        descartar = False
+        try:
+            yield cliente
+        except RequestError as e:
+            descartar = e.code == ESID
+            raise
+        finally:
+            with self._condicion:
+                if descartar:
+                    logger.warning("Sesión de MEGA vencida, se reemplazará")
+                    self._total -= 1
+                    self._despertar.set()
+                else:
+                    self._disponibles.append((cliente, creada_en))
+                    self._condicion.notify()
+
+    def _login(self) -> Tuple['Mega', float]:
+        # mega.py se importa con la primera sesión para no cargarlo al arrancar la aplicación
+        from mega import Mega
+        return Mega().login(self.email, self.password), time.monotonic()
+
+    def _mantener(self):
+        """Completa el pool y renueva proactivamente las sesiones libres próximas a vencer"""
+        while True:
+            try:
+                while self._total < self.tamano:
+                    sesion = self._login()
+                    with self._condicion:
+                        self._disponibles.append(sesion)
+                        self._total += 1
+                        self._ultimo_error = None
+                        self._condicion.notify()
+                    logger.info(f"Sesión de MEGA iniciada ({self._total}/{self.tamano})")
+
+                ahora = time.monotonic()
+                with self._condicion:
+                    vencidas = [s for s in self._disponibles if ahora - s[1] >= self.renovar_cada]
+                for vieja in vencidas:
+                    nueva = self._login()
+                    with self._condicion:
+                        if vieja in self._disponibles:
+                            self._disponibles.remove(vieja)
+                            self._disponibles.append(nueva)
+                            self._condicion.notify()
+                        else:
+                            # Se tomó mientras se renovaba; se renovará en la siguiente pasada
+                            continue
+                    logger.info("Sesión de MEGA renovada")
+                espera = Config.MEGA_POOL_REVISION
+            except Exception as e:
+                logger.error(f"Error al iniciar sesión en MEGA: {e}")
+                with self._condicion:
+                    self._ultimo_error = e
+                espera = Config.MEGA_POOL_REINTENTO
+
+            self._despertar.wait(timeout=espera)
+            self._despertar.clear()
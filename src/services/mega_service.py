@@ -1,142 +1,161 @@
-from mega import Mega
-from typing import Optional, Dict
+from typing import Optional, Dict, BinaryIO, Iterator, Tuple
 import logging
 import os
-import tempfile
+from src.config.settings import Config
+from src.services.mega_indice import IndiceNodosMega
+from src.services.mega_pool import PoolSesionesMega
+from src.services.mega_transferencia import CifradoSubida, abrir_descarga, completar_subida, enviar_fragmentos, iniciar_subida
 
 logger = logging.getLogger(__name__)
 
 class MegaService:
     def __init__(self, email: str, password: str):
-        self.mega = Mega()
         self.email = email
         self.password = password
-        self.m = None
-        self._login()
+        # Las sesiones y el índice de nodos se comparten entre todos los servicios del proceso
+        self.pool = PoolSesionesMega.obtener(email, password)
+        self.indice = self.pool.indice
+        self.pool.iniciar()
     
-    def _login(self):
-        """Inicia sesión en MEGA"""
-        try:
-            self.m = self.mega.login(self.email, self.password)
-            logger.info("Login exitoso en MEGA")
-        except Exception as e:
-            logger.error(f"Error al hacer login en MEGA: {e}")
-            raise
+    def _obtener_indice(self) -> IndiceNodosMega:
+        """Retorna el índice de nodos, recargándolo si venció su TTL"""
+        if not self.indice.vigente():
+            # Nunca se espera una sesión con indice.bloqueo tomado: quien sube un
+            # archivo tiene una sesión y necesita ese bloqueo para indexarlo
+            with self.indice.actualizacion:
+                if not self.indice.vigente():
+                    with self.pool.sesion() as m:
+                        archivos = m.get_files()
+                    self.indice.cargar(archivos)
+        return self.indice
+    
+    def _resolver_carpeta(self, ruta: str, crear: bool = False) -> Optional[str]:
+        """Obtiene el handle de la carpeta de la ruta, creando los tramos faltantes si se indica"""
+        indice = self._obtener_indice()
+        carpeta_id = indice.buscar_carpeta(ruta)
+        if carpeta_id or not crear:
+            return carpeta_id
+        
+        carpeta_actual = indice.raiz
+        for parte in [p for p in ruta.split('/') if p]:
+            hijo = indice.buscar_hijo(carpeta_actual, parte)
+            if hijo is None:
+                with indice.actualizacion:
+                    # Otra petición pudo haberla creado mientras se esperaba el bloqueo
+                    hijo = indice.buscar_hijo(carpeta_actual, parte)
+                    if hijo is None:
+                        # _mkdir crea un único nivel bajo el padre indicado; create_folder
+                        # vuelve a descargar el árbol completo por cada tramo
+                        with self.pool.sesion() as m:
+                            respuesta = m._mkdir(name=parte, parent_node_id=carpeta_actual)
+                        hijo = respuesta['f'][0]['h']
+                        indice.registrar_nodo(hijo, carpeta_actual, parte, IndiceNodosMega.TIPO_CARPETA)
+                        logger.info(f"Carpeta creada: {parte}")
+            carpeta_actual = hijo
+        return carpeta_actual
+    
+    @staticmethod
+    def obtener_handle(mega_node_data) -> Optional[str]:
+        """Extrae el handle de un mega_node_id guardado (string o respuesta de upload)"""
+        if isinstance(mega_node_data, str):
+            return mega_node_data
+        if isinstance(mega_node_data, dict):
+            return mega_node_data.get('f', [{}])[0].get('h')
+        return None
     
     def crear_carpeta(self, ruta: str) -> bool:
         """Crea una carpeta en MEGA si no existe"""
         try:
-            # Dividir la ruta en partes
-            partes = [p for p in ruta.split('/') if p]
-            carpeta_actual = None
-            
-            for parte in partes:
-                carpetas = self.m.get_files()
-                carpeta_encontrada = None
-                
-                # Buscar si la carpeta ya existe
-                for file_id, file_info in carpetas.items():
-                    if (file_info['a'] and 
-                        file_info['a'].get('n') == parte and 
-                        file_info['t'] == 1):  # t=1 indica carpeta
-                        if carpeta_actual is None or file_info['p'] == carpeta_actual:
-                            carpeta_encontrada = file_id
-                            break
-                
-                if carpeta_encontrada:
-                    carpeta_actual = carpeta_encontrada
-                else:
-                    # Crear la carpeta
-                    carpeta_actual = self.m.create_folder(parte, carpeta_actual)
-                    logger.info(f"Carpeta creada: {parte}")
-            
-            return True
+            return self._resolver_carpeta(ruta, crear=True) is not None
         except Exception as e:
             logger.error(f"Error al crear carpeta {ruta}: {e}")
+            self.indice.invalidar()
             return False
     
     def subir_archivo(self, archivo_path: str, carpeta_destino: str, nombre_archivo: str) -> Optional[Dict]:
-        """Sube un archivo a MEGA"""
+        """Sube un archivo local a MEGA"""
+        if not os.path.exists(archivo_path):
+            logger.error(f"Archivo no encontrado: {archivo_path}")
+            return None
+        
+        with open(archivo_path, 'rb') as archivo:
+            return self.subir_stream(archivo, os.path.getsize(archivo_path), carpeta_destino, nombre_archivo)
+    
+    def subir_stream(self, stream: BinaryIO, tamano: int, carpeta_destino: str, nombre_archivo: str) -> Optional[Dict]:
+        """Sube a MEGA el contenido de un stream sin escribirlo antes en disco"""
         try:
-            # Crear carpeta si no existe
-            self.crear_carpeta(carpeta_destino)
-            
-            # Encontrar la carpeta destino - CORREGIDO
-            carpetas = self.m.get_files()
-            carpeta_id = None
-            
-            # Dividir la ruta para encontrar la estructura completa
-            partes_ruta = [p for p in carpeta_destino.split('/') if p]
-            
-            # Buscar la carpeta siguiendo la estructura jerárquica
-            carpeta_actual = None
-            for i, parte in enumerate(partes_ruta):
-                for file_id, file_info in carpetas.items():
-                    if (file_info['a'] and 
-                        file_info['a'].get('n') == parte and 
-                        file_info['t'] == 1):  # t=1 indica carpeta
-                        # Verificar que esté en el nivel correcto de la jerarquía
-                        if (carpeta_actual is None and file_info.get('p') is None) or \
-                           (carpeta_actual is not None and file_info.get('p') == carpeta_actual):
-                            carpeta_actual = file_id
-                            if i == len(partes_ruta) - 1:  # Es la última carpeta
-                                carpeta_id = file_id
-                            break
-            
-            # Si no se encontró la carpeta, usar la última carpeta creada
-            if carpeta_id is None:
-                # Buscar la carpeta del usuario (última parte de la ruta)
-                usuario_id = partes_ruta[-1] if partes_ruta else None
-                if usuario_id:
-                    for file_id, file_info in carpetas.items():
-                        if (file_info['a'] and 
-                            file_info['a'].get('n') == usuario_id and 
-                            file_info['t'] == 1):
-                            carpeta_id = file_id
-                            break
+            # Crear carpeta si no existe y obtener su handle
+            carpeta_id = self._resolver_carpeta(carpeta_destino, crear=True)
             
             # Validaciones previas antes de subir
             if not carpeta_id:
                 logger.error(f"No se encontró carpeta destino válida para la ruta: {carpeta_destino}")
                 return None
 
-            if not os.path.exists(archivo_path):
-                logger.error(f"Archivo temporal no encontrado: {archivo_path}")
-                return None
-
             # Logs informativos antes de subir
             logger.info(f"Subiendo archivo a MEGA...")
-            logger.info(f"Ruta temporal del archivo: {archivo_path}")
             logger.info(f"ID de carpeta destino en MEGA: {carpeta_id}")
-            logger.info(f"Nombre del archivo a subir: {nombre_archivo}")
-
-            # Subir archivo
-            file_handle = self.m.upload(archivo_path, carpeta_id, nombre_archivo)
+            logger.info(f"Nombre del archivo a subir: {nombre_archivo} ({tamano} bytes)")
 
-            # Obtener link público
-            link = self.m.get_upload_link(file_handle)
+            # La sesión solo se toma para los comandos de la API ('u' y 'p'): mientras se
+            # envían los fragmentos queda libre para descargas, borrados y otras cargas
+            with self.pool.sesion() as m:
+                ul_url = iniciar_subida(m, tamano)
+            cifrado = CifradoSubida()
+            handle_subida = enviar_fragmentos(ul_url, stream, tamano, cifrado, Config.MEGA_HTTP_TIMEOUT)
+            with self.pool.sesion() as m:
+                file_handle = completar_subida(m, carpeta_id, cifrado, handle_subida, nombre_archivo)
+                nodo, link = self._procesar_subida(m, file_handle)
             
             logger.info(f"Archivo subido exitosamente: {nombre_archivo} en carpeta: {carpeta_destino}")
-            return {
-                "link": link,
-                "node_id": file_handle
-            }
+            return self._indexar_subida(file_handle, nodo, link, carpeta_id, nombre_archivo)
             
         except Exception as e:
             logger.error(f"Error al subir archivo: {e}")
+            # La carpeta indexada pudo haber sido borrada fuera de este proceso
+            self.indice.invalidar()
             return None
     
-    def descargar_archivo(self, node_id: str) -> Optional[str]:
-        """Descarga un archivo de MEGA y retorna la ruta temporal"""
+    def _procesar_subida(self, m, file_handle: Dict) -> Tuple[Dict, str]:
+        """Nodo con su clave descifrada y link público de un archivo recién subido, con la sesión m"""
+        nodo = m._process_file(dict(file_handle['f'][0]), {})
+        return nodo, m.get_upload_link(file_handle)
+    
+    def _indexar_subida(self, file_handle: Dict, nodo: Dict, link: str, carpeta_id: str, nombre_archivo: str) -> Dict:
+        """Registra el archivo subido en el índice; se llama con la sesión ya devuelta al pool"""
+        # Se indexa con su clave descifrada para poder descargarlo sin recargar el árbol
+        self.indice.registrar_nodo(
+            nodo['h'], carpeta_id, nombre_archivo, IndiceNodosMega.TIPO_ARCHIVO, nodo
+        )
+        return {
+            "link": link,
+            "node_id": file_handle
+        }
+    
+    def _obtener_nodo_archivo(self, node_id: str) -> Optional[Dict]:
+        """Obtiene el nodo indexado de un archivo con su clave de descifrado"""
+        nodo = self._obtener_indice().obtener_nodo(node_id)
+        if nodo is None or 'meta_mac' not in nodo:
+            # Subido por otro proceso después de la última carga del índice
+            self.indice.invalidar()
+            nodo = self._obtener_indice().obtener_nodo(node_id)
+        if nodo is None or 'meta_mac' not in nodo:
+            return None
+        return nodo
+    
+    def descargar_stream(self, mega_node_data) -> Optional[Tuple[int, Iterator[bytes]]]:
+        """Prepara la descarga de un archivo de MEGA como (tamaño, generador de fragmentos)"""
         try:
-            # Crear directorio temporal
-            temp_dir = tempfile.mkdtemp()
-            
-            # Descargar archivo
-            archivo_descargado = self.m.download(node_id, temp_dir)
+            node_id = self.obtener_handle(mega_node_data)
+            nodo = self._obtener_nodo_archivo(node_id) if node_id else None
+            if not nodo:
+                logger.error(f"Archivo no encontrado en MEGA: {node_id}")
+                return None
             
-            logger.info(f"Archivo descargado: {archivo_descargado}")
-            return archivo_descargado
+            with self.pool.sesion() as m:
+                tamano, fragmentos = abrir_descarga(m, nodo)
+            logger.info(f"Descargando archivo: {node_id} ({tamano} bytes)")
+            return tamano, fragmentos
             
         except Exception as e:
             logger.error(f"Error al descargar archivo: {e}")
@@ -145,7 +164,7 @@ class MegaService:
     def eliminar_archivo(self, node_id: str) -> bool:
         """Elimina un archivo de MEGA usando su node_id"""
         try:
-            self.m.delete(node_id)
+            self._enviar_a_papelera(node_id)
             logger.info(f"Archivo eliminado: {node_id}")
             return True
             
@@ -153,36 +172,30 @@ class MegaService:
             logger.error(f"Error al eliminar archivo: {e}")
             return False
     
+    def _enviar_a_papelera(self, node_id: str):
+        """Mueve un nodo a la papelera usando el handle indexado"""
+        indice = self._obtener_indice()
+        if indice.papelera:
+            # m.delete() resuelve la papelera con get_files() en cada llamada
+            with self.pool.sesion() as m:
+                m.move(node_id, indice.papelera)
+            indice.mover_nodo(node_id, indice.papelera)
+        else:
+            with self.pool.sesion() as m:
+                m.delete(node_id)
+            indice.invalidar()
+    
     def mover_archivo(self, node_id: str, nueva_ruta: str) -> bool:
         """Mueve un archivo a una nueva carpeta"""
         try:
             # Crear carpeta destino si no existe
-            self.crear_carpeta(nueva_ruta)
-            
-            # Encontrar la carpeta destino - CORREGIDO
-            carpetas = self.m.get_files()
-            carpeta_destino_id = None
-            
-            # Dividir la ruta para encontrar la estructura completa
-            partes_ruta = [p for p in nueva_ruta.split('/') if p]
-            
-            # Buscar la carpeta siguiendo la estructura jerárquica
-            carpeta_actual = None
-            for i, parte in enumerate(partes_ruta):
-                for file_id, file_info in carpetas.items():
-                    if (file_info['a'] and 
-                        file_info['a'].get('n') == parte and 
-                        file_info['t'] == 1):
-                        if (carpeta_actual is None and file_info.get('p') is None) or \
-                           (carpeta_actual is not None and file_info.get('p') == carpeta_actual):
-                            carpeta_actual = file_id
-                            if i == len(partes_ruta) - 1:
-                                carpeta_destino_id = file_id
-                            break
+            carpeta_destino_id = self._resolver_carpeta(nueva_ruta, crear=True)
             
             if carpeta_destino_id:
                 # Mover archivo
-                self.m.move(node_id, carpeta_destino_id)
+                with self.pool.sesion() as m:
+                    m.move(node_id, carpeta_destino_id)
+                self.indice.mover_nodo(node_id, carpeta_destino_id)
                 logger.info(f"Archivo movido a: {nueva_ruta}")
                 return True
             else:
@@ -191,6 +204,7 @@ class MegaService:
             
         except Exception as e:
             logger.error(f"Error al mover archivo: {e}")
+            self.indice.invalidar()
             return False
     
     def eliminar_carpeta_usuario(self, usuario_id: str) -> bool:
@@ -214,12 +228,10 @@ class MegaService:
     def _eliminar_carpeta_recursiva(self, ruta_carpeta: str):
         """Elimina una carpeta y todo su contenido"""
         try:
-            archivos = self.m.get_files()
-            
-            for file_id, file_info in archivos.items():
-                if (file_info['a'] and 
-                    ruta_carpeta in str(file_info.get('a', {}).get('n', ''))):
-                    self.m.delete(file_id)
+            # Al mover la carpeta a la papelera se va con todo su contenido
+            carpeta_id = self._resolver_carpeta(ruta_carpeta)
+            if carpeta_id:
+                self._enviar_a_papelera(carpeta_id)
                     
         except Exception as e:
             logger.error(f"Error al eliminar carpeta recursiva: {e}")
@@ -0,0 +1,78 @@
+from typing import Dict, Optional
+import asyncio
+import logging
+
+import httpx
+
+from src.config.settings import Config
+from src.services.mega_service import MegaService
+from src.services.mega_transferencia import CifradoSubida, completar_subida, iniciar_subida
+from src.services.mega_transferencia_async import LectorAsync, enviar_fragmentos
+
+logger = logging.getLogger(__name__)
+
+class MegaServiceAsync:
+    """Subidas a MEGA para la aplicación ASGI.
+
+    Reutiliza el pool de sesiones y el índice de nodos de MegaService, pero
+    solo toma una sesión para los comandos de la API ('u' al empezar y 'p'
+    al terminar, en un hilo); los fragmentos se envían con un cliente HTTP
+    asíncrono, así que miles de cargas lentas comparten las sesiones del
+    pool y un solo proceso.
+    """
+
+    def __init__(self, email: str, password: str):
+        self.mega_service = MegaService(email, password)
+        self.pool = self.mega_service.pool
+        self.indice = self.mega_service.indice
+        self._http: Optional[httpx.AsyncClient] = None
+
+    def _cliente_http(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(timeout=Config.MEGA_HTTP_TIMEOUT)
+        return self._http
+
+    def _en_sesion(self, funcion, *args):
+        with self.pool.sesion() as m:
+            return funcion(m, *args)
+
+    def _completar(self, carpeta_id: str, cifrado: CifradoSubida, handle_subida: str, nombre_archivo: str) -> Dict:
+        with self.pool.sesion() as m:
+            file_handle = completar_subida(m, carpeta_id, cifrado, handle_subida, nombre_archivo)
+            nodo, link = self.mega_service._procesar_subida(m, file_handle)
+        return self.mega_service._indexar_subida(file_handle, nodo, link, carpeta_id, nombre_archivo)
+
+    async def crear_carpeta(self, ruta: str) -> bool:
+        """Crea una carpeta en MEGA si no existe"""
+        return await asyncio.to_thread(self.mega_service.crear_carpeta, ruta)
+
+    async def subir_stream(self, leer: LectorAsync, tamano: int, carpeta_destino: str, nombre_archivo: str) -> Optional[Dict]:
+        """Sube a MEGA un archivo leído con `leer`; retorna lo mismo que MegaService.subir_stream"""
+        try:
+            carpeta_id = await asyncio.to_thread(self.mega_service._resolver_carpeta, carpeta_destino, True)
+            if not carpeta_id:
+                logger.error(f"No se encontró carpeta destino válida para la ruta: {carpeta_destino}")
+                return None
+
+            logger.info(f"Subiendo archivo a MEGA: {nombre_archivo} ({tamano} bytes) en carpeta {carpeta_id}")
+            ul_url = await asyncio.to_thread(self._en_sesion, iniciar_subida, tamano)
+            cifrado = CifradoSubida()
+            handle_subida = await enviar_fragmentos(
+                self._cliente_http(), ul_url, leer, tamano, cifrado, Config.MEGA_HTTP_TIMEOUT
+            )
+            resultado = await asyncio.to_thread(self._completar, carpeta_id, cifrado, handle_subida, nombre_archivo)
+
+            logger.info(f"Archivo subido exitosamente: {nombre_archivo} en carpeta: {carpeta_destino}")
+            return resultado
+
+        except Exception as e:
+            logger.error(f"Error al subir archivo: {e}")
+            # La carpeta indexada pudo haber sido borrada fuera de este proceso
+            self.indice.invalidar()
+            return None
+
+    async def cerrar(self):
+        """Cierra el cliente HTTP (al apagar la aplicación ASGI)"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
@@ -0,0 +1,156 @@
+from typing import Dict, BinaryIO, Iterator, Tuple
+import logging
+import secrets
+
+import requests
+from Crypto.Cipher import AES
+from Crypto.Util import Counter
+
+logger = logging.getLogger(__name__)
+
+BLOQUE_AES = 16
+
+def _mac_fragmento(k_str: bytes, iv_str: bytes, fragmento: bytes) -> bytes:
+    """CBC-MAC de un fragmento tal como lo calcula MEGA.
+
+    Equivale al bucle bloque a bloque de mega.py: el último bloque de un
+    cifrado CBC sobre el fragmento completo (rellenado con ceros).
+    """
+    relleno = (-len(fragmento)) % BLOQUE_AES
+    if relleno:
+        fragmento += b'\0' * relleno
+    return AES.new(k_str, AES.MODE_CBC, iv_str).encrypt(fragmento)[-BLOQUE_AES:]
+
+def _leer_fragmento(stream: BinaryIO, tamano: int) -> bytes:
+    """Lee exactamente `tamano` bytes del stream (o lo que quede si termina antes)"""
+    partes = []
+    restante = tamano
+    while restante > 0:
+        parte = stream.read(restante)
+        if not parte:
+            break
+        partes.append(parte)
+        restante -= len(parte)
+    return b''.join(partes)
+
+class CifradoSubida:
+    """Estado criptográfico de una subida a MEGA: clave, contador AES-CTR y CBC-MAC acumulado.
+
+    Los fragmentos deben cifrarse en orden (los de get_chunks()); al terminar,
+    nodo() arma la entrada del comando 'p' que registra el archivo.
+    """
+
+    def __init__(self):
+        from mega.crypto import a32_to_str
+        self.ul_key = [secrets.randbits(32) for _ in range(6)]
+        self.k_str = a32_to_str(self.ul_key[:4])
+        contador = Counter.new(128, initial_value=((self.ul_key[4] << 32) + self.ul_key[5]) << 64)
+        self.aes = AES.new(self.k_str, AES.MODE_CTR, counter=contador)
+        self.mac_encryptor = AES.new(self.k_str, AES.MODE_CBC, b'\0' * BLOQUE_AES)
+        self.iv_str = a32_to_str([self.ul_key[4], self.ul_key[5], self.ul_key[4], self.ul_key[5]])
+        self.mac_str = b'\0' * BLOQUE_AES
+
+    def cifrar(self, fragmento: bytes) -> bytes:
+        """Acumula el MAC del fragmento y lo retorna cifrado"""
+        self.mac_str = self.mac_encryptor.encrypt(_mac_fragmento(self.k_str, self.iv_str, fragmento))
+        return self.aes.encrypt(fragmento)
+
+    def nodo(self, handle_subida: str, nombre_archivo: str, master_key) -> Dict:
+        from mega.crypto import a32_to_base64, base64_url_encode, encrypt_attr, encrypt_key, str_to_a32
+        file_mac = str_to_a32(self.mac_str)
+        meta_mac = (file_mac[0] ^ file_mac[1], file_mac[2] ^ file_mac[3])
+
+        ul_key = self.ul_key
+        clave = [
+            ul_key[0] ^ ul_key[4], ul_key[1] ^ ul_key[5],
+            ul_key[2] ^ meta_mac[0], ul_key[3] ^ meta_mac[1],
+            ul_key[4], ul_key[5], meta_mac[0], meta_mac[1]
+        ]
+        return {
+            'h': handle_subida,
+            't': 0,
+            'a': base64_url_encode(encrypt_attr({'n': nombre_archivo}, ul_key[:4])),
+            'k': a32_to_base64(encrypt_key(clave, master_key))
+        }
+
+def iniciar_subida(cliente, tamano: int) -> str:
+    """Pide a MEGA la URL a la que se envían los fragmentos cifrados"""
+    return cliente._api_request({'a': 'u', 's': tamano})['p']
+
+def completar_subida(cliente, destino: str, cifrado: CifradoSubida, handle_subida: str, nombre_archivo: str) -> Dict:
+    """Registra el archivo subido en la carpeta destino; retorna la misma respuesta que Mega.upload()"""
+    return cliente._api_request({
+        'a': 'p',
+        't': destino,
+        'i': cliente.request_id,
+        'n': [cifrado.nodo(handle_subida, nombre_archivo, cliente.master_key)]
+    })
+
+def enviar_fragmentos(ul_url: str, stream: BinaryIO, tamano: int, cifrado: CifradoSubida, timeout: float) -> str:
+    """Cifra y envía a la URL de subida cada fragmento de un stream; retorna el handle de subida.
+
+    Replica la parte de Mega.upload() que ocupa casi todo el tiempo de una
+    carga sin exigir un archivo en disco ni una sesión de MEGA: la sesión solo
+    se necesita para iniciar_subida() y completar_subida(). En memoria solo
+    vive el fragmento en curso (máximo 1 MB).
+    """
+    # mega.py se importa en el primer uso para no cargarlo al arrancar la aplicación
+    from mega.crypto import get_chunks
+    if tamano <= 0:
+        return requests.post(f"{ul_url}/0", data=b'', timeout=timeout).text
+
+    handle_subida = None
+    for inicio, tamano_fragmento in get_chunks(tamano):
+        fragmento = _leer_fragmento(stream, tamano_fragmento)
+        if len(fragmento) != tamano_fragmento:
+            raise ValueError(f"El stream terminó en {inicio + len(fragmento)} de {tamano} bytes")
+
+        respuesta = requests.post(f"{ul_url}/{inicio}", data=cifrado.cifrar(fragmento), timeout=timeout)
+        handle_subida = respuesta.text
+        logger.debug(f"{inicio + tamano_fragmento} de {tamano} bytes subidos")
+    return handle_subida
+
+def abrir_descarga(cliente, nodo: Dict) -> Tuple[int, Iterator[bytes]]:
+    """Prepara la descarga de un archivo de MEGA como un generador de fragmentos descifrados.
+
+    `nodo` es un archivo procesado por get_files() (con 'h', 'k', 'iv' y 'meta_mac').
+    La petición a la API se hace antes de retornar para que los errores se
+    detecten antes de empezar a responder; el contenido se lee y descifra
+    fragmento a fragmento a medida que se consume el generador.
+    """
+    from mega.crypto import a32_to_str, get_chunks, str_to_a32
+    datos = cliente._api_request({'a': 'g', 'g': 1, 'n': nodo['h']})
+    if 'g' not in datos:
+        # RequestError de mega.py solo acepta códigos numéricos de la API
+        raise FileNotFoundError(f"El archivo {nodo['h']} ya no está disponible en MEGA")
+
+    tamano = datos['s']
+    respuesta = requests.get(datos['g'], stream=True, timeout=cliente.timeout)
+    respuesta.raise_for_status()
+
+    def generar() -> Iterator[bytes]:
+        try:
+            k_str = a32_to_str(nodo['k'])
+            iv = nodo['iv']
+            contador = Counter.new(128, initial_value=((iv[0] << 32) + iv[1]) << 64)
+            aes = AES.new(k_str, AES.MODE_CTR, counter=contador)
+            mac_encryptor = AES.new(k_str, AES.MODE_CBC, b'\0' * BLOQUE_AES)
+            iv_str = a32_to_str([iv[0], iv[1], iv[0], iv[1]])
+            mac_str = b'\0' * BLOQUE_AES
+
+            for inicio, tamano_fragmento in get_chunks(tamano):
+                fragmento = _leer_fragmento(respuesta.raw, tamano_fragmento)
+                if len(fragmento) != tamano_fragmento:
+                    raise ValueError(f"La descarga terminó en {inicio + len(fragmento)} de {tamano} bytes")
+                fragmento = aes.decrypt(fragmento)
+                mac_str = mac_encryptor.encrypt(_mac_fragmento(k_str, iv_str, fragmento))
+                yield fragmento
+
+            file_mac = str_to_a32(mac_str)
+            if tamano and (file_mac[0] ^ file_mac[1], file_mac[2] ^ file_mac[3]) != tuple(nodo['meta_mac']):
+                # Los bytes ya se enviaron: se corta la respuesta para que el cliente no la dé por válida
+                raise ValueError('Mismatched mac')
+        finally:
+            respuesta.close()
+
+    return tamano, generar()
@@ -0,0 +1,49 @@
+from typing import Awaitable, Callable
+import asyncio
+import logging
+
+import httpx
+
+from src.services.mega_transferencia import CifradoSubida
+
+logger = logging.getLogger(__name__)
+
+# Lee hasta n bytes del archivo subido (por ejemplo UploadFile.read de Starlette)
+LectorAsync = Callable[[int], Awaitable[bytes]]
+
+async def _leer_fragmento(leer: LectorAsync, tamano: int) -> bytes:
+    """Lee exactamente `tamano` bytes (o lo que quede si el archivo termina antes)"""
+    partes = []
+    restante = tamano
+    while restante > 0:
+        parte = await leer(restante)
+        if not parte:
+            break
+        partes.append(parte)
+        restante -= len(parte)
+    return b''.join(partes)
+
+async def enviar_fragmentos(http: httpx.AsyncClient, ul_url: str, leer: LectorAsync, tamano: int,
+                            cifrado: CifradoSubida, timeout: float) -> str:
+    """Cifra y envía a la URL de subida cada fragmento del archivo; retorna el handle de subida.
+
+    Variante de mega_transferencia.enviar_fragmentos() para el event loop:
+    mientras espera a la red atiende otras peticiones, y en memoria solo vive
+    el fragmento en curso.
+    """
+    from mega.crypto import get_chunks
+    if tamano <= 0:
+        return (await http.post(f"{ul_url}/0", content=b'', timeout=timeout)).text
+
+    handle_subida = None
+    for inicio, tamano_fragmento in get_chunks(tamano):
+        fragmento = await _leer_fragmento(leer, tamano_fragmento)
+        if len(fragmento) != tamano_fragmento:
+            raise ValueError(f"El archivo terminó en {inicio + len(fragmento)} de {tamano} bytes")
+
+        # Cifrar 1 MB con AES lleva algunos milisegundos: se hace fuera del event loop
+        datos = await asyncio.to_thread(cifrado.cifrar, fragmento)
+        respuesta = await http.post(f"{ul_url}/{inicio}", content=datos, timeout=timeout)
+        handle_subida = respuesta.text
+        logger.debug(f"{inicio + tamano_fragmento} de {tamano} bytes subidos")
+    return handle_subida
@@ -0,0 +1,40 @@
+from typing import Dict, List, Set, Tuple
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Colección donde cada base de datos registra las migraciones ya aplicadas
+COLECCION_MIGRACIONES = 'migraciones'
+
+_verificadas: Set[Tuple[str, int]] = set()
+_bloqueo = threading.Lock()
+
+def versiones_aplicadas(db) -> Set[int]:
+    """Versiones de migración registradas en la base de datos"""
+    return {doc['_id'] for doc in db[COLECCION_MIGRACIONES].find({}, {'_id': 1})}
+
+def crear_indices(db, indices: Dict[str, List[Tuple]]):
+    """Crea los índices declarados como {coleccion: [(claves, opciones), ...]}"""
+    for nombre_coleccion, definiciones in indices.items():
+        for claves, opciones in definiciones:
+            db[nombre_coleccion].create_index(claves, background=True, **opciones)
+
+def verificar_migracion(db, version: int, servicio: str) -> bool:
+    """Comprueba una vez por proceso que la migración de índices del servicio ya se aplicó"""
+    clave = (db.name, version)
+    with _bloqueo:
+        if clave in _verificadas:
+            return True
+    try:
+        aplicada = db[COLECCION_MIGRACIONES].find_one({'_id': version}, {'_id': 1}) is not None
+    except Exception as e:
+        logger.error(f"Error al verificar migraciones de {servicio}: {e}")
+        return False
+
+    if not aplicada:
+        logger.warning(f"{servicio}: falta la migración {version} de índices, ejecuta scripts/migrate.py")
+        return False
+    with _bloqueo:
+        _verificadas.add(clave)
+    return True
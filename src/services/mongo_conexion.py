@@ -0,0 +1,88 @@
+from pymongo import AsyncMongoClient, MongoClient
+from typing import Dict, Optional, Tuple
+import asyncio
+import logging
+import os
+import threading
+from src.config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+# Un MongoClient por proceso y destino: cada cliente ya mantiene su propio pool
+# de conexiones e hilos de monitoreo, así que se comparte entre todos los servicios.
+# El pid forma parte de la clave porque un cliente no se puede usar después de un fork.
+_clientes: Dict[Tuple, MongoClient] = {}
+_bloqueo = threading.Lock()
+# Los AsyncMongoClient quedan ligados al event loop en que se usan, así que
+# además del proceso se registran por loop (uno por worker de uvicorn).
+_clientes_async: Dict[Tuple, AsyncMongoClient] = {}
+
+def opciones_pool() -> Dict:
+    """Opciones de pool, timeouts y compresión tomadas de Config"""
+    opciones = {
+        'maxPoolSize': Config.MONGO_MAX_POOL_SIZE,
+        'minPoolSize': Config.MONGO_MIN_POOL_SIZE,
+        'maxIdleTimeMS': Config.MONGO_MAX_IDLE_TIME_MS,
+        'connectTimeoutMS': Config.MONGO_CONNECT_TIMEOUT_MS,
+        'serverSelectionTimeoutMS': Config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        'waitQueueTimeoutMS': Config.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    }
+    if Config.MONGO_SOCKET_TIMEOUT_MS:
+        opciones['socketTimeoutMS'] = Config.MONGO_SOCKET_TIMEOUT_MS
+    if Config.MONGO_COMPRESSORS:
+        opciones['compressors'] = Config.MONGO_COMPRESSORS
+    return opciones
+
+def obtener_cliente(host: Optional[str] = None, **parametros) -> MongoClient:
+    """Retorna el MongoClient compartido del proceso para el host/URI y parámetros dados"""
+    clave = (os.getpid(), host, tuple(sorted(parametros.items())))
+    with _bloqueo:
+        cliente = _clientes.get(clave)
+        if cliente is None:
+            cliente = MongoClient(host, **{**opciones_pool(), **parametros})
+            _clientes[clave] = cliente
+            logger.info(f"Cliente de MongoDB creado para el proceso {os.getpid()}")
+        return cliente
+
+def obtener_cliente_async(host: Optional[str] = None, **parametros) -> AsyncMongoClient:
+    """Retorna el AsyncMongoClient compartido del proceso y del event loop en curso"""
+    loop = asyncio.get_running_loop()
+    clave = (os.getpid(), id(loop), host, tuple(sorted(parametros.items())))
+    cliente = _clientes_async.get(clave)
+    if cliente is None:
+        # Sin await entre la búsqueda y el registro: en un loop no hay carreras
+        cliente = AsyncMongoClient(host, **{**opciones_pool(), **parametros})
+        _clientes_async[clave] = cliente
+        logger.info(f"Cliente asíncrono de MongoDB creado para el proceso {os.getpid()}")
+    return cliente
+
+async def cerrar_clientes_async():
+    """Cierra los clientes asíncronos del event loop en curso (al apagar la aplicación ASGI)"""
+    loop = asyncio.get_running_loop()
+    for clave in [clave for clave in _clientes_async if clave[:2] == (os.getpid(), id(loop))]:
+        await _clientes_async.pop(clave).close()
+
+def cerrar_clientes():
+    """Cierra todos los clientes del proceso (antes de un fork, para no heredarlos abiertos)"""
+    with _bloqueo:
+        clientes = list(_clientes.values())
+        _clientes.clear()
+    for cliente in clientes:
+        cliente.close()
+
+def descartar_clientes_heredados():
+    """Quita del registro los clientes de otro proceso sin usarlos (después de un fork)"""
+    pid = os.getpid()
+    with _bloqueo:
+        for clave in [clave for clave in _clientes if clave[0] != pid]:
+            del _clientes[clave]
+        for clave in [clave for clave in _clientes_async if clave[0] != pid]:
+            del _clientes_async[clave]
+
+def cerrar_cliente(cliente: MongoClient):
+    """Cierra un cliente compartido y lo quita del registro"""
+    with _bloqueo:
+        for clave, registrado in list(_clientes.items()):
+            if registrado is cliente:
+                del _clientes[clave]
+    cliente.close()
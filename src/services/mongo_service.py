@@ -1,41 +1,69 @@
-from pymongo import MongoClient, ASCENDING
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
 from bson import ObjectId
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
 from datetime import datetime
+from src.services.mongo_conexion import obtener_cliente
+from src.services.migraciones import verificar_migracion
+from src.services.formas_consulta import FormaConsulta, indices_de_formas
+from src.services.uso_service import UsoService
+from src.services.vistas_consulta import vista, fecha_iso
+from src.utils.paginacion import Paginacion
+from src.utils.busqueda import BusquedaArchivos
 
 logger = logging.getLogger(__name__)
 
 class MongoService:
+    BASE_DATOS = "microservice_content"
+    # Migración de scripts/migrate.py que crea INDICES
+    VERSION_INDICES = 11
+    # Consultas de los métodos del servicio; de ellas se derivan los índices compuestos
+    FORMAS_CONSULTA = [
+        FormaConsulta("obtener_archivos_usuario_carpeta", "archivos_subidos",
+                      igualdad=("usuario_id", "carpeta", "estado"), orden=(("fecha_subida", DESCENDING), ("_id", DESCENDING))),
+        FormaConsulta("verificar_archivo_existe", "archivos_subidos",
+                      igualdad=("usuario_id", "carpeta", "estado", "archivo.nombre")),
+        FormaConsulta("listar_archivos_activos", "archivos_subidos",
+                      igualdad=("estado",), orden=(("fecha_subida", DESCENDING), ("_id", DESCENDING))),
+        FormaConsulta("obtener_todos_archivos_usuario", "archivos_subidos",
+                      igualdad=("usuario_id", "estado"), orden=(("fecha_subida", DESCENDING),)),
+        FormaConsulta("obtener_carpeta_usuario", "carpetas_usuarios", igualdad=("usuario_id",)),
+    ]
+    INDICES = indices_de_formas(FORMAS_CONSULTA, {
+        "archivos_subidos": [
+            ([("archivo.mega_node_id", ASCENDING)], {}),
+            # Búsqueda por tokens del nombre
+            ([(BusquedaArchivos.CAMPO_TOKENS, ASCENDING), ("estado", ASCENDING)], {}),
+            ([("usuario_id", ASCENDING), (BusquedaArchivos.CAMPO_TOKENS, ASCENDING)], {}),
+        ],
+        "carpetas_usuarios": [
+            ([("usuario_id", ASCENDING)], {"unique": True}),
+        ],
+    })
+    # Forma de cada archivo en las respuestas de los listados, aplicada con $project
+    VISTA_ARCHIVO_CARPETA = vista(secureName="$archivo.nombre", originalName="$archivo.nombre",
+                                  contentType="$archivo.tipo", size="$archivo.peso", link="$archivo.link")
+    VISTA_ARCHIVO_GENERAL = vista(tipo_archivo={"$literal": "contenido"}, usuario_id=1, carpeta=1,
+                                  nombre="$archivo.nombre", tipo="$archivo.tipo", peso="$archivo.peso",
+                                  link="$archivo.link", fecha_subida=fecha_iso("fecha_subida"))
+    
     def __init__(self, mongo_uri: str):
-        self.client = MongoClient(mongo_uri)
-        self.db = self.client.microservice_content
+        self.client = obtener_cliente(mongo_uri)
+        self.db = self.client[self.BASE_DATOS]
         self.archivos_collection = self.db.archivos_subidos
         self.carpetas_collection = self.db.carpetas_usuarios
-        self._crear_indices()
-    
-    def _crear_indices(self):
-        """Crea índices para optimizar las consultas"""
-        try:
-            # Índices para archivos_subidos
-            self.archivos_collection.create_index([("usuario_id", ASCENDING)])
-            self.archivos_collection.create_index([("carpeta", ASCENDING)])
-            self.archivos_collection.create_index([("archivo.mega_node_id", ASCENDING)])
-            self.archivos_collection.create_index([("estado", ASCENDING)])
-            self.archivos_collection.create_index([("usuario_id", ASCENDING), ("carpeta", ASCENDING)])
-            
-            # Índices para carpetas_usuarios
-            self.carpetas_collection.create_index([("usuario_id", ASCENDING)], unique=True)
-            
-            logger.info("Índices de MongoDB creados exitosamente")
-        except Exception as e:
-            logger.error(f"Error al crear índices: {e}")
+        self.uso = UsoService(self.db)
+        verificar_migracion(self.db, self.VERSION_INDICES, "MongoService")
     
     def insertar_archivo(self, documento: Dict) -> str:
         """Inserta un nuevo archivo en la base de datos"""
         try:
+            documento.update(BusquedaArchivos.campos_busqueda(documento.get("archivo", {}).get("nombre")))
             resultado = self.archivos_collection.insert_one(documento)
             logger.info(f"Archivo insertado con ID: {resultado.inserted_id}")
+            if documento.get("estado", "activo") == "activo":
+                self.uso.registrar(documento.get("usuario_id"), "contenido", documento.get("carpeta"),
+                                   1, documento.get("archivo", {}).get("peso"))
             return str(resultado.inserted_id)
         except Exception as e:
             logger.error(f"Error al insertar archivo: {e}")
@@ -50,18 +78,40 @@ class MongoService:
             logger.error(f"Error al obtener archivo por ID: {e}")
             return None
     
-    def obtener_archivos_usuario_carpeta(self, usuario_id: str, carpeta: str) -> List[Dict]:
-        """Obtiene todos los archivos de un usuario en una carpeta específica"""
+    def obtener_archivos_usuario_carpeta(self, usuario_id: str, carpeta: str, limite: Optional[int] = None,
+                                         cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Obtiene una página de archivos de un usuario en una carpeta específica y el cursor de la siguiente"""
         try:
-            archivos = list(self.archivos_collection.find({
+            return Paginacion.paginar_vista(self.archivos_collection, {
                 "usuario_id": usuario_id,
                 "carpeta": carpeta,
                 "estado": "activo"
-            }).sort("fecha_subida", -1))
-            return archivos
+            }, "fecha_subida", -1, limite, cursor, self.VISTA_ARCHIVO_CARPETA)
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Error al obtener archivos del usuario: {e}")
-            return []
+            return [], None
+    
+    def listar_archivos_activos(self, limite: Optional[int] = None,
+                                cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Obtiene una página de todos los archivos activos y el cursor de la siguiente"""
+        try:
+            return Paginacion.paginar_vista(self.archivos_collection, {"estado": "activo"}, "fecha_subida", -1,
+                                            limite, cursor, self.VISTA_ARCHIVO_GENERAL)
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Error al listar archivos activos: {e}")
+            return [], None
+    
+    def iterar_archivos_activos(self, batch_size: int):
+        """Cursor sobre todos los archivos activos, leído del servidor por lotes"""
+        return self.archivos_collection.aggregate([
+            {"$match": {"estado": "activo"}},
+            {"$sort": {"fecha_subida": -1, "_id": -1}},
+            {"$project": self.VISTA_ARCHIVO_GENERAL}
+        ], batchSize=batch_size)
     
     def obtener_todos_archivos_usuario(self, usuario_id: str) -> List[Dict]:
         """Obtiene todos los archivos de un usuario (todas las carpetas)"""
@@ -97,20 +147,29 @@ class MongoService:
             logger.error(f"Error al actualizar archivo: {e}")
             return False
     
+    def _descontar_uso(self, anterior: Dict):
+        """Resta del uso del usuario un archivo que estaba activo"""
+        if anterior.get("estado") == "activo":
+            self.uso.registrar(anterior.get("usuario_id"), "contenido", anterior.get("carpeta"),
+                               -1, -(anterior.get("archivo", {}).get("peso") or 0))
+    
     def eliminar_archivo(self, archivo_id: str) -> bool:
         """Marca un archivo como eliminado (soft delete)"""
         try:
-            resultado = self.archivos_collection.update_one(
+            anterior = self.archivos_collection.find_one_and_update(
                 {"_id": ObjectId(archivo_id)},
                 {
                     "$set": {
                         "estado": "eliminado",
                         "fecha_eliminacion": datetime.utcnow()
                     }
-                }
+                },
+                projection={"usuario_id": 1, "carpeta": 1, "estado": 1, "archivo.peso": 1},
+                return_document=ReturnDocument.BEFORE
             )
             
-            if resultado.modified_count > 0:
+            if anterior:
+                self._descontar_uso(anterior)
                 logger.info(f"Archivo {archivo_id} marcado como eliminado")
                 return True
             else:
@@ -124,9 +183,13 @@ class MongoService:
     def eliminar_archivo_permanente(self, archivo_id: str) -> bool:
         """Elimina un archivo permanentemente de la base de datos"""
         try:
-            resultado = self.archivos_collection.delete_one({"_id": ObjectId(archivo_id)})
+            anterior = self.archivos_collection.find_one_and_delete(
+                {"_id": ObjectId(archivo_id)},
+                projection={"usuario_id": 1, "carpeta": 1, "estado": 1, "archivo.peso": 1}
+            )
             
-            if resultado.deleted_count > 0:
+            if anterior:
+                self._descontar_uso(anterior)
                 logger.info(f"Archivo {archivo_id} eliminado permanentemente")
                 return True
             else:
@@ -146,6 +209,9 @@ class MongoService:
             # Eliminar registro de carpetas del usuario
             resultado_carpetas = self.carpetas_collection.delete_one({"usuario_id": usuario_id})
             
+            # Eliminar contadores de uso del usuario
+            self.uso.eliminar(usuario_id)
+            
             logger.info(f"Eliminados {resultado_archivos.deleted_count} archivos y {resultado_carpetas.deleted_count} registro de carpetas para usuario {usuario_id}")
             return True
             
@@ -188,65 +254,35 @@ class MongoService:
     
     def obtener_estadisticas_usuario(self, usuario_id: str) -> Dict:
         """Obtiene estadísticas de archivos de un usuario"""
-        try:
-            pipeline = [
-                {"$match": {"usuario_id": usuario_id, "estado": "activo"}},
-                {
-                    "$group": {
-                        "_id": "$carpeta",
-                        "total_archivos": {"$sum": 1},
-                        "total_peso": {"$sum": "$archivo.peso"}
-                    }
-                }
-            ]
-            
-            resultados = list(self.archivos_collection.aggregate(pipeline))
-            
-            estadisticas = {
-                "usuario_id": usuario_id,
-                "carpetas": {},
-                "total_archivos": 0,
-                "total_peso": 0
-            }
-            
-            for resultado in resultados:
-                carpeta = resultado["_id"]
-                estadisticas["carpetas"][carpeta] = {
-                    "archivos": resultado["total_archivos"],
-                    "peso_bytes": resultado["total_peso"]
-                }
-                estadisticas["total_archivos"] += resultado["total_archivos"]
-                estadisticas["total_peso"] += resultado["total_peso"]
-            
-            return estadisticas
-            
-        except Exception as e:
-            logger.error(f"Error al obtener estadísticas del usuario: {e}")
+        uso = self.uso.obtener(usuario_id)
+        if not uso:
             return {}
+        return dict(uso["contenido"], usuario_id=usuario_id)
     
-    def buscar_archivos(self, usuario_id: str, termino_busqueda: str, carpeta: Optional[str] = None) -> List[Dict]:
-        """Busca archivos por nombre"""
+    def buscar_archivos(self, usuario_id: Optional[str], termino_busqueda: str, carpeta: Optional[str] = None,
+                        limite: Optional[int] = None, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Busca archivos por nombre y retorna una página de resultados ordenados por relevancia"""
         try:
-            filtro = {
-                "usuario_id": usuario_id,
-                "estado": "activo",
-                "archivo.nombre": {"$regex": termino_busqueda, "$options": "i"}
-            }
-            
+            filtro = {"estado": "activo"}
+            if usuario_id:
+                filtro["usuario_id"] = usuario_id
             if carpeta:
                 filtro["carpeta"] = carpeta
             
-            archivos = list(self.archivos_collection.find(filtro).sort("fecha_subida", -1))
-            return archivos
+            return BusquedaArchivos.buscar(
+                self.archivos_collection, filtro, termino_busqueda, "fecha_subida", limite, cursor,
+                self.VISTA_ARCHIVO_GENERAL
+            )
             
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Error al buscar archivos: {e}")
-            return []
+            return [], None
     
     def cerrar_conexion(self):
-        """Cierra la conexión a MongoDB"""
-        try:
-            self.client.close()
-            logger.info("Conexión a MongoDB cerrada")
-        except Exception as e:
-            logger.error(f"Error al cerrar conexión: {e}")
+        """No cierra nada: el MongoClient es compartido por todo el proceso.
+
+        Se conserva por compatibilidad; los clientes se cierran solo con
+        mongo_conexion.cerrar_clientes() al apagar o antes de un fork.
+        """
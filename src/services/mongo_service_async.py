@@ -0,0 +1,72 @@
+from typing import Dict, Optional
+import logging
+from src.services.mongo_conexion import obtener_cliente_async
+from src.services.mongo_service import MongoService
+from src.services.uso_service import UsoServiceAsync
+from src.utils.busqueda import BusquedaArchivos
+
+logger = logging.getLogger(__name__)
+
+class MongoServiceAsync:
+    """Variante de MongoService para la aplicación ASGI.
+
+    Cubre las operaciones de las cargas de archivos de contenido sobre un
+    AsyncMongoClient, de modo que una carga lenta no ocupa un hilo mientras
+    espera a MongoDB. Los índices los crea scripts/migrate.py y los verifica
+    MongoService, que sigue atendiendo el resto de las rutas.
+    """
+
+    BASE_DATOS = MongoService.BASE_DATOS
+
+    def __init__(self, mongo_uri: str):
+        self.mongo_uri = mongo_uri
+
+    # El AsyncMongoClient se obtiene en cada uso dentro de una corrutina: el servicio
+    # se puede construir fuera del event loop (por ejemplo al calentar un worker)
+    @property
+    def db(self):
+        return obtener_cliente_async(self.mongo_uri)[self.BASE_DATOS]
+
+    @property
+    def archivos_collection(self):
+        return self.db.archivos_subidos
+
+    @property
+    def carpetas_collection(self):
+        return self.db.carpetas_usuarios
+
+    @property
+    def uso(self) -> UsoServiceAsync:
+        return UsoServiceAsync(self.db)
+
+    async def insertar_archivo(self, documento: Dict) -> str:
+        """Inserta un nuevo archivo en la base de datos"""
+        try:
+            documento.update(BusquedaArchivos.campos_busqueda(documento.get("archivo", {}).get("nombre")))
+            resultado = await self.archivos_collection.insert_one(documento)
+            logger.info(f"Archivo insertado con ID: {resultado.inserted_id}")
+            if documento.get("estado", "activo") == "activo":
+                await self.uso.registrar(documento.get("usuario_id"), "contenido", documento.get("carpeta"),
+                                         1, documento.get("archivo", {}).get("peso"))
+            return str(resultado.inserted_id)
+        except Exception as e:
+            logger.error(f"Error al insertar archivo: {e}")
+            raise
+
+    async def crear_carpeta_usuario(self, documento: Dict) -> str:
+        """Crea el registro de carpetas para un usuario"""
+        try:
+            resultado = await self.carpetas_collection.insert_one(documento)
+            logger.info(f"Carpetas de usuario creadas con ID: {resultado.inserted_id}")
+            return str(resultado.inserted_id)
+        except Exception as e:
+            logger.error(f"Error al crear carpetas de usuario: {e}")
+            raise
+
+    async def obtener_carpeta_usuario(self, usuario_id: str) -> Optional[Dict]:
+        """Obtiene el registro de carpetas de un usuario"""
+        try:
+            return await self.carpetas_collection.find_one({"usuario_id": usuario_id})
+        except Exception as e:
+            logger.error(f"Error al obtener carpetas del usuario: {e}")
+            return None
@@ -0,0 +1,218 @@
+from pymongo import ReplaceOne
+from typing import Dict, List, Optional
+import logging
+from datetime import datetime
+from src.config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+class UsoService:
+    """Contadores de almacenamiento por usuario en la colección uso_usuarios.
+
+    Cada alta o baja de un archivo aplica un $inc atómico sobre el documento
+    del usuario (totales, por carpeta de contenido y por módulo educativo),
+    así que las estadísticas y la verificación de cuota son lecturas de un
+    solo documento. recalcular() reconstruye los contadores desde los
+    archivos si alguna vez se desincronizan.
+    """
+
+    COLECCION = "uso_usuarios"
+    COLECCION_CONTENIDO = "archivos_subidos"
+    COLECCION_EDUCATIVA = "archivos"
+    # Familia de archivos -> campo que agrupa sus contadores
+    FAMILIAS = {"contenido": "carpetas", "educativo": "por_modulo"}
+
+    def __init__(self, db):
+        self.db = db
+        self.uso_collection = db[self.COLECCION]
+
+    @staticmethod
+    def _clave(grupo: Optional[str]) -> str:
+        """Nombre de carpeta o módulo utilizable como campo de un $inc"""
+        return str(grupo or "sin_grupo").replace(".", "_").lstrip("$") or "sin_grupo"
+
+    @classmethod
+    def _cambios_registro(cls, familia: str, grupo: Optional[str], archivos: int, peso: Optional[int]) -> Dict:
+        """$inc que suma archivos y bytes a los totales, a la familia y a su carpeta o módulo"""
+        peso = peso or 0
+        prefijo = f"{familia}.{cls.FAMILIAS[familia]}.{cls._clave(grupo)}"
+        return {
+            "$inc": {
+                "total_archivos": archivos,
+                "total_peso": peso,
+                f"{familia}.total_archivos": archivos,
+                f"{familia}.total_peso": peso,
+                f"{prefijo}.archivos": archivos,
+                f"{prefijo}.peso_bytes": peso
+            },
+            "$currentDate": {"actualizado": True}
+        }
+
+    @staticmethod
+    def _dentro_de_cuota(documento: Optional[Dict], peso_nuevo: int) -> bool:
+        return (documento or {}).get("total_peso", 0) + (peso_nuevo or 0) <= Config.CUOTA_USUARIO_BYTES
+
+    def registrar(self, usuario_id: str, familia: str, grupo: Optional[str], archivos: int, peso: Optional[int]):
+        """Suma (o resta, con valores negativos) archivos y bytes a los contadores del usuario"""
+        if not usuario_id:
+            return
+        try:
+            self.uso_collection.update_one(
+                {"_id": usuario_id}, self._cambios_registro(familia, grupo, archivos, peso), upsert=True
+            )
+        except Exception as e:
+            # El archivo ya quedó registrado; recalcular() corrige la diferencia
+            logger.error(f"Error al actualizar uso del usuario {usuario_id}: {e}")
+
+    def obtener(self, usuario_id: str) -> Dict:
+        """Contadores del usuario con la misma forma que las estadísticas de archivos"""
+        try:
+            documento = self.uso_collection.find_one({"_id": usuario_id}) or {}
+        except Exception as e:
+            logger.error(f"Error al obtener uso del usuario {usuario_id}: {e}")
+            return {}
+
+        uso = {
+            "total_archivos": documento.get("total_archivos", 0),
+            "total_peso": documento.get("total_peso", 0)
+        }
+        for familia, agrupador in self.FAMILIAS.items():
+            contadores = documento.get(familia, {})
+            uso[familia] = {
+                agrupador: {
+                    grupo: valores for grupo, valores in contadores.get(agrupador, {}).items()
+                    if valores.get("archivos", 0) > 0
+                },
+                "total_archivos": contadores.get("total_archivos", 0),
+                "total_peso": contadores.get("total_peso", 0)
+            }
+        return uso
+
+    def verificar_cuota(self, usuario_id: str, peso_nuevo: int) -> bool:
+        """Indica si el usuario puede almacenar peso_nuevo bytes más sin superar su cuota"""
+        if Config.CUOTA_USUARIO_BYTES <= 0:
+            return True
+        try:
+            documento = self.uso_collection.find_one({"_id": usuario_id}, {"total_peso": 1})
+        except Exception as e:
+            logger.error(f"Error al verificar cuota del usuario {usuario_id}: {e}")
+            return True
+        return self._dentro_de_cuota(documento, peso_nuevo)
+
+    def eliminar(self, usuario_id: str):
+        """Elimina los contadores de un usuario"""
+        try:
+            self.uso_collection.delete_one({"_id": usuario_id})
+        except Exception as e:
+            logger.error(f"Error al eliminar uso del usuario {usuario_id}: {e}")
+
+    def _pipeline_recalculo(self, usuario_id: Optional[str]) -> List[Dict]:
+        filtro_usuario = {"usuario_id": usuario_id} if usuario_id else {}
+        return [
+            {"$match": {**filtro_usuario, "estado": "activo"}},
+            {"$project": {"_id": 0, "usuario_id": 1, "familia": "contenido", "grupo": "$carpeta", "peso": "$archivo.peso"}},
+            {
+                "$unionWith": {
+                    "coll": self.COLECCION_EDUCATIVA,
+                    "pipeline": [
+                        {"$match": filtro_usuario},
+                        {"$project": {"_id": 0, "usuario_id": 1, "familia": "educativo", "grupo": "$modulo_origen", "peso": "$peso"}}
+                    ]
+                }
+            },
+            {
+                "$group": {
+                    "_id": {"usuario_id": "$usuario_id", "familia": "$familia", "grupo": "$grupo"},
+                    "archivos": {"$sum": 1},
+                    "peso_bytes": {"$sum": {"$ifNull": ["$peso", 0]}}
+                }
+            },
+            {"$sort": {"_id.usuario_id": 1}}
+        ]
+
+    def recalcular(self, usuario_id: Optional[str] = None, tamano_lote: int = 500) -> int:
+        """Reconstruye los contadores desde los archivos (de un usuario o de todos) y retorna cuántos se escribieron.
+
+        Las altas o bajas concurrentes con el recálculo pueden perderse, así
+        que conviene ejecutarlo en momentos de poca carga.
+        """
+        inicio = datetime.utcnow()
+        escritos = 0
+        operaciones = []
+        documento = None
+
+        def cerrar(documento):
+            documento["actualizado"] = inicio
+            return ReplaceOne({"_id": documento["_id"]}, documento, upsert=True)
+
+        resultados = self.db[self.COLECCION_CONTENIDO].aggregate(self._pipeline_recalculo(usuario_id), allowDiskUse=True)
+        for resultado in resultados:
+            usuario, familia = resultado["_id"].get("usuario_id"), resultado["_id"]["familia"]
+            if not usuario:
+                continue
+            if documento is None or documento["_id"] != usuario:
+                if documento is not None:
+                    operaciones.append(cerrar(documento))
+                documento = {"_id": usuario, "total_archivos": 0, "total_peso": 0}
+                for nombre, agrupador in self.FAMILIAS.items():
+                    documento[nombre] = {agrupador: {}, "total_archivos": 0, "total_peso": 0}
+
+            grupo = self._clave(resultado["_id"].get("grupo"))
+            contadores = documento[familia]
+            acumulado = contadores[self.FAMILIAS[familia]].setdefault(grupo, {"archivos": 0, "peso_bytes": 0})
+            acumulado["archivos"] += resultado["archivos"]
+            acumulado["peso_bytes"] += resultado["peso_bytes"]
+            for destino in (contadores, documento):
+                destino["total_archivos"] += resultado["archivos"]
+                destino["total_peso"] += resultado["peso_bytes"]
+
+            if len(operaciones) >= tamano_lote:
+                escritos += len(operaciones)
+                self.uso_collection.bulk_write(operaciones, ordered=False)
+                operaciones = []
+
+        if documento is not None:
+            operaciones.append(cerrar(documento))
+        if operaciones:
+            escritos += len(operaciones)
+            self.uso_collection.bulk_write(operaciones, ordered=False)
+
+        # Contadores de usuarios que ya no tienen archivos
+        filtro_obsoletos = {"actualizado": {"$lt": inicio}}
+        if usuario_id:
+            filtro_obsoletos["_id"] = usuario_id
+        self.uso_collection.delete_many(filtro_obsoletos)
+        return escritos
+
+class UsoServiceAsync:
+    """Variante de UsoService para el event loop (AsyncMongoClient).
+
+    Solo incluye lo que usan las cargas: registrar un archivo y verificar la
+    cuota. Los contadores y la cuota son los mismos que los de UsoService.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.uso_collection = db[UsoService.COLECCION]
+
+    async def registrar(self, usuario_id: str, familia: str, grupo: Optional[str], archivos: int, peso: Optional[int]):
+        """Suma (o resta, con valores negativos) archivos y bytes a los contadores del usuario"""
+        if not usuario_id:
+            return
+        try:
+            await self.uso_collection.update_one(
+                {"_id": usuario_id}, UsoService._cambios_registro(familia, grupo, archivos, peso), upsert=True
+            )
+        except Exception as e:
+            logger.error(f"Error al actualizar uso del usuario {usuario_id}: {e}")
+
+    async def verificar_cuota(self, usuario_id: str, peso_nuevo: int) -> bool:
+        """Indica si el usuario puede almacenar peso_nuevo bytes más sin superar su cuota"""
+        if Config.CUOTA_USUARIO_BYTES <= 0:
+            return True
+        try:
+            documento = await self.uso_collection.find_one({"_id": usuario_id}, {"total_peso": 1})
+        except Exception as e:
+            logger.error(f"Error al verificar cuota del usuario {usuario_id}: {e}")
+            return True
+        return UsoService._dentro_de_cuota(documento, peso_nuevo)
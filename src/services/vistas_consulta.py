@@ -0,0 +1,20 @@
+from typing import Dict
+
+# Fechas en ISO 8601 con milisegundos (la precisión de las fechas BSON), en UTC
+FORMATO_FECHA = "%Y-%m-%dT%H:%M:%S.%L"
+
+def id_texto(campo: str = "_id") -> Dict:
+    """Expresión que convierte un ObjectId en texto dentro de MongoDB"""
+    return {"$toString": f"${campo}"}
+
+def fecha_iso(campo: str) -> Dict:
+    """Expresión que formatea una fecha como texto ISO 8601 dentro de MongoDB"""
+    return {"$dateToString": {"date": f"${campo}", "format": FORMATO_FECHA}}
+
+def con_defecto(campo: str, valor) -> Dict:
+    """Expresión con el valor del campo o el valor por defecto si no existe"""
+    return {"$ifNull": [f"${campo}", valor]}
+
+def vista(**campos) -> Dict:
+    """$project con los campos de la respuesta; _id se reemplaza por id en texto"""
+    return {"_id": 0, "id": id_texto(), **campos}
@@ -0,0 +1,69 @@
+import json
+import os
+import subprocess
+import sys
+from src.utils.perezoso import Perezoso
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Se ejecuta en un intérprete nuevo para ver el arranque en frío, sin módulos ya importados.
+# El tiempo de arranque lo mide src/scripts/benchmark_precarga.py (modo sin_precarga)
+ARRANQUE = """
+import json, sys
+from infra.routes.RoutesMain import crearApp
+app = crearApp()
+from src.services import mongo_conexion
+print(json.dumps({
+    "mega_importado": "mega" in sys.modules,
+    "clientes_mongo": len(mongo_conexion._clientes),
+    "rutas": sorted(regla.rule for regla in app.url_map.iter_rules()),
+}))
+"""
+
+def test_crear_app_sin_conexiones():
+    """crearApp no inicia sesiones de MEGA ni crea clientes de MongoDB"""
+    entorno = dict(os.environ, PYTHONPATH=os.pathsep.join([RAIZ, os.path.join(RAIZ, 'src')]),
+                   MEGA_EMAIL='', MEGA_PASSWORD='')
+    salida = subprocess.run([sys.executable, '-c', ARRANQUE], cwd=os.path.join(RAIZ, 'src'), env=entorno,
+                            capture_output=True, text=True, timeout=60)
+    assert salida.returncode == 0, salida.stderr
+    arranque = json.loads(salida.stdout.strip().splitlines()[-1])
+
+    assert not arranque["mega_importado"]
+    assert arranque["clientes_mongo"] == 0
+    assert '/apicontenido/v1/temas/obtener' in arranque["rutas"]
+    assert '/apicontenido/v1/modulo/listar' in arranque["rutas"]
+
+def test_perezoso_construye_una_vez():
+    construidos = []
+
+    class Controlador:
+        def __init__(self):
+            construidos.append(self)
+
+        def obtener(self, request):
+            return request
+
+    controlador = Perezoso(Controlador)
+    assert construidos == []
+    assert controlador.obtener('peticion') == 'peticion'
+    assert controlador.obtener('otra') == 'otra'
+    assert len(construidos) == 1
+
+def test_despues_de_fork_descarta_lo_heredado(monkeypatch):
+    """Un worker no reutiliza clientes, pools de MEGA ni controladores construidos por el maestro"""
+    from src.services import mongo_conexion
+    from src.services.ciclo_vida import despues_de_fork
+    from src.services.mega_pool import PoolSesionesMega
+
+    monkeypatch.setattr(mongo_conexion, '_clientes', {(-1, 'mongodb://maestro', ()): object()})
+    monkeypatch.setattr(PoolSesionesMega, '_pools', {'cuenta': object()})
+    controlador = Perezoso(object)
+    heredado = controlador._obtener()
+
+    despues_de_fork(calentar=False)
+
+    assert mongo_conexion._clientes == {}
+    assert PoolSesionesMega._pools == {}
+    assert not controlador._construido()
+    assert controlador._obtener() is not heredado
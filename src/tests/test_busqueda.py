@@ -0,0 +1,43 @@
+from datetime import datetime
+import pytest
+from bson import ObjectId
+from src.services.mongo_service import MongoService
+from src.utils.busqueda import BusquedaArchivos
+from src.utils.paginacion import Paginacion
+from src.tests.test_paginacion import ColeccionAgregada
+
+def test_campos_busqueda_normalizados():
+    """El nombre se indexa sin acentos ni mayúsculas, con los prefijos de cada palabra"""
+    campos = BusquedaArchivos.campos_busqueda("Guía_Álgebra-2024.PDF")
+
+    assert campos[BusquedaArchivos.CAMPO_PALABRAS] == ["2024", "algebra", "guia", "pdf"]
+    tokens = campos[BusquedaArchivos.CAMPO_TOKENS]
+    assert {"gu", "gui", "guia", "al", "alge", "algebra", "20", "2024", "pd", "pdf"} <= set(tokens)
+    assert "a" not in tokens
+
+def test_tokens_consulta():
+    """El término se normaliza igual que los nombres y descarta palabras de un carácter"""
+    assert BusquedaArchivos.tokens_consulta("  ÁLGE y guía ") == ["alge", "guia"]
+
+    with pytest.raises(ValueError):
+        BusquedaArchivos.tokens_consulta("a .")
+
+def test_buscar_con_vista_de_los_listados():
+    """Con la vista de los listados los resultados salen de MongoDB con su forma y el cursor sigue la relevancia"""
+    fecha, ultimo_id = datetime(2024, 5, 1, 12, 30), ObjectId()
+    coleccion = ColeccionAgregada([
+        {'id': 'a', 'fecha_subida': '2024-05-02T08:00:00.000', '_posicion': [2, datetime(2024, 5, 2, 8), ObjectId()]},
+        {'id': 'b', 'fecha_subida': '2024-05-01T12:30:00.000', '_posicion': [1, fecha, ultimo_id]},
+        {'id': 'c', 'fecha_subida': '2024-04-30T10:00:00.000', '_posicion': [1, datetime(2024, 4, 30, 10), ObjectId()]},
+    ])
+    vista = MongoService.VISTA_ARCHIVO_GENERAL
+
+    documentos, siguiente = BusquedaArchivos.buscar(coleccion, {}, "guia", "fecha_subida", 2, vista=vista)
+
+    assert [documento['id'] for documento in documentos] == ['a', 'b']
+    assert all('_posicion' not in documento for documento in documentos)
+    assert Paginacion.decodificar_cursor(siguiente) == [1, fecha, ultimo_id]
+    assert coleccion.pipeline[-1]['$project'] == {**vista, '_posicion': 1}
+    assert coleccion.pipeline[-1]['$project']['fecha_subida'] == {
+        "$dateToString": {"date": "$fecha_subida", "format": "%Y-%m-%dT%H:%M:%S.%L"}
+    }
@@ -0,0 +1,93 @@
+from unittest import mock
+from src.services.cache_service import CacheLRU, CacheRedis
+
+def test_lru_variantes_e_invalidacion():
+    """Invalidar una clave descarta todas sus variantes y las copias no alteran la caché"""
+    cache = CacheLRU(maximo=4, ttl=60)
+    cache.guardar("anuncios:id_curso:c1", [{"titulo": "a"}], "10:None")
+    cache.guardar("anuncios:id_curso:c1", [{"titulo": "b"}], "10:xyz")
+
+    copia = cache.obtener("anuncios:id_curso:c1", "10:None")
+    copia.append({"titulo": "modificado"})
+    assert cache.obtener("anuncios:id_curso:c1", "10:None") == [{"titulo": "a"}]
+
+    cache.invalidar("anuncios:id_curso:c1")
+    assert cache.obtener("anuncios:id_curso:c1", "10:None") is None
+    assert cache.obtener("anuncios:id_curso:c1", "10:xyz") is None
+
+def test_lru_expira_y_descarta_el_menos_usado():
+    cache = CacheLRU(maximo=2, ttl=60)
+    cache.guardar("a", 1)
+    cache.guardar("b", 2)
+    cache.obtener("a")
+    cache.guardar("c", 3)
+    assert cache.obtener("b") is None
+    assert cache.obtener("a") == 1
+
+    with mock.patch("src.services.cache_service.time.monotonic", return_value=10 ** 9):
+        assert cache.obtener("a") is None
+
+class RedisFalso:
+    def __init__(self):
+        self.datos = {}
+
+    def hget(self, clave, campo):
+        return self.datos.get(clave, {}).get(campo)
+
+    def hset(self, clave, campo, valor):
+        self.datos.setdefault(clave, {})[campo] = valor
+
+    def expire(self, clave, segundos):
+        pass
+
+    def delete(self, clave):
+        self.datos.pop(clave, None)
+
+def test_redis_conserva_tipos_bson():
+    from bson import ObjectId
+    cache = CacheRedis(RedisFalso(), ttl=60)
+    identificador = ObjectId()
+    cache.guardar("temas:id_curso:c1", [{"_id": identificador}])
+    assert cache.obtener("temas:id_curso:c1") == [{"_id": identificador}]
+    cache.invalidar("temas:id_curso:c1")
+    assert cache.obtener("temas:id_curso:c1") is None
+
+class VersionesFalsas:
+    """Contadores compartidos por los workers, como la colección versiones_listados"""
+
+    def __init__(self):
+        self.versiones = {}
+
+    def incrementar(self, *claves):
+        for clave in claves:
+            self.versiones[clave] = self.versiones.get(clave, 0) + 1
+
+    def obtener(self, clave):
+        return self.versiones.get(clave, 0)
+
+def test_escritura_en_otro_worker_no_deja_listado_viejo():
+    """Con caché en memoria por worker, la versión compartida descarta la copia del otro worker"""
+    from src.services.educativo_service import EducativoService
+    versiones = VersionesFalsas()
+    temas = ["t1"]
+    workers = []
+    for _ in range(2):
+        servicio = EducativoService.__new__(EducativoService)
+        servicio.cache = CacheLRU(maximo=10, ttl=60)
+        servicio.versiones = versiones
+        workers.append(servicio)
+    a, b = workers
+
+    def listar(servicio):
+        version = servicio.version_listado("temas", "c1")
+        return version, servicio._listado_cacheado("temas", "c1", lambda: list(temas), version=version)
+
+    assert listar(a) == (0, ["t1"])
+    assert listar(b) == (0, ["t1"])
+
+    # Escritura atendida por el worker A: solo su caché se invalida
+    temas.append("t2")
+    a._invalidar_listado("temas", "c1")
+
+    assert listar(b) == (1, ["t1", "t2"])
+    assert listar(a) == (1, ["t1", "t2"])
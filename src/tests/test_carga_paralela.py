@@ -0,0 +1,68 @@
+import asyncio
+import threading
+import time
+from src.services.carga_paralela import MotorCargaParalela, ErrorCarga
+
+class _Archivo:
+    def __init__(self, filename):
+        self.filename = filename
+
+def test_resultados_y_errores_en_orden():
+    """Los archivos se reportan en el orden de la petición aunque terminen desordenados"""
+    archivos = [_Archivo(n) for n in ['a.pdf', 'b.exe', '', 'c.pdf', 'd.pdf']]
+
+    def procesar(archivo):
+        if archivo.filename == '':
+            return None
+        if archivo.filename.endswith('.exe'):
+            raise ErrorCarga(f"Archivo {archivo.filename}: tipo no permitido")
+        if archivo.filename == 'c.pdf':
+            raise RuntimeError("sin conexión")
+        time.sleep(0.05 if archivo.filename == 'a.pdf' else 0)
+        return {"nombre": archivo.filename}
+
+    subidos, errores = MotorCargaParalela(max_workers=4).subir(archivos, procesar)
+
+    assert subidos == [{"nombre": "a.pdf"}, {"nombre": "d.pdf"}]
+    assert errores == ["Archivo b.exe: tipo no permitido", "Error al procesar c.pdf: sin conexión"]
+
+def test_limite_de_paralelismo():
+    """Nunca hay más archivos en proceso que el límite configurado"""
+    activos = []
+    maximo = [0]
+    bloqueo = threading.Lock()
+
+    def procesar(archivo):
+        with bloqueo:
+            activos.append(archivo)
+            maximo[0] = max(maximo[0], len(activos))
+        time.sleep(0.02)
+        with bloqueo:
+            activos.remove(archivo)
+        return {"nombre": archivo.filename}
+
+    subidos, errores = MotorCargaParalela(max_workers=3).subir([_Archivo(f"{i}.pdf") for i in range(10)], procesar)
+
+    assert len(subidos) == 10 and not errores
+    assert 1 < maximo[0] <= 3
+
+def test_subir_async_en_orden_y_con_limite():
+    """La variante asíncrona reporta en orden y respeta el límite de archivos simultáneos"""
+    activos = []
+    maximo = [0]
+
+    async def procesar(archivo):
+        if archivo.filename.endswith('.exe'):
+            raise ErrorCarga(f"Archivo {archivo.filename}: tipo no permitido")
+        activos.append(archivo)
+        maximo[0] = max(maximo[0], len(activos))
+        await asyncio.sleep(0.02 if archivo.filename == '0.pdf' else 0.01)
+        activos.remove(archivo)
+        return {"nombre": archivo.filename}
+
+    archivos = [_Archivo(f"{i}.pdf") for i in range(6)] + [_Archivo('x.exe')]
+    subidos, errores = asyncio.run(MotorCargaParalela(max_workers=3).subir_async(archivos, procesar))
+
+    assert subidos == [{"nombre": f"{i}.pdf"} for i in range(6)]
+    assert errores == ["Archivo x.exe: tipo no permitido"]
+    assert maximo[0] == 3
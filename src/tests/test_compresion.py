@@ -0,0 +1,45 @@
+import gzip
+from flask import Flask, Response, jsonify
+from src.utils.compresion import CompresionRespuestas
+from src.utils.etag import ETagListado
+
+def crear_app():
+    app = Flask(__name__)
+    CompresionRespuestas(app)
+
+    @app.route('/listar')
+    def listar():
+        if ETagListado.vigente(1):
+            return ETagListado.no_modificado(1)
+        return ETagListado.etiquetar(jsonify({"archivos": [{"nombre": f"archivo_{i}.pdf"} for i in range(200)]}), 1)
+
+    @app.route('/pequeno')
+    def pequeno():
+        return jsonify({"ok": True})
+
+    @app.route('/descargar')
+    def descargar():
+        return Response((b"x" * 4096 for _ in range(2)), mimetype='application/json')
+
+    return app
+
+def test_listado_grande_con_gzip():
+    """Un listado por encima del mínimo se comprime y su ETag pasa a ser débil"""
+    cliente = crear_app().test_client()
+    respuesta = cliente.get('/listar', headers={"Accept-Encoding": "gzip"})
+
+    assert respuesta.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in respuesta.headers["Vary"]
+    assert respuesta.headers["ETag"].startswith('W/"1-')
+    assert gzip.decompress(respuesta.data).startswith(b'{"archivos"')
+
+    repetida = cliente.get('/listar', headers={"Accept-Encoding": "gzip", "If-None-Match": respuesta.headers["ETag"]})
+    assert repetida.status_code == 304
+
+def test_sin_compresion():
+    """No se comprimen respuestas pequeñas, transmitidas ni para clientes sin Accept-Encoding"""
+    cliente = crear_app().test_client()
+
+    assert "Content-Encoding" not in cliente.get('/pequeno', headers={"Accept-Encoding": "gzip"}).headers
+    assert "Content-Encoding" not in cliente.get('/descargar', headers={"Accept-Encoding": "gzip"}).headers
+    assert "Content-Encoding" not in cliente.get('/listar').headers
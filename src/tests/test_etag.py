@@ -0,0 +1,49 @@
+from flask import Flask, jsonify, request
+from src.utils.etag import ETagListado
+
+def crear_app(versiones, consultas):
+    app = Flask(__name__)
+
+    @app.route('/temas/obtener', methods=['POST'])
+    def obtener_temas():
+        id_curso = request.get_json()['id_curso']
+        version = versiones.get(id_curso, 0)
+        if ETagListado.vigente(version):
+            return ETagListado.no_modificado(version)
+        consultas.append(id_curso)
+        return ETagListado.etiquetar((jsonify({"id_curso": id_curso}), 200), version)
+
+    return app
+
+def test_sin_cambios_responde_304_sin_consultar():
+    """Un If-None-Match con la versión vigente se responde antes de consultar el listado"""
+    versiones, consultas = {"c1": 3}, []
+    cliente = crear_app(versiones, consultas).test_client()
+
+    primera = cliente.post('/temas/obtener', json={"id_curso": "c1"})
+    assert primera.status_code == 200 and primera.headers["ETag"]
+
+    repetida = cliente.post('/temas/obtener', json={"id_curso": "c1"},
+                            headers={"If-None-Match": primera.headers["ETag"]})
+    assert repetida.status_code == 304
+    assert repetida.headers["ETag"] == primera.headers["ETag"]
+    assert consultas == ["c1"]
+
+def test_escritura_u_otros_parametros_cambian_el_etag():
+    versiones, consultas = {"c1": 3}, []
+    cliente = crear_app(versiones, consultas).test_client()
+    etag = cliente.post('/temas/obtener', json={"id_curso": "c1"}).headers["ETag"]
+
+    otro_curso = cliente.post('/temas/obtener', json={"id_curso": "c2"}, headers={"If-None-Match": etag})
+    assert otro_curso.status_code == 200 and otro_curso.headers["ETag"] != etag
+
+    versiones["c1"] = 4
+    modificado = cliente.post('/temas/obtener', json={"id_curso": "c1"}, headers={"If-None-Match": etag})
+    assert modificado.status_code == 200 and modificado.headers["ETag"] != etag
+
+def test_sin_version_no_se_etiqueta():
+    """Si no se pudo leer la versión la respuesta sale completa y sin ETag"""
+    app = Flask(__name__)
+    with app.test_request_context('/modulo/listar', headers={"If-None-Match": "*"}):
+        assert not ETagListado.vigente(None)
+        assert "ETag" not in ETagListado.etiquetar(jsonify({}), None).headers
@@ -0,0 +1,19 @@
+from io import BytesIO
+from flask import Flask, request
+from src.utils.file_utils import SolicitudConSpool
+
+def test_archivo_bajo_umbral_queda_en_memoria():
+    """Los archivos por debajo de UPLOAD_SPOOL_MAX_BYTES no se escriben en disco"""
+    app = Flask(__name__)
+    app.request_class = SolicitudConSpool
+    app.config['UPLOAD_SPOOL_MAX_BYTES'] = 2 * 1024 * 1024
+    contenido = b'x' * (1024 * 1024)
+
+    with app.test_request_context('/', method='POST', data={'archivo': (BytesIO(contenido), 'a.pdf')}):
+        stream = request.files['archivo'].stream
+        assert not stream._rolled
+        assert stream.read() == contenido
+
+    app.config['UPLOAD_SPOOL_MAX_BYTES'] = 1024
+    with app.test_request_context('/', method='POST', data={'archivo': (BytesIO(contenido), 'a.pdf')}):
+        assert request.files['archivo'].stream._rolled
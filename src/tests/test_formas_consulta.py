@@ -0,0 +1,32 @@
+import pytest
+from src.services.formas_consulta import FormaConsulta, indices_de_formas, etapas_plan
+from src.services.mongo_service import MongoService
+from src.services.educativo_service import EducativoService
+
+def test_indice_en_orden_esr():
+    """Igualdad primero, luego el orden con su dirección y al final el rango"""
+    forma = FormaConsulta("m", "c", igualdad=("a", "b"), orden=(("fecha", -1),), rango=("peso",))
+    assert forma.indice() == [("a", 1), ("b", 1), ("fecha", -1), ("peso", 1)]
+
+def test_se_omiten_prefijos():
+    """Un índice que es prefijo de otro no se crea, salvo que tenga opciones propias"""
+    indices = indices_de_formas([
+        FormaConsulta("corto", "c", igualdad=("a",)),
+        FormaConsulta("largo", "c", igualdad=("a", "b")),
+        FormaConsulta("unico", "u", igualdad=("a",)),
+    ], {"u": [([("a", 1), ("b", 1)], {"unique": True})]})
+
+    assert indices["c"] == [([("a", 1), ("b", 1)], {})]
+    assert indices["u"] == [([("a", 1), ("b", 1)], {"unique": True})]
+
+@pytest.mark.parametrize("servicio", [MongoService, EducativoService])
+def test_cada_forma_tiene_indice(servicio):
+    """Toda forma declarada queda atendida por un prefijo de algún índice del servicio"""
+    for forma in servicio.FORMAS_CONSULTA:
+        claves = forma.indice()
+        assert any(existentes[:len(claves)] == claves for existentes, _ in servicio.INDICES[forma.coleccion]), forma.metodo
+
+def test_etapas_plan_anidadas():
+    """Se recorren todas las etapas anidadas del plan ganador"""
+    plan = {"stage": "FETCH", "inputStage": {"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}}
+    assert etapas_plan(plan) == ["FETCH", "SORT", "COLLSCAN"]
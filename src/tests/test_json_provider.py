@@ -0,0 +1,30 @@
+from bson import Decimal128, ObjectId
+from datetime import datetime
+from flask import Flask, jsonify
+from src.utils.json_provider import ProveedorJSON
+
+def test_documento_mongo_sin_conversion_previa():
+    """Los ObjectId anidados se serializan como texto y las fechas con el formato de Flask"""
+    app = Flask(__name__)
+    app.json = ProveedorJSON(app)
+    identificador = ObjectId()
+
+    with app.app_context():
+        respuesta = jsonify({'_id': identificador, 'contenido': [{'id_modulo': identificador}],
+                             'timestamp': datetime(2024, 1, 2, 3, 4, 5)})
+
+    assert respuesta.get_json() == {
+        '_id': str(identificador),
+        'contenido': [{'id_modulo': str(identificador)}],
+        'timestamp': 'Tue, 02 Jan 2024 03:04:05 GMT'
+    }
+
+def test_tipos_bson_y_bytes():
+    """Decimal128 se serializa como número en texto y los bytes en base64"""
+    app = Flask(__name__)
+    app.json = ProveedorJSON(app)
+
+    with app.app_context():
+        respuesta = jsonify({'precio': Decimal128('10.50'), 'firma': b'\x00\xff', 'grande': 2 ** 70})
+
+    assert respuesta.get_json() == {'precio': '10.50', 'firma': 'AP8=', 'grande': 2 ** 70}
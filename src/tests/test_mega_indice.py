@@ -0,0 +1,54 @@
+from src.services.mega_indice import IndiceNodosMega
+
+def _arbol():
+    """Árbol mínimo con la forma que retorna mega.get_files()"""
+    return {
+        'root': {'h': 'root', 'p': '', 't': 2, 'a': {'n': 'Cloud Drive'}},
+        'trash': {'h': 'trash', 'p': '', 't': 4, 'a': {'n': 'Rubbish Bin'}},
+        'cp': {'h': 'cp', 'p': 'root', 't': 1, 'a': {'n': 'Contenido Personal'}},
+        'u1': {'h': 'u1', 'p': 'cp', 't': 1, 'a': {'n': 'u1'}},
+        'f1': {'h': 'f1', 'p': 'u1', 't': 0, 'a': {'n': 'doc.pdf'}},
+        # Carpeta homónima en otro nivel: no debe confundirse con /Contenido Personal/u1
+        'u1b': {'h': 'u1b', 'p': 'root', 't': 1, 'a': {'n': 'u1'}},
+    }
+
+def test_buscar_carpeta_por_ruta():
+    """Las rutas se resuelven siguiendo la jerarquía desde la raíz"""
+    indice = IndiceNodosMega()
+    indice.cargar(_arbol())
+
+    assert indice.vigente()
+    assert indice.raiz == 'root'
+    assert indice.papelera == 'trash'
+    assert indice.buscar_carpeta('/Contenido Personal/u1/') == 'u1'
+    assert indice.buscar_carpeta('u1') == 'u1b'
+    assert indice.buscar_carpeta('/Contenido Educativo/u1/') is None
+    assert indice.obtener_nodo('f1')['p'] == 'u1'
+
+def test_actualizacion_incremental():
+    """Crear, mover y eliminar nodos actualiza el índice sin recargarlo"""
+    indice = IndiceNodosMega()
+    indice.cargar(_arbol())
+
+    indice.registrar_nodo('ce', 'root', 'Contenido Educativo', IndiceNodosMega.TIPO_CARPETA)
+    assert indice.buscar_carpeta('/Contenido Educativo') == 'ce'
+
+    indice.mover_nodo('u1', 'ce')
+    assert indice.buscar_carpeta('/Contenido Personal/u1') is None
+    assert indice.buscar_carpeta('/Contenido Educativo/u1') == 'u1'
+
+    indice.eliminar_nodo('ce')
+    assert indice.buscar_carpeta('/Contenido Educativo') is None
+    assert indice.obtener_nodo('u1') is None
+    assert indice.obtener_nodo('f1') is None
+
+def test_ttl_e_invalidacion():
+    """El índice vence por TTL o por invalidación explícita"""
+    indice = IndiceNodosMega(ttl_segundos=0)
+    indice.cargar(_arbol())
+    assert not indice.vigente()
+
+    indice = IndiceNodosMega(ttl_segundos=60)
+    indice.cargar(_arbol())
+    indice.invalidar()
+    assert not indice.vigente()
@@ -0,0 +1,107 @@
+import threading
+import time
+import pytest
+
+try:
+    from mega.errors import RequestError
+except Exception as e:
+    # mega.py no carga en versiones de Python distintas a la de runtime.txt
+    pytest.skip(f"mega.py no disponible: {e}", allow_module_level=True)
+
+from src.config.settings import Config
+from src.services.mega_pool import ESID, PoolSesionesMega
+
+class PoolFalso(PoolSesionesMega):
+    """Pool cuyo login crea clientes falsos numerados en lugar de abrir sesiones en MEGA"""
+
+    def __init__(self, tamano):
+        super().__init__('cuenta@mega.nz', 'clave', tamano=tamano, renovar_cada=3600)
+        self.logins = 0
+        self._bloqueo_logins = threading.Lock()
+
+    def _login(self):
+        with self._bloqueo_logins:
+            self.logins += 1
+            return f'sesion-{self.logins}', time.monotonic()
+
+def _esperar(condicion, segundos=2):
+    limite = time.monotonic() + segundos
+    while not condicion():
+        assert time.monotonic() < limite, "El pool no llegó al estado esperado"
+        time.sleep(0.01)
+
+def test_sesiones_exclusivas_y_espera_agotada(monkeypatch):
+    """Cada bloque tiene su propia sesión; con el pool agotado se espera MEGA_POOL_ESPERA y se falla"""
+    monkeypatch.setattr(Config, 'MEGA_POOL_ESPERA', 0.1)
+    pool = PoolFalso(tamano=2)
+
+    with pool.sesion() as primera:
+        with pool.sesion() as segunda:
+            assert primera != segunda
+            with pytest.raises(TimeoutError):
+                with pool.sesion():
+                    pass
+
+    assert sorted(cliente for cliente, _ in pool._disponibles) == ['sesion-1', 'sesion-2']
+    assert pool._total == 2
+    assert pool.logins == 2
+
+def test_sesion_devuelta_despierta_a_quien_espera(monkeypatch):
+    """Un hilo que espera una sesión la recibe en cuanto otro la devuelve"""
+    monkeypatch.setattr(Config, 'MEGA_POOL_ESPERA', 2)
+    pool = PoolFalso(tamano=1)
+    recibidas = []
+
+    def esperar_sesion():
+        with pool.sesion() as sesion:
+            recibidas.append(sesion)
+
+    with pool.sesion() as tomada:
+        hilo = threading.Thread(target=esperar_sesion)
+        hilo.start()
+        time.sleep(0.05)
+        assert recibidas == []
+
+    hilo.join(timeout=2)
+    assert recibidas == [tomada]
+
+def test_sesion_vencida_se_reemplaza(monkeypatch):
+    """Una sesión que la API rechaza con ESID se descarta y el hilo de fondo inicia otra"""
+    monkeypatch.setattr(Config, 'MEGA_POOL_ESPERA', 2)
+    pool = PoolFalso(tamano=1)
+
+    with pytest.raises(RequestError):
+        with pool.sesion() as vencida:
+            raise RequestError(ESID)
+
+    _esperar(lambda: pool.logins == 2 and pool._disponibles)
+    assert pool._total == 1
+    with pool.sesion() as nueva:
+        assert nueva != vencida
+
+def test_otros_errores_conservan_la_sesion(monkeypatch):
+    """Un error de la API que no invalida la sesión la devuelve al pool"""
+    monkeypatch.setattr(Config, 'MEGA_POOL_ESPERA', 2)
+    pool = PoolFalso(tamano=1)
+
+    with pytest.raises(RequestError):
+        with pool.sesion() as sesion:
+            raise RequestError(-9)
+
+    assert [cliente for cliente, _ in pool._disponibles] == [sesion]
+    assert pool._total == 1
+    assert pool.logins == 1
+
+def test_un_pool_por_cuenta_hasta_el_fork(monkeypatch):
+    """obtener() reutiliza el pool de la cuenta; tras un fork se crea uno nuevo"""
+    monkeypatch.setattr(PoolSesionesMega, '_pools', {})
+    monkeypatch.setattr(PoolSesionesMega, '_bloqueo_registro', threading.Lock())
+
+    pool = PoolSesionesMega.obtener('cuenta@mega.nz', 'clave')
+    assert PoolSesionesMega.obtener('cuenta@mega.nz', 'clave') is pool
+    assert PoolSesionesMega.obtener('otra@mega.nz', 'clave') is not pool
+
+    PoolSesionesMega.descartar_heredados()
+
+    assert PoolSesionesMega._pools == {}
+    assert PoolSesionesMega.obtener('cuenta@mega.nz', 'clave') is not pool
@@ -0,0 +1,110 @@
+import threading
+import time
+from contextlib import contextmanager
+from src.services import mega_service
+from src.services.mega_indice import IndiceNodosMega
+from src.services.mega_service import MegaService
+from src.tests.test_mega_indice import _arbol
+
+class MegaFalso:
+    def __init__(self):
+        self.creadas = []
+
+    def get_files(self):
+        return _arbol()
+
+    def _mkdir(self, name, parent_node_id):
+        time.sleep(0.01)
+        self.creadas.append((parent_node_id, name))
+        return {'f': [{'h': f'h-{name}'}]}
+
+    def _process_file(self, nodo, claves):
+        return dict(nodo, k=[1, 2, 3, 4], meta_mac=(5, 6))
+
+    def get_upload_link(self, file_handle):
+        return f"https://mega.nz/file/{file_handle['f'][0]['h']}"
+
+class PoolFalso:
+    """Pool con una sola sesión, como un pool agotado por cargas en curso"""
+
+    def __init__(self, cliente):
+        self.indice = IndiceNodosMega(ttl_segundos=60)
+        self.cliente = cliente
+        self.libre = threading.Semaphore(1)
+
+    @contextmanager
+    def sesion(self):
+        assert self.libre.acquire(timeout=5), "No hay sesiones de MEGA disponibles"
+        try:
+            yield self.cliente
+        finally:
+            self.libre.release()
+
+def _servicio(cliente):
+    servicio = MegaService.__new__(MegaService)
+    servicio.pool = PoolFalso(cliente)
+    servicio.indice = servicio.pool.indice
+    return servicio
+
+def test_esperar_sesion_no_bloquea_el_indice():
+    """Mientras se espera una sesión para crear una carpeta, quien tiene una sesión puede indexar"""
+    mega = MegaFalso()
+    servicio = _servicio(mega)
+    servicio._obtener_indice()
+
+    with servicio.pool.sesion():
+        resultado = []
+        hilo = threading.Thread(target=lambda: resultado.append(
+            servicio._resolver_carpeta('/Contenido Educativo/u9/', crear=True)))
+        hilo.start()
+        time.sleep(0.1)
+
+        # Una carga que terminó con la sesión tomada registra su archivo
+        assert servicio.indice.bloqueo.acquire(timeout=1)
+        servicio.indice.registrar_nodo('f9', 'u1', 'nuevo.pdf', IndiceNodosMega.TIPO_ARCHIVO)
+        servicio.indice.bloqueo.release()
+
+    hilo.join(timeout=5)
+    assert resultado == ['h-u9']
+    assert servicio.indice.obtener_nodo('f9')['p'] == 'u1'
+
+def test_carpeta_se_crea_una_sola_vez():
+    """Peticiones simultáneas a la misma ruta nueva no duplican carpetas en MEGA"""
+    mega = MegaFalso()
+    servicio = _servicio(mega)
+
+    resultados = []
+    hilos = [threading.Thread(target=lambda: resultados.append(
+        servicio._resolver_carpeta('/Contenido Educativo/u9/', crear=True))) for _ in range(4)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join(timeout=5)
+
+    assert resultados == ['h-u9'] * 4
+    assert mega.creadas == [('root', 'Contenido Educativo'), ('h-Contenido Educativo', 'u9')]
+
+def test_subida_no_retiene_sesion_mientras_envia(monkeypatch):
+    """Los fragmentos se envían con la sesión devuelta al pool, libre para otras operaciones"""
+    mega = MegaFalso()
+    servicio = _servicio(mega)
+    sesion_libre = []
+
+    def enviar_fragmentos(ul_url, stream, tamano, cifrado, timeout):
+        libre = servicio.pool.libre.acquire(blocking=False)
+        if libre:
+            servicio.pool.libre.release()
+        sesion_libre.append(libre)
+        return 'handle-subida'
+
+    monkeypatch.setattr(mega_service, 'CifradoSubida', object)
+    monkeypatch.setattr(mega_service, 'iniciar_subida', lambda m, tamano: 'https://subida.mega')
+    monkeypatch.setattr(mega_service, 'enviar_fragmentos', enviar_fragmentos)
+    monkeypatch.setattr(mega_service, 'completar_subida',
+                        lambda m, destino, cifrado, handle, nombre: {'f': [{'h': 'f9', 'p': destino}]})
+
+    resultado = servicio.subir_stream(None, 10, '/Contenido Personal/u1/', 'nuevo.pdf')
+
+    assert sesion_libre == [True]
+    assert resultado['link'] == 'https://mega.nz/file/f9'
+    assert servicio.indice.obtener_nodo('f9')['p'] == 'u1'
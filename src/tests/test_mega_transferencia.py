@@ -0,0 +1,97 @@
+import io
+import pytest
+
+try:
+    import mega  # noqa: F401
+except Exception as e:
+    # mega.py no carga en versiones de Python distintas a la de runtime.txt
+    pytest.skip(f"mega.py no disponible: {e}", allow_module_level=True)
+
+from mega.crypto import get_chunks, str_to_a32
+from src.services import mega_transferencia
+from src.services.mega_transferencia import CifradoSubida, abrir_descarga
+
+class ClienteFalso:
+    timeout = 5
+
+    def __init__(self, datos):
+        self.datos = datos
+
+    def _api_request(self, data):
+        return self.datos
+
+class RespuestaFalsa:
+    def __init__(self, contenido: bytes):
+        self.raw = io.BytesIO(contenido)
+        self.cerrada = False
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        self.cerrada = True
+
+def _archivo_cifrado(contenido: bytes):
+    """Cifra el contenido como lo sube CifradoSubida y arma el nodo que retornaría get_files()"""
+    cifrado = CifradoSubida()
+    partes = [cifrado.cifrar(contenido[inicio:inicio + tamano]) for inicio, tamano in get_chunks(len(contenido))]
+    file_mac = str_to_a32(cifrado.mac_str)
+    nodo = {
+        'h': 'f1',
+        'k': cifrado.ul_key[:4],
+        'iv': cifrado.ul_key[4:6],
+        'meta_mac': (file_mac[0] ^ file_mac[1], file_mac[2] ^ file_mac[3]),
+    }
+    return b''.join(partes), nodo
+
+def _descargar(monkeypatch, cifrados: bytes, tamano: int):
+    respuesta = RespuestaFalsa(cifrados)
+    monkeypatch.setattr(mega_transferencia.requests, 'get', lambda url, **kwargs: respuesta)
+    cliente = ClienteFalso({'g': 'https://descarga.mega/f1', 's': tamano})
+    return cliente, respuesta
+
+def test_descarga_descifra_por_fragmentos(monkeypatch):
+    """El generador entrega el contenido original fragmento a fragmento y cierra la conexión"""
+    contenido = bytes(range(256)) * 1200 + b'fin'
+    cifrados, nodo = _archivo_cifrado(contenido)
+    cliente, respuesta = _descargar(monkeypatch, cifrados, len(contenido))
+
+    tamano, fragmentos = abrir_descarga(cliente, nodo)
+    partes = list(fragmentos)
+
+    assert tamano == len(contenido)
+    assert len(partes) == len(list(get_chunks(len(contenido)))) > 1
+    assert b''.join(partes) == contenido
+    assert respuesta.cerrada
+
+def test_descarga_con_mac_distinto_falla_al_final(monkeypatch):
+    """Si el MAC no coincide el generador falla tras el último fragmento, sin dar la descarga por buena"""
+    contenido = b'contenido alterado' * 100
+    cifrados, nodo = _archivo_cifrado(contenido)
+    nodo['meta_mac'] = (nodo['meta_mac'][0] ^ 1, nodo['meta_mac'][1])
+    cliente, respuesta = _descargar(monkeypatch, cifrados, len(contenido))
+
+    _, fragmentos = abrir_descarga(cliente, nodo)
+    with pytest.raises(ValueError, match='Mismatched mac'):
+        list(fragmentos)
+    assert respuesta.cerrada
+
+def test_descarga_truncada(monkeypatch):
+    """Una conexión que se corta antes del tamaño anunciado no se entrega como completa"""
+    contenido = b'x' * 5000
+    cifrados, nodo = _archivo_cifrado(contenido)
+    cliente, respuesta = _descargar(monkeypatch, cifrados[:4000], len(contenido))
+
+    _, fragmentos = abrir_descarga(cliente, nodo)
+    with pytest.raises(ValueError, match='4000 de 5000'):
+        list(fragmentos)
+    assert respuesta.cerrada
+
+def test_archivo_no_disponible(monkeypatch):
+    """Sin URL de descarga se falla antes de abrir la conexión"""
+    def no_llamar(url, **kwargs):
+        raise AssertionError('no debe pedir la descarga')
+    monkeypatch.setattr(mega_transferencia.requests, 'get', no_llamar)
+
+    with pytest.raises(FileNotFoundError):
+        abrir_descarga(ClienteFalso({'e': -9}), {'h': 'f1'})
@@ -0,0 +1,49 @@
+import asyncio
+from src.services import mongo_conexion
+from src.services.mongo_conexion import obtener_cliente, cerrar_cliente
+
+def test_un_cliente_por_proceso(monkeypatch):
+    """Las instancias del mismo proceso comparten cliente; un proceso hijo obtiene el suyo"""
+    uri = 'mongodb://localhost:27999/?connect=false'
+    cliente = obtener_cliente(uri)
+    assert obtener_cliente(uri) is cliente
+
+    monkeypatch.setattr(mongo_conexion.os, 'getpid', lambda: -1)
+    hijo = obtener_cliente(uri)
+    assert hijo is not cliente
+
+    cerrar_cliente(hijo)
+    monkeypatch.undo()
+    cerrar_cliente(cliente)
+    assert obtener_cliente(uri) is not cliente
+    cerrar_cliente(obtener_cliente(uri))
+
+def test_cliente_async_por_event_loop():
+    """Cada event loop obtiene su propio AsyncMongoClient y lo cierra al apagarse"""
+    uri = 'mongodb://localhost:27999/'
+
+    async def usar():
+        cliente = mongo_conexion.obtener_cliente_async(uri)
+        assert mongo_conexion.obtener_cliente_async(uri) is cliente
+        await mongo_conexion.cerrar_clientes_async()
+        return cliente
+
+    primero = asyncio.run(usar())
+    assert asyncio.run(usar()) is not primero
+    assert mongo_conexion._clientes_async == {}
+
+def test_servicios_async_se_construyen_fuera_del_loop():
+    """Calentar un worker construye los servicios sin event loop; el cliente se crea en el primer uso"""
+    from src.services.educativo_service_async import EducativoServiceAsync
+    from src.services.mongo_service_async import MongoServiceAsync
+    uri = 'mongodb://localhost:27999/'
+    servicios = [MongoServiceAsync(uri), EducativoServiceAsync(uri)]
+    assert mongo_conexion._clientes_async == {}
+
+    async def usar():
+        assert servicios[0].archivos_collection.name == 'archivos_subidos'
+        assert servicios[1].entregas_collection.database.client is servicios[0].db.client
+        await mongo_conexion.cerrar_clientes_async()
+
+    asyncio.run(usar())
+    assert mongo_conexion._clientes_async == {}
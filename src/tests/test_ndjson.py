@@ -0,0 +1,34 @@
+import json
+from flask import Flask
+from src.utils.json_provider import ProveedorJSON
+from src.utils.ndjson import RespuestaNDJSON
+
+def crear_app():
+    app = Flask(__name__)
+    app.json = ProveedorJSON(app)
+
+    @app.route('/listar')
+    def listar():
+        if not RespuestaNDJSON.solicitada():
+            return {"formato": "json"}
+        documentos = ({"indice": i} for i in range(5))
+        return RespuestaNDJSON.responder(documentos, RespuestaNDJSON.tamano_lote(2))
+
+    return app
+
+def test_un_documento_por_linea():
+    """Con Accept NDJSON se transmite cada documento en su propia línea"""
+    cliente = crear_app().test_client()
+    respuesta = cliente.get('/listar', headers={"Accept": RespuestaNDJSON.MIMETYPE})
+
+    assert respuesta.mimetype == RespuestaNDJSON.MIMETYPE
+    assert respuesta.is_streamed
+    lineas = respuesta.get_data(as_text=True).splitlines()
+    assert [json.loads(linea) for linea in lineas] == [{"indice": i} for i in range(5)]
+
+def test_json_por_defecto():
+    """Sin preferencia explícita se mantiene la respuesta JSON"""
+    cliente = crear_app().test_client()
+
+    assert cliente.get('/listar').get_json() == {"formato": "json"}
+    assert cliente.get('/listar', headers={"Accept": "*/*"}).get_json() == {"formato": "json"}
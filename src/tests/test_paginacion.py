@@ -0,0 +1,56 @@
+from datetime import datetime
+import pytest
+from bson import ObjectId
+from src.config.settings import Config
+from src.utils.paginacion import Paginacion
+
+def test_cursor_conserva_tipos_bson():
+    """El cursor opaco recupera fechas y ObjectId tal como se guardaron"""
+    posicion = [datetime(2024, 5, 1, 12, 30), ObjectId()]
+    cursor = Paginacion.codificar_cursor(posicion)
+
+    assert '/' not in cursor and '+' not in cursor
+    assert Paginacion.decodificar_cursor(cursor) == posicion
+
+    with pytest.raises(ValueError):
+        Paginacion.decodificar_cursor('no-es-un-cursor')
+
+def test_limite_y_filtro_keyset():
+    """El tamaño de página se acota y el filtro continúa después de (valor, _id)"""
+    assert Paginacion.limite() == Config.PAGINA_TAMANO_DEFECTO
+    assert Paginacion.limite('0') == 1
+    assert Paginacion.limite(10 ** 6) == Config.PAGINA_TAMANO_MAXIMO
+
+    fecha, ultimo_id = datetime(2024, 5, 1), ObjectId()
+    assert Paginacion.filtro_keyset('fecha_subida', -1, [fecha, ultimo_id]) == {'$or': [
+        {'fecha_subida': {'$lt': fecha}},
+        {'fecha_subida': fecha, '_id': {'$lt': ultimo_id}}
+    ]}
+    assert Paginacion.filtro_keyset('_id', 1, [ultimo_id]) == {'_id': {'$gt': ultimo_id}}
+
+class ColeccionAgregada:
+    def __init__(self, documentos):
+        self.documentos = documentos
+        self.pipeline = None
+
+    def aggregate(self, pipeline):
+        self.pipeline = pipeline
+        limite = next(etapa['$limit'] for etapa in pipeline if '$limit' in etapa)
+        return iter([dict(documento) for documento in self.documentos[:limite]])
+
+def test_paginar_vista_quita_la_posicion():
+    """La posición proyectada aparte forma el cursor y no llega a la respuesta"""
+    fechas = [datetime(2024, 5, dia) for dia in (3, 2, 1)]
+    ids = [ObjectId() for _ in fechas]
+    coleccion = ColeccionAgregada([
+        {'id': str(identificador), 'fecha_subida': fecha.isoformat(), '_posicion': [fecha, identificador]}
+        for fecha, identificador in zip(fechas, ids)
+    ])
+    vista = {'_id': 0, 'id': {'$toString': '$_id'}}
+
+    documentos, siguiente = Paginacion.paginar_vista(coleccion, {'estado': 'activo'}, 'fecha_subida', -1, 2, vista=vista)
+
+    assert [documento['id'] for documento in documentos] == [str(ids[0]), str(ids[1])]
+    assert all('_posicion' not in documento for documento in documentos)
+    assert Paginacion.decodificar_cursor(siguiente) == [fechas[1], ids[1]]
+    assert coleccion.pipeline[-1]['$project'] == {**vista, '_posicion': ['$fecha_subida', '$_id']}
@@ -0,0 +1,90 @@
+from src.services.uso_service import UsoService
+
+class ColeccionFalsa:
+    def __init__(self, resultados=None):
+        self.resultados = resultados or []
+        self.escrituras = []
+
+    def aggregate(self, pipeline, **opciones):
+        return iter(self.resultados)
+
+    def bulk_write(self, operaciones, ordered=True):
+        self.escrituras.extend(operaciones)
+
+    def delete_many(self, filtro):
+        pass
+
+    def update_one(self, filtro, cambios, upsert=False):
+        self.escrituras.append((filtro, cambios))
+
+class BaseFalsa(dict):
+    def __missing__(self, nombre):
+        self[nombre] = ColeccionFalsa()
+        return self[nombre]
+
+def test_recalcular_agrupa_por_usuario():
+    """El recálculo escribe un documento por usuario con totales, carpetas y módulos"""
+    db = BaseFalsa()
+    db[UsoService.COLECCION_CONTENIDO] = ColeccionFalsa([
+        {"_id": {"usuario_id": "u1", "familia": "contenido", "grupo": "Contenido Personal"}, "archivos": 2, "peso_bytes": 300},
+        {"_id": {"usuario_id": "u1", "familia": "educativo", "grupo": "tarea"}, "archivos": 1, "peso_bytes": 50},
+        {"_id": {"usuario_id": "u2", "familia": "educativo", "grupo": None}, "archivos": 1, "peso_bytes": 10},
+    ])
+
+    assert UsoService(db).recalcular() == 2
+
+    u1, u2 = [operacion._doc for operacion in db[UsoService.COLECCION].escrituras]
+    assert u1["_id"] == "u1" and u1["total_archivos"] == 3 and u1["total_peso"] == 350
+    assert u1["contenido"]["carpetas"] == {"Contenido Personal": {"archivos": 2, "peso_bytes": 300}}
+    assert u1["educativo"]["por_modulo"]["tarea"] == {"archivos": 1, "peso_bytes": 50}
+    assert u2["educativo"]["por_modulo"] == {"sin_grupo": {"archivos": 1, "peso_bytes": 10}}
+
+def test_clave_de_grupo():
+    """Los nombres de carpeta se pueden usar como ruta de un $inc"""
+    assert UsoService._clave("v1.2") == "v1_2"
+    assert UsoService._clave("$set") == "set"
+    assert UsoService._clave(None) == "sin_grupo"
+
+class ArchivosFalsos:
+    def __init__(self, documento):
+        self.documento = documento
+
+    def find_one(self, filtro):
+        return dict(self.documento) if filtro["_id"] == self.documento["_id"] else None
+
+    def find_one_and_update(self, filtro, cambios, projection=None, return_document=None):
+        anterior = self.find_one(filtro)
+        self.documento.update(cambios["$set"])
+        return anterior
+
+class MegaFalso:
+    def eliminar_archivo(self, node_id):
+        return True
+
+def test_eliminar_archivo_descuenta_uso():
+    """Eliminar un archivo de contenido desde la API resta su peso de uso_usuarios"""
+    from bson import ObjectId
+    from flask import Flask
+    from src.infra.controllers.archivo_controller import ArchivoController
+    from src.services.mongo_service import MongoService
+
+    archivo_id = ObjectId()
+    db = BaseFalsa()
+    archivos = ArchivosFalsos({"_id": archivo_id, "usuario_id": "u1", "carpeta": "Contenido Personal",
+                               "estado": "activo", "archivo": {"peso": 300, "mega_node_id": "n1"}})
+    mongo_service = MongoService.__new__(MongoService)
+    mongo_service.archivos_collection = archivos
+    mongo_service.uso = UsoService(db)
+    controlador = ArchivoController.__new__(ArchivoController)
+    controlador.mongo_service = mongo_service
+    controlador.mega_service = MegaFalso()
+
+    with Flask(__name__).test_request_context(json={"fileId": str(archivo_id), "userId": "u1"}):
+        _, codigo = controlador.eliminar_archivo_contenido()
+
+    assert codigo == 200
+    assert archivos.documento["estado"] == "eliminado"
+    [(filtro, cambios)] = db[UsoService.COLECCION].escrituras
+    assert filtro == {"_id": "u1"}
+    assert cambios["$inc"]["total_archivos"] == -1 and cambios["$inc"]["total_peso"] == -300
+    assert cambios["$inc"]["contenido.carpetas.Contenido Personal.peso_bytes"] == -300
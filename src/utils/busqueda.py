@@ -0,0 +1,107 @@
+from pymongo import UpdateOne
+from typing import Dict, List, Optional, Set, Tuple
+import re
+import unicodedata
+from src.utils.paginacion import Paginacion
+
+class BusquedaArchivos:
+    """Búsqueda de archivos por nombre sobre tokens normalizados e indexados.
+
+    Cada documento guarda las palabras de su nombre (sin acentos, en
+    minúsculas) y sus prefijos (edge n-grams); una búsqueda exige que cada
+    palabra del término sea prefijo de alguna palabra del nombre, con un
+    índice multikey sobre los prefijos en lugar de un $regex que recorre la
+    colección completa. Los resultados se ordenan por coincidencias exactas
+    de palabra y luego por fecha.
+    """
+
+    CAMPO_TOKENS = "busqueda_tokens"
+    CAMPO_PALABRAS = "busqueda_palabras"
+    LONGITUD_MINIMA = 2
+    LONGITUD_MAXIMA = 20
+
+    @staticmethod
+    def normalizar(texto: str) -> List[str]:
+        """Palabras del texto en minúsculas, sin acentos ni separadores"""
+        texto = unicodedata.normalize('NFKD', texto or '')
+        texto = ''.join(c for c in texto if not unicodedata.combining(c)).lower()
+        return [palabra for palabra in re.split(r'[^0-9a-z]+', texto) if palabra]
+
+    @classmethod
+    def campos_busqueda(cls, nombre: str) -> Dict[str, List[str]]:
+        """Campos de búsqueda que se guardan junto al documento del archivo"""
+        palabras = cls.normalizar(nombre)
+        tokens: Set[str] = set()
+        for palabra in palabras:
+            palabra = palabra[:cls.LONGITUD_MAXIMA]
+            for fin in range(min(cls.LONGITUD_MINIMA, len(palabra)), len(palabra) + 1):
+                tokens.add(palabra[:fin])
+        return {
+            cls.CAMPO_TOKENS: sorted(tokens),
+            cls.CAMPO_PALABRAS: sorted(set(palabras))
+        }
+
+    @classmethod
+    def tokens_consulta(cls, termino: str) -> List[str]:
+        """Tokens que deben estar todos presentes; lanza ValueError si el término no tiene ninguno"""
+        tokens = sorted({p[:cls.LONGITUD_MAXIMA] for p in cls.normalizar(termino) if len(p) >= cls.LONGITUD_MINIMA})
+        if not tokens:
+            raise ValueError(f"El término de búsqueda debe tener al menos {cls.LONGITUD_MINIMA} caracteres")
+        return tokens
+
+    @classmethod
+    def buscar(cls, coleccion, filtro: Dict, termino: str, campo_fecha: str, limite: Optional[int] = None,
+               cursor: Optional[str] = None, vista: Optional[Dict] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Retorna una página de resultados ordenados por relevancia y el cursor de la siguiente.
+
+        Con `vista` cada resultado sale de MongoDB con la forma del $project de
+        los listados; como en Paginacion.paginar_vista, la posición para el
+        cursor se proyecta aparte y se quita del resultado.
+        """
+        limite = limite or Paginacion.limite()
+        tokens = cls.tokens_consulta(termino)
+        pipeline = [
+            {"$match": {**filtro, cls.CAMPO_TOKENS: {"$all": tokens}}},
+            {"$addFields": {"_relevancia": {
+                "$size": {"$setIntersection": [{"$ifNull": [f"${cls.CAMPO_PALABRAS}", []]}, tokens]}
+            }}},
+        ]
+        if cursor:
+            relevancia, fecha, ultimo_id = Paginacion.decodificar_cursor(cursor)
+            pipeline.append({"$match": {"$or": [
+                {"_relevancia": {"$lt": relevancia}},
+                {"_relevancia": relevancia, campo_fecha: {"$lt": fecha}},
+                {"_relevancia": relevancia, campo_fecha: fecha, "_id": {"$lt": ultimo_id}}
+            ]}})
+        pipeline += [
+            {"$sort": {"_relevancia": -1, campo_fecha: -1, "_id": -1}},
+            {"$limit": limite + 1},
+            {"$set": {"_posicion": ["$_relevancia", f"${campo_fecha}", "$_id"]}},
+            {"$project": {**vista, "_posicion": 1} if vista else {cls.CAMPO_TOKENS: 0, cls.CAMPO_PALABRAS: 0}},
+        ]
+        documentos = list(coleccion.aggregate(pipeline))
+
+        siguiente = None
+        if len(documentos) > limite:
+            documentos = documentos[:limite]
+            siguiente = Paginacion.codificar_cursor(documentos[-1]["_posicion"])
+        for documento in documentos:
+            del documento["_posicion"]
+        return documentos, siguiente
+
+    @classmethod
+    def rellenar(cls, coleccion, campo_nombre: str, tamano_lote: int = 500) -> int:
+        """Agrega los campos de búsqueda a los documentos que aún no los tienen"""
+        actualizados = 0
+        operaciones = []
+        for documento in coleccion.find({cls.CAMPO_TOKENS: {"$exists": False}}, {campo_nombre: 1}):
+            nombre = documento
+            for parte in campo_nombre.split('.'):
+                nombre = nombre.get(parte) if isinstance(nombre, dict) else None
+            operaciones.append(UpdateOne({"_id": documento["_id"]}, {"$set": cls.campos_busqueda(nombre or '')}))
+            if len(operaciones) >= tamano_lote:
+                actualizados += coleccion.bulk_write(operaciones, ordered=False).modified_count
+                operaciones = []
+        if operaciones:
+            actualizados += coleccion.bulk_write(operaciones, ordered=False).modified_count
+        return actualizados
@@ -0,0 +1,63 @@
+from flask import request
+from src.config.settings import Config
+import gzip
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - sin brotli solo se negocia gzip
+    brotli = None
+
+class CompresionRespuestas:
+    """Comprime las respuestas JSON con brotli o gzip según Accept-Encoding.
+
+    Solo se comprimen respuestas completas en memoria de los tipos de
+    COMPRESION_TIPOS y con al menos COMPRESION_MINIMO_BYTES. Las respuestas
+    transmitidas (descargas desde MEGA y listados NDJSON) y los adjuntos se
+    envían tal cual: se escriben a medida que llegan y los archivos suelen
+    estar ya comprimidos.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.after_request(self.comprimir)
+
+    @staticmethod
+    def codificaciones() -> list:
+        return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+    @staticmethod
+    def aplicable(respuesta) -> bool:
+        if request.method == 'HEAD' or respuesta.status_code < 200 or respuesta.status_code in (204, 206, 304):
+            return False
+        if respuesta.is_streamed or respuesta.direct_passthrough:
+            return False
+        if 'Content-Encoding' in respuesta.headers or 'attachment' in respuesta.headers.get('Content-Disposition', ''):
+            return False
+        if respuesta.mimetype not in Config.COMPRESION_TIPOS:
+            return False
+        return (respuesta.content_length or 0) >= Config.COMPRESION_MINIMO_BYTES
+
+    @staticmethod
+    def codificar(datos: bytes, codificacion: str) -> bytes:
+        if codificacion == 'br':
+            return brotli.compress(datos, quality=Config.COMPRESION_NIVEL_BROTLI)
+        return gzip.compress(datos, compresslevel=Config.COMPRESION_NIVEL_GZIP, mtime=0)
+
+    def comprimir(self, respuesta):
+        if not self.aplicable(respuesta):
+            return respuesta
+        # La respuesta depende de Accept-Encoding aunque este cliente no comprima
+        respuesta.vary.add('Accept-Encoding')
+        codificacion = request.accept_encodings.best_match(self.codificaciones())
+        if codificacion is None:
+            return respuesta
+        respuesta.set_data(self.codificar(respuesta.get_data(), codificacion))
+        respuesta.headers['Content-Encoding'] = codificacion
+        # Otra representación del mismo listado: el ETag pasa a ser débil
+        etag, debil = respuesta.get_etag()
+        if etag and not debil:
+            respuesta.set_etag(etag, weak=True)
+        return respuesta
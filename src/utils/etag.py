@@ -0,0 +1,86 @@
+from flask import Response, make_response, request
+from typing import Optional
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+class VersionesListados:
+    """Contadores de versión de los listados, incrementados en cada escritura.
+
+    Cada clave identifica un listado (una colección completa o los hijos de
+    un curso o tema). Leer la versión es una consulta por _id, así que se
+    puede responder a un If-None-Match sin ejecutar la consulta del listado.
+    """
+
+    COLECCION = "versiones_listados"
+
+    def __init__(self, db):
+        self.coleccion = db[self.COLECCION]
+
+    def incrementar(self, *claves):
+        for clave in {clave for clave in claves if clave is not None}:
+            try:
+                self.coleccion.update_one({"_id": clave}, {"$inc": {"version": 1}}, upsert=True)
+            except Exception as e:
+                logger.error(f"Error al incrementar la versión de {clave}: {e}")
+
+    def obtener(self, clave: str) -> Optional[int]:
+        """Versión actual del listado, o None si no se pudo leer"""
+        try:
+            documento = self.coleccion.find_one({"_id": clave})
+            return documento["version"] if documento else 0
+        except Exception as e:
+            logger.error(f"Error al leer la versión de {clave}: {e}")
+            return None
+
+class VersionesListadosAsync:
+    """Incremento de las versiones de VersionesListados desde el event loop (AsyncMongoClient)"""
+
+    def __init__(self, db):
+        self.coleccion = db[VersionesListados.COLECCION]
+
+    async def incrementar(self, *claves):
+        for clave in {clave for clave in claves if clave is not None}:
+            try:
+                await self.coleccion.update_one({"_id": clave}, {"$inc": {"version": 1}}, upsert=True)
+            except Exception as e:
+                logger.error(f"Error al incrementar la versión de {clave}: {e}")
+
+class ETagListado:
+    """ETag fuerte de un listado a partir de su versión y de los parámetros de la petición.
+
+    La versión solo cambia cuando se escribe en el listado, y el resumen de
+    ruta, query string y cuerpo distingue las páginas y filtros de un mismo
+    listado, así que no hace falta serializar la respuesta para calcularlo.
+    """
+
+    @staticmethod
+    def calcular(version: int) -> str:
+        resumen = hashlib.blake2b(digest_size=8)
+        for parte in (request.path.encode(), request.query_string, request.get_data(cache=True)):
+            resumen.update(parte)
+            resumen.update(b"\0")
+        return f"{version}-{resumen.hexdigest()}"
+
+    @staticmethod
+    def vigente(version: Optional[int]) -> bool:
+        """Indica si el If-None-Match de la petición coincide con la versión actual"""
+        if version is None or not request.if_none_match:
+            return False
+        # Comparación débil: la respuesta comprimida lleva el mismo ETag marcado como W/
+        return request.if_none_match.contains_weak(ETagListado.calcular(version))
+
+    @staticmethod
+    def no_modificado(version: int) -> Response:
+        respuesta = Response(status=304)
+        respuesta.set_etag(ETagListado.calcular(version))
+        return respuesta
+
+    @staticmethod
+    def etiquetar(respuesta, version: Optional[int]) -> Response:
+        """Agrega el ETag a una respuesta exitosa del listado"""
+        respuesta = make_response(respuesta)
+        if version is not None and respuesta.status_code == 200:
+            respuesta.set_etag(ETagListado.calcular(version))
+        return respuesta
@@ -1,12 +1,26 @@
 import os
 import mimetypes
 import uuid
+from flask import Request, current_app
+from tempfile import SpooledTemporaryFile
 from werkzeug.utils import secure_filename
 from typing import Dict, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+class SolicitudConSpool(Request):
+    """Request que mantiene en memoria los archivos subidos hasta UPLOAD_SPOOL_MAX_BYTES.
+
+    Werkzeug vuelca a disco cualquier parte multipart de más de 500 KB; con un
+    umbral configurable el stream del archivo se cifra y envía a MEGA sin pasar
+    por un archivo temporal, salvo que supere el límite de memoria.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        max_size = current_app.config.get('UPLOAD_SPOOL_MAX_BYTES', 1024 * 500)
+        return SpooledTemporaryFile(max_size=max_size, mode='rb+')
+
 class FileUtils:
     ALLOWED_EXTENSIONS = {
         'txt', 'pdf', 'png', 'jpg', 'jpeg', 'gif', 'doc', 'docx', 
@@ -25,14 +39,19 @@ class FileUtils:
     @staticmethod
     def obtener_info_archivo(archivo) -> Dict:
         """Extrae información del archivo subido"""
-        filename = secure_filename(archivo.filename)
-        mime_type = archivo.content_type or mimetypes.guess_type(filename)[0]
-        
         # Obtener tamaño del archivo
         archivo.seek(0, os.SEEK_END)
         file_size = archivo.tell()
         archivo.seek(0)  # Volver al inicio
         
+        return FileUtils.describir_archivo(archivo.filename, archivo.content_type, file_size)
+    
+    @staticmethod
+    def describir_archivo(nombre_original: str, content_type: Optional[str], file_size: int) -> Dict:
+        """Información de un archivo subido a partir de su nombre, tipo declarado y tamaño"""
+        filename = secure_filename(nombre_original)
+        mime_type = content_type or mimetypes.guess_type(filename)[0]
+        
         return {
             "nombre": filename,
             "mime": mime_type,
@@ -54,28 +73,6 @@ class FileUtils:
         else:
             raise ValueError(f"Carpeta inválida: {carpeta}")
     
-    @staticmethod
-    def guardar_archivo_temporal(archivo, upload_folder: str) -> str:
-        """Guarda el archivo temporalmente para subirlo a MEGA"""
-        if not os.path.exists(upload_folder):
-            os.makedirs(upload_folder)
-        
-        filename = secure_filename(archivo.filename)
-        filepath = os.path.join(upload_folder, filename)
-        archivo.save(filepath)
-        
-        return filepath
-    
-    @staticmethod
-    def limpiar_archivo_temporal(filepath: str):
-        """Elimina el archivo temporal"""
-        try:
-            if os.path.exists(filepath):
-                os.remove(filepath)
-                logger.info(f"Archivo temporal eliminado: {filepath}")
-        except Exception as e:
-            logger.error(f"Error al eliminar archivo temporal: {e}")
-    
     @staticmethod
     def generar_nombre_unico(nombre_original: str) -> str:
         """Genera un nombre único para el archivo usando UUID"""
@@ -0,0 +1,60 @@
+from bson import Decimal128, ObjectId
+from flask.json.provider import DefaultJSONProvider
+import base64
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - sin orjson se usa el json de la biblioteca estándar
+    orjson = None
+
+class ProveedorJSON(DefaultJSONProvider):
+    """Serializa los documentos de MongoDB tal como los entrega pymongo.
+
+    Con orjson instalado el volcado se hace en C directamente a bytes; si no
+    está, o si un valor no es compatible con orjson, se usa el json estándar
+    de Flask. ObjectId, Decimal128 y bytes se convierten durante el volcado,
+    y las fechas conservan el formato por defecto de Flask.
+    """
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, ObjectId):
+            return str(o)
+        if isinstance(o, Decimal128):
+            return str(o.to_decimal())
+        if isinstance(o, (bytes, bytearray)):
+            return base64.b64encode(o).decode('ascii')
+        return DefaultJSONProvider.default(o)
+
+    def _opciones_orjson(self, indent=None) -> int:
+        # Las fechas pasan por default() para mantener el formato HTTP de Flask
+        opciones = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            opciones |= orjson.OPT_SORT_KEYS
+        if indent:
+            opciones |= orjson.OPT_INDENT_2
+        return opciones
+
+    def _volcar(self, obj, indent=None) -> bytes:
+        """JSON en bytes con orjson, o None si hay que usar el json estándar"""
+        if orjson is None:
+            return None
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._opciones_orjson(indent))
+        except TypeError:
+            return None
+
+    def dumps(self, obj, **kwargs) -> str:
+        if not kwargs.keys() - {'indent', 'separators'}:
+            volcado = self._volcar(obj, kwargs.get('indent'))
+            if volcado is not None:
+                return volcado.decode('utf-8')
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = 2 if (self.compact is None and self._app.debug) or self.compact is False else None
+        volcado = self._volcar(obj, indent)
+        if volcado is None:
+            return super().response(obj)
+        return self._app.response_class(volcado + b"\n", mimetype=self.mimetype)
@@ -0,0 +1,54 @@
+from flask import Response, current_app, request, stream_with_context
+from typing import Dict, Iterable
+import logging
+from src.config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+class RespuestaNDJSON:
+    """Respuestas en JSON delimitado por líneas (un documento por línea).
+
+    Los documentos se leen del cursor de MongoDB en lotes de batch_size y se
+    escriben a medida que llegan, así que la memoria usada no depende del
+    total de documentos de la colección.
+    """
+
+    MIMETYPE = "application/x-ndjson"
+
+    @staticmethod
+    def solicitada() -> bool:
+        """Indica si el cliente prefiere NDJSON a JSON en la cabecera Accept"""
+        return request.accept_mimetypes.best_match(["application/json", RespuestaNDJSON.MIMETYPE]) == RespuestaNDJSON.MIMETYPE
+
+    @staticmethod
+    def tamano_lote(valor=None) -> int:
+        """Documentos por lote del cursor, limitado a NDJSON_BATCH_SIZE_MAXIMO"""
+        try:
+            tamano = int(valor) if valor not in (None, '') else Config.NDJSON_BATCH_SIZE
+        except (TypeError, ValueError):
+            raise ValueError("batch_size debe ser un número")
+        return max(1, min(tamano, Config.NDJSON_BATCH_SIZE_MAXIMO))
+
+    @staticmethod
+    def responder(documentos: Iterable[Dict], lote: int) -> Response:
+        """Transmite cada documento como una línea JSON, agrupando la escritura por lote"""
+        def generar():
+            proveedor = current_app.json
+            lineas = []
+            try:
+                for documento in documentos:
+                    lineas.append(proveedor.dumps(documento))
+                    if len(lineas) >= lote:
+                        yield "\n".join(lineas) + "\n"
+                        lineas = []
+                if lineas:
+                    yield "\n".join(lineas) + "\n"
+            except Exception as e:
+                # Los encabezados ya se enviaron: solo queda cortar la respuesta
+                logger.error(f"Error al transmitir NDJSON: {e}")
+            finally:
+                cerrar = getattr(documentos, 'close', None)
+                if cerrar:
+                    cerrar()
+
+        return Response(stream_with_context(generar()), mimetype=RespuestaNDJSON.MIMETYPE)
@@ -0,0 +1,105 @@
+from bson import json_util
+from typing import Dict, List, Optional, Tuple
+import base64
+import binascii
+import json
+from src.config.settings import Config
+
+class Paginacion:
+    """Paginación por keyset sobre (campo de orden, _id) con cursores opacos.
+
+    En lugar de saltar documentos con skip(), cada página continúa desde el
+    último (valor, _id) de la anterior, así que el costo de una página no
+    depende de su posición y usa el índice del filtro + orden.
+    """
+
+    @staticmethod
+    def codificar_cursor(valores) -> str:
+        """Serializa la posición (tipos BSON incluidos) como un token opaco para la URL"""
+        return base64.urlsafe_b64encode(json_util.dumps(valores).encode('utf-8')).decode('ascii')
+
+    @staticmethod
+    def decodificar_cursor(cursor: str):
+        """Recupera la posición de un cursor; lanza ValueError si no es válido"""
+        try:
+            return json_util.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+        except (binascii.Error, UnicodeError, ValueError, json.JSONDecodeError) as e:
+            raise ValueError("Cursor inválido") from e
+
+    @staticmethod
+    def limite(valor=None) -> int:
+        """Normaliza el tamaño de página solicitado a los límites de Config"""
+        try:
+            limite = int(valor) if valor not in (None, '') else Config.PAGINA_TAMANO_DEFECTO
+        except (TypeError, ValueError):
+            raise ValueError("El tamaño de página debe ser un número")
+        return max(1, min(limite, Config.PAGINA_TAMANO_MAXIMO))
+
+    @staticmethod
+    def parametros(data: Optional[Dict]) -> Tuple[int, Optional[str]]:
+        """Lee (limite, cursor) de los datos de la petición"""
+        data = data or {}
+        return Paginacion.limite(data.get('limit')), data.get('cursor') or None
+
+    @staticmethod
+    def filtro_keyset(campo: str, direccion: int, posicion: List) -> Dict:
+        """Filtro de los documentos posteriores a la posición según el orden dado"""
+        operador = '$lt' if direccion < 0 else '$gt'
+        if campo == '_id':
+            return {'_id': {operador: posicion[-1]}}
+        valor, ultimo_id = posicion
+        return {'$or': [
+            {campo: {operador: valor}},
+            {campo: valor, '_id': {operador: ultimo_id}}
+        ]}
+
+    @staticmethod
+    def paginar(coleccion, filtro: Dict, campo: str, direccion: int = -1, limite: Optional[int] = None,
+                cursor: Optional[str] = None, proyeccion: Optional[Dict] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Retorna (documentos de la página, cursor de la siguiente o None si no hay más)"""
+        limite = limite or Paginacion.limite()
+        consulta = dict(filtro)
+        if cursor:
+            consulta = {'$and': [filtro, Paginacion.filtro_keyset(campo, direccion, Paginacion.decodificar_cursor(cursor))]}
+
+        orden = [(campo, direccion)] if campo == '_id' else [(campo, direccion), ('_id', direccion)]
+        # Se pide un documento extra solo para saber si existe una página siguiente
+        documentos = list(coleccion.find(consulta, proyeccion).sort(orden).limit(limite + 1))
+
+        siguiente = None
+        if len(documentos) > limite:
+            documentos = documentos[:limite]
+            ultimo = documentos[-1]
+            posicion = [ultimo['_id']] if campo == '_id' else [ultimo.get(campo), ultimo['_id']]
+            siguiente = Paginacion.codificar_cursor(posicion)
+        return documentos, siguiente
+
+    @staticmethod
+    def paginar_vista(coleccion, filtro: Dict, campo: str, direccion: int = -1, limite: Optional[int] = None,
+                      cursor: Optional[str] = None, vista: Optional[Dict] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Como paginar(), pero da forma a cada documento con el $project de vista dentro de MongoDB.
+
+        La vista puede renombrar o convertir el campo de orden y _id, así que
+        la posición para el cursor se proyecta aparte y se quita del resultado.
+        """
+        limite = limite or Paginacion.limite()
+        consulta = dict(filtro)
+        if cursor:
+            consulta = {'$and': [filtro, Paginacion.filtro_keyset(campo, direccion, Paginacion.decodificar_cursor(cursor))]}
+
+        orden = {campo: direccion} if campo == '_id' else {campo: direccion, '_id': direccion}
+        posicion = ['$_id'] if campo == '_id' else [f'${campo}', '$_id']
+        documentos = list(coleccion.aggregate([
+            {'$match': consulta},
+            {'$sort': orden},
+            {'$limit': limite + 1},
+            {'$project': {**(vista or {}), '_posicion': posicion}}
+        ]))
+
+        siguiente = None
+        if len(documentos) > limite:
+            documentos = documentos[:limite]
+            siguiente = Paginacion.codificar_cursor(documentos[-1]['_posicion'])
+        for documento in documentos:
+            del documento['_posicion']
+        return documentos, siguiente
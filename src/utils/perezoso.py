@@ -0,0 +1,59 @@
+import logging
+import threading
+import weakref
+
+logger = logging.getLogger(__name__)
+
+# Todos los proveedores del proceso, para reiniciarlos o construirlos juntos
+_proveedores = weakref.WeakSet()
+
+class Perezoso:
+    """Proveedor que construye su objeto en el primer uso y luego lo reutiliza.
+
+    Los atributos se delegan al objeto construido, así que un módulo de rutas
+    puede declarar su controlador sin que importar el módulo abra conexiones
+    a MongoDB o inicie sesiones de MEGA: eso ocurre en la primera petición.
+    """
+
+    def __init__(self, fabrica, *args, **kwargs):
+        self._fabrica = fabrica
+        self._args = args
+        self._kwargs = kwargs
+        self._instancia = None
+        self._bloqueo = threading.Lock()
+        _proveedores.add(self)
+
+    def _obtener(self):
+        if self._instancia is None:
+            with self._bloqueo:
+                if self._instancia is None:
+                    self._instancia = self._fabrica(*self._args, **self._kwargs)
+        return self._instancia
+
+    def _construido(self) -> bool:
+        return self._instancia is not None
+
+    def _reiniciar(self):
+        """Descarta el objeto para que el próximo uso lo construya de nuevo"""
+        with self._bloqueo:
+            self._instancia = None
+
+    def __getattr__(self, nombre):
+        return getattr(self._obtener(), nombre)
+
+def reiniciar_proveedores():
+    """Descarta los objetos construidos, por ejemplo los heredados de un fork"""
+    for proveedor in list(_proveedores):
+        proveedor._bloqueo = threading.Lock()
+        proveedor._instancia = None
+
+def construir_proveedores() -> int:
+    """Construye todos los proveedores pendientes; los que fallan se reintentan en su primer uso"""
+    construidos = 0
+    for proveedor in list(_proveedores):
+        try:
+            proveedor._obtener()
+            construidos += 1
+        except Exception as e:
+            logger.error(f"Error al construir {getattr(proveedor._fabrica, '__name__', proveedor._fabrica)}: {e}")
+    return construidos
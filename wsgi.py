@@ -4,8 +4,11 @@ import os
 # Agregar la carpeta src al path para que se puedan importar los módulos correctamente
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'src')))
 
-from src.app import crearApp
+from infra.routes.RoutesMain import crearApp
 
+# Con gunicorn --preload esto se ejecuta una sola vez en el proceso maestro.
+# crearApp solo importa código y registra rutas; las conexiones a MongoDB y
+# las sesiones de MEGA se abren en cada worker (ver gunicorn.conf.py).
 application = crearApp()
 
 if __name__ == "__main__":